@@ -46,6 +46,7 @@ class Settings:
         self.nodes: Dict[str, Dict[str, Union[str, int, bool]]] = nodes
         
         self.max_queue: int = settings.get("default_max_queue", 1000)
+        self.search_cache: Dict[str, int] = settings.get("search_cache", {"max_size": 1000, "ttl": 600})
         self.bot_prefix: str = settings.get("prefix", "")
         self.activity: List[Dict[str, str]] = settings.get("activity", [{"listen": "/help"}])
         
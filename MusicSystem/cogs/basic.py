@@ -21,7 +21,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import discord, voicelink, re
+import discord, voicelink, re, asyncio
 
 from io import StringIO
 from discord import app_commands
@@ -37,6 +37,7 @@ from function import (
     truncate_string,
     cooldown_check,
     get_aliases,
+    progress_updater,
     logger
 )
 
@@ -45,6 +46,9 @@ from addons import LYRICS_PLATFORMS
 from views import SearchView, ListView, LinkView, LyricsView, HelpView
 from validators import url
 
+# Seconds to wait for more typing before /play autocomplete searches
+AUTOCOMPLETE_DEBOUNCE = 0.35
+
 async def nowplay(ctx: commands.Context, player: voicelink.Player):
     track = player.current
     if not track:
@@ -78,6 +82,7 @@ class Basic(commands.Cog):
             callback=self._play
         )
         self.bot.tree.add_command(self.ctx_menu)
+        self._autocomplete_latest: dict[int, object] = {}
 
     async def cog_unload(self) -> None:
         self.bot.tree.remove_command(self.ctx_menu.name, type=self.ctx_menu.type)
@@ -87,6 +92,14 @@ class Basic(commands.Cog):
             return []
 
         if current:
+            # Only the latest keystroke per user triggers a lookup
+            token = object()
+            self._autocomplete_latest[interaction.user.id] = token
+            await asyncio.sleep(AUTOCOMPLETE_DEBOUNCE)
+            if self._autocomplete_latest.get(interaction.user.id) is not token:
+                return []
+            del self._autocomplete_latest[interaction.user.id]
+
             try:
                 node = voicelink.NodePool.get_node()
                 if not node:
@@ -553,14 +566,20 @@ class Basic(commands.Cog):
         try:
             bytes = await attachment.read()
             track_ids = bytes.split(b"\n")[-1]
-            track_ids = track_ids.decode().split(",")
-            
-            tracks = [voicelink.Track(track_id=track_id, info=voicelink.decode(track_id), requester=ctx.author) for track_id in track_ids]
-            if not tracks:
+            track_ids = [track_id for track_id in track_ids.decode().split(",") if track_id]
+            if not track_ids:
                 return await send(ctx, "noTrackFound")
 
-            index = await player.add_track(tracks)
-            await send(ctx, "playlistLoad", attachment.filename, index)
+            message = await send(ctx, "playlistLoading", attachment.filename, 0, len(track_ids))
+            index = await player.add_encoded_tracks(
+                track_ids, ctx.author,
+                on_progress=progress_updater(message, ctx.guild.id, "playlistLoading", attachment.filename)
+            )
+
+            if not message:
+                return await send(ctx, "playlistLoad", attachment.filename, index)
+            text = await get_lang(ctx.guild.id, "playlistLoad")
+            await message.edit(content=text.format(attachment.filename, index))
         except Exception as e:
             logger.error("error", exc_info=e)
             raise e
@@ -22,12 +22,22 @@ SOFTWARE.
 """
 
 import os
+import time
 import asyncio
 import discord
 import voicelink
 import function as func
 
 from discord.ext import commands
+from typing import List
+
+# Players restored at the same time. Each one is a gateway voice state update plus a few
+# Lavalink REST calls, so keep this well under the gateway's 120 events per minute
+RESTORE_CONCURRENCY = 4
+# Pause after each restore before that slot takes the next player
+RESTORE_PACING = 1.0
+# Seconds to wait for a Lavalink node before giving up on restoring players
+RESTORE_NODE_TIMEOUT = 60
 
 class Listeners(commands.Cog):
     """Music Cog."""
@@ -57,7 +67,8 @@ class Listeners(commands.Cog):
                         password=str(n["password"]),
                         secure=bool(n["secure"]),
                         identifier=str(n["identifier"]),
-                        logger=func.logger
+                        logger=func.logger,
+                        search_cache=func.settings.search_cache
                     )
                     func.logger.info(f'Node {n["identifier"]} connected successfully!')
                 except Exception as e:
@@ -77,70 +88,40 @@ class Listeners(commands.Cog):
         if not players:
             return
 
-        for data in players:
-            try:
-                channel_id = data.get("channel_id")
-                if not channel_id:
-                    continue
-
-                channel = self.bot.get_channel(channel_id)
-                if not channel:
-                    continue
-                elif not any(False if member.bot or member.voice.self_deaf else True for member in channel.members):
-                    continue
-                    
-                dj_member = channel.guild.get_member(data.get("dj"))
-                if not dj_member:
-                    continue
-
-                # Get the guild settings
-                settings = await func.get_settings(channel.guild.id)
+        started_at = time.perf_counter()
+        waited = 0
+        while not self.voicelink._nodes and waited < RESTORE_NODE_TIMEOUT:
+            await asyncio.sleep(1)
+            waited += 1
 
-                # Connect to the channel and initialize the player.
-                player: voicelink.Player = await channel.connect(
-                    cls=voicelink.Player(self.bot, channel, func.TempCtx(dj_member, channel), settings)
-                )
+        # Only channels someone is still listening in, busiest first
+        candidates = []
+        for data in players:
+            channel = self.bot.get_channel(data.get("channel_id")) if data.get("channel_id") else None
+            if not channel:
+                continue
 
-                # Restore the queue.
-                queue_data = data.get("queue", {})
-                for track_data in queue_data.get("tracks", []):
-                    track_id = track_data.get("track_id")
-                    if not track_id:
-                        continue
+            listeners = sum(1 for member in channel.members if not member.bot and not member.voice.self_deaf)
+            if listeners:
+                candidates.append((listeners, channel, data))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
 
-                    decoded_track = voicelink.decode(track_id)
-                    requester = channel.guild.get_member(track_data.get("requester_id"))
-                    track = voicelink.Track(track_id=track_id, info=decoded_track, requester=requester)
-                    player.queue._queue.append(track)
-                
-                # Restore queue settings.
-                player.queue._position = queue_data.get("position", 0) - 1
-                repeat_mode = queue_data.get("repeat_mode", "OFF")
+        semaphore = asyncio.Semaphore(RESTORE_CONCURRENCY)
+        async def restore(channel: discord.VoiceChannel, data: dict) -> bool:
+            async with semaphore:
                 try:
-                    loop_mode = voicelink.LoopType[repeat_mode]
-                except KeyError:
-                    loop_mode = voicelink.LoopType.OFF
-                player.queue._repeat.set_mode(loop_mode)
-                player.queue._repeat_position = queue_data.get("repeat_position")
-
-                # Restore player settings
-                player.dj = dj_member
-                player.settings['autoplay'] = data.get('autoplay', False)
-
-                # Resume playback or invoke the controller based on the player's state.
-                if not player.is_playing:
-                    await player.do_next()
-
-                    if is_paused := data.get("is_paused"):
-                        await player.set_pause(is_paused, self.bot.user)
-                    
-                    if position := data.get("position"):
-                        await player.seek(int(position), self.bot.user)
-
-                await asyncio.sleep(5)
+                    return await self.restore_player(channel, data)
+                except Exception as e:
+                    func.logger.error(f"Error encountered while restoring a player for channel ID {channel.id}.", exc_info=e)
+                    return False
+                finally:
+                    await asyncio.sleep(RESTORE_PACING)
 
-            except Exception as e:
-                func.logger.error(f"Error encountered while restoring a player for channel ID {channel_id}.", exc_info=e)
+        results = await asyncio.gather(*(restore(channel, data) for _, channel, data in candidates))
+        func.logger.info(
+            f"Restored {sum(results)}/{len(players)} players from the last session in {time.perf_counter() - started_at:.1f}s "
+            f"({len(players) - len(candidates)} skipped with no listeners, {results.count(False)} failed)"
+        )
 
         # Delete the last session file if it exists.
         try:
@@ -151,6 +132,66 @@ class Listeners(commands.Cog):
         except Exception as del_error:
             func.logger.error("Failed to remove session file: %s", file_path, exc_info=del_error)
 
+    async def restore_player(self, channel: discord.VoiceChannel, data: dict) -> bool:
+        """Reconnects one player from the last session and restores its queue and state."""
+        dj_member = channel.guild.get_member(data.get("dj"))
+        if not dj_member:
+            return False
+
+        # Get the guild settings
+        settings = await func.get_settings(channel.guild.id)
+
+        # Decode the saved queue in a worker thread while the voice connection is set up
+        queue_data = data.get("queue", {})
+        tracks_future = self.bot.loop.run_in_executor(None, self.decode_session_tracks, channel.guild, queue_data.get("tracks", []))
+
+        # Connect to the channel and initialize the player.
+        player: voicelink.Player = await channel.connect(
+            cls=voicelink.Player(self.bot, channel, func.TempCtx(dj_member, channel), settings)
+        )
+
+        # Restore the queue.
+        player.queue._queue.extend(await tracks_future)
+
+        # Restore queue settings.
+        player.queue._position = queue_data.get("position", 0) - 1
+        player.queue._tracks_changed()
+        repeat_mode = queue_data.get("repeat_mode", "OFF")
+        try:
+            loop_mode = voicelink.LoopType[repeat_mode]
+        except KeyError:
+            loop_mode = voicelink.LoopType.OFF
+        player.queue._repeat.set_mode(loop_mode)
+        player.queue._repeat_position = queue_data.get("repeat_position")
+
+        # Restore player settings
+        player.dj = dj_member
+        player.settings['autoplay'] = data.get('autoplay', False)
+
+        # Resume playback or invoke the controller based on the player's state.
+        if not player.is_playing:
+            await player.do_next()
+
+            if is_paused := data.get("is_paused"):
+                await player.set_pause(is_paused, self.bot.user)
+            
+            if position := data.get("position"):
+                await player.seek(int(position), self.bot.user)
+
+        return True
+
+    @staticmethod
+    def decode_session_tracks(guild: discord.Guild, tracks_data: List[dict]) -> List[voicelink.Track]:
+        """Decodes a saved queue (runs in a worker thread)"""
+        tracks = []
+        for track_data in tracks_data:
+            if not (track_id := track_data.get("track_id")):
+                continue
+
+            requester = guild.get_member(track_data.get("requester_id"))
+            tracks.append(voicelink.Track(track_id=track_id, info=voicelink.decode(track_id), requester=requester))
+        return tracks
+
     @commands.Cog.listener()
     async def on_voicelink_track_end(self, player: voicelink.Player, track, _):
         await player.do_next()
@@ -216,7 +257,8 @@ class Listeners(commands.Cog):
                     password=str(node_config["password"]),
                     secure=bool(node_config["secure"]),
                     identifier=str(node_config["identifier"]),
-                    logger=func.logger
+                    logger=func.logger,
+                    search_cache=func.settings.search_cache
                 )
                 func.logger.info(f'Node {node_id} reconnected successfully!')
         except Exception as e:
@@ -237,7 +279,8 @@ class Listeners(commands.Cog):
                     password=str(node_config["password"]),
                     secure=bool(node_config["secure"]),
                     identifier=str(node_config["identifier"]),
-                    logger=func.logger
+                    logger=func.logger,
+                    search_cache=func.settings.search_cache
                 )
                 func.logger.info(f'Node {node_id} retry connection successful!')
         except Exception as e:
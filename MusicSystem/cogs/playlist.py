@@ -36,6 +36,7 @@ from function import (
     settings,
     get_aliases,
     cooldown_check,
+    progress_updater,
     logger
 )
 
@@ -136,11 +137,21 @@ class Playlists(commands.Cog, name="playlist"):
             if not result['playlist']['tracks']:
                 return await send(ctx, 'playlistNoTrack', result['playlist']['name'], ephemeral=True)
 
-            _tracks = []
-            for track in result['playlist']['tracks'][:max_t]:
-                _tracks.append(voicelink.Track(track_id=track, info=voicelink.decode(track), requester=ctx.author))
-                    
-            tracks = {"name": result['playlist']['name'], "tracks": _tracks}
+            # Stored tracks are queued in chunks, so the first songs play while the rest load
+            track_ids = result['playlist']['tracks'][:max_t]
+            if value and 0 < value <= len(track_ids):
+                track_ids = [track_ids[value - 1]]
+
+            message = await send(ctx, 'playlistLoading', result['playlist']['name'], 0, len(track_ids))
+            added = await player.add_encoded_tracks(
+                track_ids, ctx.author,
+                on_progress=progress_updater(message, ctx.guild.id, 'playlistLoading', result['playlist']['name'])
+            )
+
+            if not message:
+                return await send(ctx, 'playlistPlay', result['playlist']['name'], added)
+            text = await get_lang(ctx.guild.id, 'playlistPlay')
+            return await message.edit(content=text.format(result['playlist']['name'], added))
 
         if not tracks:
             return await send(ctx, 'playlistNoTrack', result['playlist']['name'], ephemeral=True)
@@ -25,14 +25,17 @@ import discord, json, os, copy, logging
 import traceback
 
 from discord.ext import commands
-from time import strptime
+from collections import deque
+from time import strptime, monotonic
 from addons import Settings
 
 from typing import (
     Optional,
     Union,
     Dict,
-    Any
+    Any,
+    Callable,
+    Awaitable
 )
 
 from motor.motor_asyncio import (
@@ -58,6 +61,8 @@ MISSING_TRANSLATOR = {}
 LANGS: dict[str, dict[str, str]] = {} #Stores all the languages in ./langs
 SETTINGS_BUFFER: dict[int, dict[str, Any]] = {} #Cache guild language
 USERS_BUFFER: dict[str, dict] = {}
+RECENT_MESSAGES: dict[int, deque[int]] = {} #Newest message ids in channels that have a music controller
+RECENT_MESSAGE_LIMIT = 20
 
 USER_BASE: dict[str, Any] = {
     'playlist': {
@@ -73,6 +78,7 @@ USER_BASE: dict[str, Any] = {
 }
 
 ALLOWED_MENTIONS = discord.AllowedMentions().none()
+PROGRESS_EDIT_INTERVAL = 1.5 #Seconds between progress message edits, to stay clear of rate limits
 LAST_SESSION_FILE_NAME = "last-session.json"
 
 def load_settings() -> None:
@@ -284,6 +290,41 @@ async def send(
         traceback.print_exc()
         return None
 
+def watch_channel(channel_id: int) -> deque[int]:
+    """Starts recording new message ids in a channel that has a music controller"""
+    return RECENT_MESSAGES.setdefault(channel_id, deque(maxlen=RECENT_MESSAGE_LIMIT))
+
+def record_message(message: discord.Message) -> None:
+    """Called from on_message for every message, so controllers know what was posted after them"""
+    if (recent := RECENT_MESSAGES.get(message.channel.id)) is not None:
+        recent.append(message.id)
+
+def forget_message(channel_id: int, message_id: int) -> None:
+    """Called when the bot deletes a message it recorded, e.g. in the music request channel"""
+    if (recent := RECENT_MESSAGES.get(channel_id)) is not None:
+        try:
+            recent.remove(message_id)
+        except ValueError:
+            pass
+
+def progress_updater(message: Optional[discord.Message], guild_id: int, key: str, *params) -> Callable[[int, int], Awaitable[None]]:
+    """Returns a callback that edits `message` with the `key` text formatted with params, done and total"""
+    last_edit = monotonic()
+
+    async def update(done: int, total: int) -> None:
+        nonlocal last_edit
+        if not message or done >= total or monotonic() - last_edit < PROGRESS_EDIT_INTERVAL:
+            return
+
+        last_edit = monotonic()
+        try:
+            text = await get_lang(guild_id, key)
+            await message.edit(content=text.format(*params, done, total))
+        except discord.HTTPException:
+            pass
+
+    return update
+
 async def update_db(db: AsyncIOMotorCollection, tempStore: dict, filter: dict, data: dict) -> bool:
     for mode, action in data.items():
         for key, value in action.items():
@@ -65,6 +65,9 @@ class Vocard(commands.Bot):
         self.ipc: IPCClient
 
     async def on_message(self, message: discord.Message, /) -> None:
+        # Let music controllers know about every new message, including the bot's own
+        func.record_message(message)
+
         # Ignore messages from bots or DMs
         if message.author.bot or not message.guild:
             return False
@@ -89,6 +92,7 @@ class Vocard(commands.Bot):
                     await func.send(ctx, str(e), ephemeral=True)
                 
                 finally:
+                    func.forget_message(message.channel.id, message.id)
                     return await message.delete()
             
         await self.process_commands(message)
@@ -297,7 +297,8 @@ class NodesPanel(discord.ui.View):
                             f"• CPU:     {node.stats.cpu_process_load:.1f}%\n" \
                             f"• RAM:     {func.format_bytes(node.stats.free)}/{func.format_bytes(total_memory, True)} ({(node.stats.free/total_memory) * 100:.1f}%)\n"
                             f"• LATENCY: {node.latency:.2f}ms\n" \
-                            f"• UPTIME:  {func.time(node.stats.uptime)}```"
+                            f"• UPTIME:  {func.time(node.stats.uptime)}\n" \
+                            f"• CACHE:   {len(node.search_cache)} entries, {node.search_cache.hit_rate * 100:.1f}% hit rate```"
                     )
                 else:
                     embed.add_field(
@@ -36,6 +36,9 @@ from function import (
 from .transformer import encode
 
 YOUTUBE_REGEX = re.compile(r'(https?://)?(www\.)?youtube\.(com|nl)/watch\?v=([-\w]+)')
+DEFAULT_URI = "https://discord.com/application-directory/605618911471468554"
+
+_UNSET = object()
 
 class Track:
     """The base track object. Returns critical track information needed for parsing by Lavalink.
@@ -45,18 +48,11 @@ class Track:
     __slots__ = (
         "_track_id",
         "info",
-        "identifier",
-        "title",
-        "author",
-        "uri",
-        "source",
         "_search_type",
-        "thumbnail",
-        "emoji",
-        "length",
+        "_source",
+        "_thumbnail",
+        "_emoji",
         "requester",
-        "is_stream",
-        "is_seekable",
         "position",
         "end_time"
     )
@@ -71,24 +67,15 @@ class Track:
     ):
         self._track_id: Optional[str] = track_id
         self.info: dict = info
-
-        self.identifier: str = info.get("identifier")
-        self.title: str = info.get("title", "Unknown")
-        self.author: str = info.get("author", "Unknown")
-        self.uri: str = info.get("uri", "https://discord.com/application-directory/605618911471468554")
-        self.source: str = info.get("sourceName", extract(self.uri).domain)
         self._search_type: SearchType = search_type
 
-        self.thumbnail: str = info.get("artworkUrl")
-        if not self.thumbnail and YOUTUBE_REGEX.match(self.uri):
-            self.thumbnail = f"https://img.youtube.com/vi/{self.identifier}/maxresdefault.jpg"
-        
-        self.emoji: str = get_source(self.source, "emoji")
-        self.length: float = info.get("length")
-        
+        # Derived from info on first access - a playlist can hold thousands of tracks
+        # but only a handful are ever displayed
+        self._source: Optional[str] = None
+        self._thumbnail: Optional[str] = _UNSET
+        self._emoji: Optional[str] = None
+
         self.requester: Member = requester
-        self.is_stream: bool = info.get("isStream", False)
-        self.is_seekable: bool = info.get("isSeekable", True)
         self.position: int = info.get("position", 0)
 
         self.end_time: Optional[int] = None
@@ -112,6 +99,59 @@ class Track:
         
         return self._track_id
     
+    @property
+    def identifier(self) -> str:
+        return self.info.get("identifier")
+
+    @property
+    def title(self) -> str:
+        return self.info.get("title", "Unknown")
+
+    @property
+    def author(self) -> str:
+        return self.info.get("author", "Unknown")
+
+    @property
+    def uri(self) -> str:
+        return self.info.get("uri", DEFAULT_URI)
+
+    @property
+    def length(self) -> float:
+        return self.info.get("length")
+
+    @property
+    def is_stream(self) -> bool:
+        return self.info.get("isStream", False)
+
+    @property
+    def is_seekable(self) -> bool:
+        return self.info.get("isSeekable", True)
+
+    @property
+    def source(self) -> str:
+        if self._source is None:
+            source = self.info.get("sourceName")
+            self._source = source if source is not None else extract(self.uri).domain
+
+        return self._source
+
+    @property
+    def thumbnail(self) -> Optional[str]:
+        if self._thumbnail is _UNSET:
+            thumbnail = self.info.get("artworkUrl")
+            if not thumbnail and YOUTUBE_REGEX.match(self.uri):
+                thumbnail = f"https://img.youtube.com/vi/{self.identifier}/maxresdefault.jpg"
+            self._thumbnail = thumbnail
+
+        return self._thumbnail
+
+    @property
+    def emoji(self) -> str:
+        if self._emoji is None:
+            self._emoji = get_source(self.source, "emoji")
+
+        return self._emoji
+
     @property
     def formatted_length(self) -> str:
         return ctime(self.length)
@@ -23,13 +23,14 @@ SOFTWARE.
 
 from __future__ import annotations
 
-import re
 import function as func
 import logging
 
 from discord import Embed, Client
 
-from typing import TYPE_CHECKING
+from typing import Any, Iterator, TYPE_CHECKING
+
+from .template import compile_template
 
 if TYPE_CHECKING:
     from .player import Player
@@ -154,49 +155,45 @@ class Placeholders:
     def bot_icon(self) -> str:
         return self.bot.user.display_avatar.url if self.player else "https://i.imgur.com/dIFBwU7.png"
         
-    def replace(self, text: str, variables: dict[str, str]) -> str:
-        if not text or text.isspace(): return
-        pattern = r"\{\{(.*?)\}\}"
-        matches: list[str] = re.findall(pattern, text)
-
-        for match in matches:
-            parts: list[str] = match.split("??")
-            expression = parts[0].strip()
-            true_value, false_value = "", ""
-
-            # Split the true and false values
-            if "//" in parts[1]:
-                true_value, false_value = [part.strip() for part in parts[1].split("//")]
-            else:
-                true_value = parts[1].strip()
-
-            try:
-                # Replace variable placeholders with their values
-                expression = re.sub(r'@@(.*?)@@', lambda x: "'" + variables.get(x.group(1), '') + "'", expression)
-                expression = re.sub(r"'(\d+)'", lambda x: str(int(x.group(1))), expression)
-                expression = re.sub(r"'(\d+)'\s*([><=!]+)\s*(\d+)", lambda x: f"{int(x.group(1))} {x.group(2)} {int(x.group(3))}", expression)
-
-                # Convert JSON-style booleans to Python booleans
-                expression = expression.replace('false', 'False').replace('true', 'True')
-
-                # Evaluate the expression
-                result = eval(expression, {"__builtins__": None}, variables)
-
-                # Replace the match with the true or false value based on the result
-                replacement = true_value if result else false_value
-                text = text.replace("{{" + match + "}}", replacement)
+    def evaluate(self, names: set[str]) -> dict[str, Any]:
+        """Evaluates only the given variables"""
+        return {
+            key: func() if callable(func) else func
+            for key, func in self.variables.items() if key in names
+        }
 
-            except:
-                text = text.replace("{{" + match + "}}", "")
+    def render(self, text: str) -> str:
+        """Renders a template, evaluating only the variables it references"""
+        if not text or text.isspace(): return
+        template = compile_template(text)
+        return template.render(self.evaluate(template.names))
 
-        text = re.sub(r'@@(.*?)@@', lambda x: str(variables.get(x.group(1), '')), text)
-        return text
+    def replace(self, text: str, variables: dict[str, str]) -> str:
+        if not text or text.isspace(): return
+        return compile_template(text).render(variables)
+
+def _template_strings(raw: dict[str, dict]) -> Iterator[str]:
+    """Yields every template string an embed definition uses"""
+    yield raw.get("description", "")
+    yield raw.get("color", "0xb3b3b3")
+    for key, sub_keys in (("author", ("name", "url", "icon_url")), ("title", ("name", "url")), ("footer", ("text", "icon_url"))):
+        if section := raw.get(key):
+            yield from (section.get(sub_key, "") for sub_key in sub_keys)
+    for field in raw.get("fields", []) or []:
+        yield field.get("name", "")
+        yield field.get("value", "")
+    yield raw.get("thumbnail", "")
+    yield raw.get("image", "")
     
 def build_embed(raw: dict[str, dict], placeholder: Placeholders) -> Embed:
     logger = logging.getLogger("vocard.embed")
     embed = Embed()
     try:
-        rv = {key: func() if callable(func) else func for key, func in placeholder.variables.items()}
+        names = set()
+        for text in _template_strings(raw):
+            if text and isinstance(text, str):
+                names |= compile_template(text).names
+        rv = placeholder.evaluate(names)
         
         # Description - Handle this first to ensure it's always set
         try:
@@ -212,8 +209,8 @@ def build_embed(raw: dict[str, dict], placeholder: Placeholders) -> Embed:
         if author := raw.get("author"):
             try:
                 name = placeholder.replace(author.get("name", ""), rv) or " "
-                url = placeholder.replace(author.get("url", ""), rv) or discord.Embed.Empty
-                icon_url = placeholder.replace(author.get("icon_url", ""), rv) or discord.Embed.Empty
+                url = placeholder.replace(author.get("url", ""), rv) or None
+                icon_url = placeholder.replace(author.get("icon_url", ""), rv) or None
                 embed.set_author(name=name, url=url, icon_url=icon_url)
             except Exception as e:
                 logger.warning(f"Failed to set embed author: {e}")
@@ -222,7 +219,7 @@ def build_embed(raw: dict[str, dict], placeholder: Placeholders) -> Embed:
         if title := raw.get("title"):
             try:
                 embed.title = placeholder.replace(title.get("name", ""), rv) or " "
-                embed.url = placeholder.replace(title.get("url", ""), rv) or discord.Embed.Empty
+                embed.url = placeholder.replace(title.get("url", ""), rv) or None
             except Exception as e:
                 logger.warning(f"Failed to set embed title: {e}")
 
@@ -241,7 +238,7 @@ def build_embed(raw: dict[str, dict], placeholder: Placeholders) -> Embed:
         if footer := raw.get("footer"):
             try:
                 text = placeholder.replace(footer.get("text", ""), rv) or " "
-                icon_url = placeholder.replace(footer.get("icon_url", ""), rv) or discord.Embed.Empty
+                icon_url = placeholder.replace(footer.get("icon_url", ""), rv) or None
                 embed.set_footer(text=text, icon_url=icon_url)
             except Exception as e:
                 logger.warning(f"Failed to set embed footer: {e}")
@@ -249,7 +246,7 @@ def build_embed(raw: dict[str, dict], placeholder: Placeholders) -> Embed:
         # Thumbnail
         if thumbnail := raw.get("thumbnail"):
             try:
-                url = placeholder.replace(thumbnail, rv) or discord.Embed.Empty
+                url = placeholder.replace(thumbnail, rv) or None
                 embed.set_thumbnail(url=url)
             except Exception as e:
                 logger.warning(f"Failed to set embed thumbnail: {e}")
@@ -257,7 +254,7 @@ def build_embed(raw: dict[str, dict], placeholder: Placeholders) -> Embed:
         # Image
         if image := raw.get("image"):
             try:
-                url = placeholder.replace(image, rv) or discord.Embed.Empty
+                url = placeholder.replace(image, rv) or None
                 embed.set_image(url=url)
             except Exception as e:
                 logger.warning(f"Failed to set embed image: {e}")
@@ -21,13 +21,13 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import time, logging
+import time, logging, json
 import function as func
 
 from math import ceil
-from asyncio import sleep
+from asyncio import sleep, Task
 from views import InteractiveController
-from typing import Any, Dict, List, Optional, Union, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union, Tuple
 
 from discord import (
     Client,
@@ -39,7 +39,8 @@ from discord import (
     PartialMessage,
     Interaction,
     errors,
-    ChannelType
+    ChannelType,
+    Embed
 )
 
 from discord.ext import commands
@@ -47,7 +48,7 @@ from discord.ext import commands
 from . import events
 from .enums import SearchType, LoopType, RequestMethod
 from .events import VoicelinkEvent, TrackEndEvent, TrackStartEvent, TrackExceptionEvent
-from .exceptions import VoicelinkException, FilterInvalidArgument, TrackInvalidPosition, FilterTagAlreadyInUse, DuplicateTrack
+from .exceptions import VoicelinkException, FilterInvalidArgument, TrackInvalidPosition, FilterTagAlreadyInUse, DuplicateTrack, QueueFull
 from .filters import Filter, Filters
 from .objects import Track, Playlist
 from .pool import Node, NodePool
@@ -55,6 +56,31 @@ from .queue import Queue, FairQueue
 from .placeholders import Placeholders, build_embed
 from random import shuffle, choice
 
+# Controller updates requested within this window are merged into one message edit
+CONTROLLER_UPDATE_DELAY = 0.5
+# The controller is edited in place while fewer than this many messages were posted after it
+CONTROLLER_FRESH_MESSAGES = 5
+# Minimum seconds between resending the controller to the bottom of a channel
+CONTROLLER_RESEND_COOLDOWN = 10.0
+
+_controller_resends: Dict[int, float] = {}
+
+# Stored tracks are decoded and queued this many at a time when loading a playlist
+TRACK_LOAD_CHUNK_SIZE = 200
+
+def _without_custom_ids(component: Any) -> Any:
+    if isinstance(component, dict):
+        return {key: _without_custom_ids(value) for key, value in component.items() if key != "custom_id"}
+    if isinstance(component, list):
+        return [_without_custom_ids(value) for value in component]
+    return component
+
+def controller_payload_hash(embed: Embed, view: InteractiveController) -> int:
+    """Hashes what the controller message shows. Custom ids are left out because buttons
+    created without one get a random id for every new view."""
+    components = _without_custom_ids(view.to_components())
+    return hash(json.dumps({"embed": embed.to_dict(), "components": components}, sort_keys=True, default=str))
+
 async def connect_channel(ctx: Union[commands.Context, Interaction], channel: VoiceChannel = None):
     texts = await func.get_lang(ctx.guild.id, "noChannel", "noPermission")
     try:
@@ -145,7 +171,9 @@ class Player(VoiceProtocol):
         self._voice_state: dict = {}
 
         self.controller: Union[Message, PartialMessage] = None
-        self._updating: bool = False
+        self._controller_task: Optional[Task] = None
+        self._controller_dirty: bool = False
+        self._controller_hash: Optional[int] = None
 
         self.pause_votes = set()
         self.resume_votes = set()
@@ -314,7 +342,8 @@ class Player(VoiceProtocol):
     def build_embed(self, current_track: Track = None):
         """Builds an embed based on the current track state."""
         controller = self.settings.get("default_controller", func.settings.controller).get("embeds", {})
-        raw = controller.get("active" if current_track else "inactive", {})
+        # Copy so the guild's (or the default) template isn't modified below
+        raw = dict(controller.get("active" if current_track else "inactive", {}))
         
         # Create a custom description if we have a current track
         if current_track:
@@ -472,21 +501,34 @@ class Player(VoiceProtocol):
             })
 
     async def invoke_controller(self):
-        """Sends or updates the music controller message in the designated channel."""
-        if not self.settings.get('controller', True):
+        """Schedules an update of the music controller message in the designated channel.
+        Updates requested while one is pending or in progress are coalesced into a single edit."""
+        if not self.settings.get('controller', True) or not self.channel:
             return
-        
-        if self._updating or not self.channel:
-            return
-        
-        self._updating = True
 
+        self._controller_dirty = True
+        if not self._controller_task or self._controller_task.done():
+            self._controller_task = self._bot.loop.create_task(self._update_controller())
+
+    async def _update_controller(self):
+        while self._controller_dirty:
+            await sleep(CONTROLLER_UPDATE_DELAY)
+            self._controller_dirty = False
+            await self._render_controller()
+
+    async def _render_controller(self):
+        """Sends or updates the music controller message, skipping edits that wouldn't change it."""
         try:            
             embed, view = self.build_embed(self.current), InteractiveController(self)
             
             # Ensure we have a valid description
             if not getattr(embed, 'description', None) or not isinstance(embed.description, str) or embed.description.isspace():
                 embed.description = "No description available"
+
+            payload_hash = controller_payload_hash(embed, view)
+            if self.controller and payload_hash == self._controller_hash:
+                self._logger.debug(f"Music controller in {self.guild.name}({self.guild.id}) is unchanged, skipping edit.")
+                return
             
             # Log embed details for diagnostics
             try:
@@ -508,32 +550,44 @@ class Player(VoiceProtocol):
                 if not self.controller:
                     self.controller = await self.context.channel.send(embed=embed, view=view)
 
-            elif not await self.is_position_fresh():
+            elif not await self.is_position_fresh() and self._can_resend_controller():
                 await self.controller.delete()
                 self.controller = await self.context.channel.send(embed=embed, view=view)
 
             else:
                 await self.controller.edit(embed=embed, view=view)
+
+            self._controller_hash = payload_hash
         
         except errors.Forbidden:
             self._logger.warning(f"Missing permission to update the music controller on {self.guild.name}({self.guild.id})")
 
         except Exception as e:
             self._logger.error(f"Something went wrong while sending music controller to {self.guild.name}({self.guild.id})", exc_info=e)
-        
-        finally:
-            self._updating = False
 
     async def is_position_fresh(self):
-        """Checks if the current controller message is among the most recent messages."""
-        try:
-            async for message in self.context.channel.history(limit=5):
-                if message.id == self.controller.id:
-                    return True
-        except:
-            pass
+        """Checks if the current controller message is among the most recent messages.
+        Uses the message ids recorded from on_message instead of fetching the channel history."""
+        recent = func.RECENT_MESSAGES.get(self.controller.channel.id)
+        if recent is None:
+            # Nothing recorded since startup, start watching and assume it's still visible
+            func.watch_channel(self.controller.channel.id)
+            return True
 
-        return False
+        return sum(1 for message_id in recent if message_id > self.controller.id) < CONTROLLER_FRESH_MESSAGES
+
+    def _can_resend_controller(self) -> bool:
+        """Rate limits resending the controller per channel, it's edited in place in between."""
+        channel_id = self.controller.channel.id
+        now = time.monotonic()
+        if now - _controller_resends.get(channel_id, 0.0) < CONTROLLER_RESEND_COOLDOWN:
+            return False
+
+        # Entries past the cooldown no longer limit anything, so drop them instead of keeping every channel ever seen
+        for stale_id in [cid for cid, sent_at in _controller_resends.items() if now - sent_at >= CONTROLLER_RESEND_COOLDOWN]:
+            del _controller_resends[stale_id]
+        _controller_resends[channel_id] = now
+        return True
     
     async def teardown(self):
         """Cleans up the player and associated resources."""
@@ -548,6 +602,9 @@ class Player(VoiceProtocol):
         except:
             pass
 
+        if self._controller_task:
+            self._controller_task.cancel()
+
         try:
             await self.update_voice_status(remove_status=True)
             if self.controller and self.controller.id == self.settings.get("music_request_channel", {}).get("controller_msg_id"):
@@ -664,19 +721,33 @@ class Player(VoiceProtocol):
     async def add_track(self, raw_tracks: Union[Track, List[Track]], *, start_time: int = 0, end_time: int = 0, at_front: bool = False, duplicate: bool = True) -> int:
         """Adds one or more tracks to the queue."""
         tracks: List[Track] = []
-        _duplicate_tracks = [] if self.queue._allow_duplicate and duplicate else [track.uri for track in self.queue._queue]
+        _duplicate_tracks = set() if self.queue._allow_duplicate and duplicate else {track.uri for track in self.queue._queue}
         raw_tracks = raw_tracks[0] if isinstance(raw_tracks, List) and len(raw_tracks) == 1 else raw_tracks
 
         try:
-            if (is_list := isinstance(raw_tracks, List)):
+            if (is_list := isinstance(raw_tracks, List)) and at_front:
                 for track in raw_tracks:
                     if track.uri in _duplicate_tracks:
                         continue
 
                     self._validate_time(track, start_time, end_time)
-                    self.queue.put_at_front(track) if at_front else self.queue.put(track)  
+                    self.queue.put_at_front(track)
                     tracks.append(track)
-                    _duplicate_tracks.append(track.uri)
+                    _duplicate_tracks.add(track.uri)
+            elif is_list:
+                # Validate everything first, then hand the whole batch to the queue in one call
+                pending: List[Track] = []
+                try:
+                    for track in raw_tracks:
+                        if track.uri in _duplicate_tracks:
+                            continue
+
+                        self._validate_time(track, start_time, end_time)
+                        pending.append(track)
+                        _duplicate_tracks.add(track.uri)
+                finally:
+                    if pending:
+                        tracks.extend(pending[:self.queue.put_many(pending)])
             else:
                 if raw_tracks.uri in _duplicate_tracks:
                     raise DuplicateTrack(self.get_msg("voicelinkDuplicateTrack"))
@@ -693,6 +764,41 @@ class Player(VoiceProtocol):
                 self._logger.debug(f"Player in {self.guild.name}({self.guild.id}) has been added {len(tracks)} tracks into the queue.")
                 return len(tracks) if is_list else position
     
+    async def add_encoded_tracks(
+        self,
+        track_ids: List[str],
+        requester: Member,
+        *,
+        on_progress: Callable[[int, int], Awaitable[None]] = None
+    ) -> int:
+        """Decodes stored track ids and adds them to the queue chunk by chunk.
+        Playback starts as soon as the first chunk is queued instead of after the whole playlist."""
+        added = 0
+        for start in range(0, len(track_ids), TRACK_LOAD_CHUNK_SIZE):
+            tracks = await self.node.build_tracks(track_ids[start:start + TRACK_LOAD_CHUNK_SIZE], requester)
+            if tracks:
+                try:
+                    # A single track comes back as its queue position rather than a count
+                    result = await self.add_track(tracks)
+                    added += (result or 0) if len(tracks) > 1 else 1
+                except DuplicateTrack:
+                    pass
+                except QueueFull:
+                    # Keep what was already queued once the queue fills up part way through
+                    if not added:
+                        raise
+                    break
+
+            if not self.is_playing:
+                await self.do_next()
+
+            if on_progress:
+                await on_progress(min(start + TRACK_LOAD_CHUNK_SIZE, len(track_ids)), len(track_ids))
+
+            await sleep(0)
+
+        return added
+
     async def remove_track(self, index: int, index2: int = None, remove_target: Member = None, requester: Member = None) -> Dict[int, Track]:
         """Removes one or more tracks from the queue."""
         removed_tracks = self.queue.remove(index, index2, remove_target)
@@ -914,8 +1020,7 @@ class Player(VoiceProtocol):
             return
         
         try:
-            rv = {key: func() if callable(func) else func for key, func in self._ph.variables.items()}
-            status = None if remove_status else self._ph.replace(text=template, variables=rv)
+            status = None if remove_status else self._ph.render(template)
             # if self.channel.status != status:
             if self.channel.type == ChannelType.voice:
                 await self.channel.edit(status=status)
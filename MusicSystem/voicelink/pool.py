@@ -26,12 +26,13 @@ from __future__ import annotations
 import asyncio
 import os
 import re
+import time
 import aiohttp
 import logging
 
 from discord import Client, Member
 from discord.ext.commands import Bot
-from typing import Dict, Optional, Union, List, Any, TYPE_CHECKING
+from typing import Callable, Dict, Optional, Union, List, Any, TYPE_CHECKING
 from urllib.parse import quote
 
 from . import (
@@ -48,7 +49,8 @@ from .exceptions import (
     TrackLoadError
 )
 from .objects import Playlist, Track
-from .utils import ExponentialBackoff, NodeStats, NodeInfo, Ping
+from .transformer import decode
+from .utils import ExponentialBackoff, NodeStats, NodeInfo, Ping, TTLCache
 from .enums import RequestMethod
 from .ratelimit import YTRatelimit, YTToken, STRATEGY
 
@@ -61,6 +63,28 @@ URL_REGEX = re.compile(
 
 NODE_VERSION = "v4"
 
+# Only these results are cached - playlists can be huge and change over time
+CACHEABLE_LOAD_TYPES = ("search", "track")
+
+# Session ids, guild ids and encoded tracks would make every request its own endpoint
+ENDPOINT_ID_REGEX = re.compile(r"sessions/[^/]+/players/\d+")
+
+# Called with (method, endpoint, status, seconds) after every REST request, e.g. to record metrics
+REST_OBSERVERS: List[Callable[[str, str, str, float], None]] = []
+
+def rest_endpoint(query: str) -> str:
+    """The REST path with ids and the query string removed - 'sessions/players', 'loadtracks', ..."""
+    return ENDPOINT_ID_REGEX.sub("sessions/players", query.split("?", 1)[0])
+
+def _notify_rest_observers(method: RequestMethod, query: str, status: str, started_at: float) -> None:
+    elapsed = time.perf_counter() - started_at
+    endpoint = rest_endpoint(query)
+    for observer in REST_OBSERVERS:
+        try:
+            observer(method.value, endpoint, status, elapsed)
+        except Exception:
+            pass
+
 class Node:
     """The base class for a node. 
        This node object represents a Lavalink node.
@@ -80,7 +104,8 @@ class Node:
         yt_ratelimit: dict = None,
         session: Optional[aiohttp.ClientSession] = None,
         resume_key: Optional[str] = None,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        search_cache: Optional[dict] = None
     ):
         self._bot: Bot = bot
         self._host: str = host
@@ -112,6 +137,12 @@ class Node:
 
         self._players: Dict[int, Player] = {}
         self._info: Optional[NodeInfo] = None
+
+        search_cache = search_cache or {}
+        self._search_cache: TTLCache = TTLCache(
+            max_size=search_cache.get("max_size", 1000),
+            ttl=search_cache.get("ttl", 600)
+        )
         
         self.yt_ratelimit: Optional[YTRatelimit] = STRATEGY.get(yt_ratelimit.get("strategy"))(self, yt_ratelimit) if yt_ratelimit else None
 
@@ -133,6 +164,11 @@ class Node:
         return self._websocket is not None and not self._websocket.closed
 
 
+    @property
+    def search_cache(self) -> TTLCache:
+        """Property which returns the cache of search and track lookups."""
+        return self._search_cache
+
     @property
     def stats(self) -> NodeStats:
         """Property which returns the node stats."""
@@ -278,6 +314,8 @@ class Node:
         
         # Add timeout and retry logic for network issues
         for attempt in range(3):
+            started_at = time.perf_counter()
+            status = "error"
             try:
                 timeout = aiohttp.ClientTimeout(total=30, connect=10)
                 async with self._session.request(
@@ -287,6 +325,7 @@ class Node:
                     json=data,
                     timeout=timeout
                 ) as resp:
+                    status = str(resp.status)
                     if resp.status >= 300:
                         raise NodeException(f"Getting errors from Lavalink REST api")
                     
@@ -306,6 +345,9 @@ class Node:
             except Exception as e:
                 self._logger.error(f"Unexpected error in node communication: {e}")
                 raise
+            finally:
+                if REST_OBSERVERS:
+                    _notify_rest_observers(method, query, status, started_at)
 
     async def connect(self) -> Node:
         """Initiates a connection with a Lavalink node and adds it to the node pool."""
@@ -390,6 +432,34 @@ class Node:
         data = await self.send(RequestMethod.GET, f"decodetrack?encodedTrack={identifier}")
         return Track(track_id=identifier, info=data, requester=requester)
 
+    async def build_tracks(
+        self,
+        identifiers: List[str],
+        requester: Member = None
+    ) -> List[Track]:
+        """
+        Builds tracks from many track identifiers at once, keeping their order
+
+        Identifiers are decoded locally, and any the local decoder can't read
+        are sent to Lavalink in a single decodetracks request.
+        """
+
+        tracks: List[Optional[Track]] = []
+        unknown: Dict[int, str] = {}
+        for identifier in identifiers:
+            try:
+                tracks.append(Track(track_id=identifier, info=decode(identifier), requester=requester))
+            except Exception:
+                unknown[len(tracks)] = identifier
+                tracks.append(None)
+
+        if unknown:
+            data = await self.send(RequestMethod.POST, "decodetracks", data=list(unknown.values()))
+            for index, track in zip(unknown, data):
+                tracks[index] = Track(track_id=track["encoded"], info=track["info"], requester=requester)
+
+        return [track for track in tracks if track is not None]
+
     async def get_tracks(
         self,
         query: str,
@@ -406,8 +476,16 @@ class Node:
 
         if not URL_REGEX.match(query) and ':' not in query:
             query = f"{search_type}:{query}"
-
-        response: dict[str, Any] = await self.send(RequestMethod.GET, f"loadtracks?identifier={quote(query)}")
+            # Free-text searches differ only in case and spacing are the same search
+            cache_key = (str(search_type), " ".join(query.split(":", 1)[1].lower().split()))
+        else:
+            cache_key = (None, query.strip())
+
+        response: dict[str, Any] = await self._search_cache.get_or_fetch(
+            cache_key,
+            lambda: self.send(RequestMethod.GET, f"loadtracks?identifier={quote(query)}"),
+            should_cache=lambda response: isinstance(response, dict) and response.get("loadType") in CACHEABLE_LOAD_TYPES
+        )
         data = response.get("data")
         load_type = response.get("loadType")
 
@@ -540,7 +618,8 @@ class NodePool:
         yt_ratelimit: dict = None,
         session: Optional[aiohttp.ClientSession] = None,
         resume_key: Optional[str] = None,
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        search_cache: Optional[dict] = None
     ) -> Node:
         """Creates a Node object to be then added into the node pool.
         """
@@ -553,7 +632,7 @@ class NodePool:
         node = Node(
             pool=cls, bot=bot, host=host, port=port, password=password,
             identifier=identifier, secure=secure, heartbeat=heartbeat, yt_ratelimit=yt_ratelimit,
-            session=session, resume_key=resume_key, logger=logger
+            session=session, resume_key=resume_key, logger=logger, search_cache=search_cache
         )
 
         await node.connect()
@@ -85,18 +85,30 @@ class Queue:
         self._queue.append(item)
         return self.count
 
+    def put_many(self, items: List[Track]) -> int:
+        """Appends as many of items as fit and returns how many were added."""
+        space = self._size - self.count
+        if items and space <= 0:
+            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
+
+        added = items[:space]
+        self._queue.extend(added)
+        return len(added)
+
     def put_at_front(self, item: Track) -> int:
         if self.count >= self._size:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
         self._queue.insert(self._position, item)
+        self._tracks_changed()
         return 1
 
     def put_at_index(self, index: int, item: Track) -> None:
         if self.count >= self._size:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
-        return self._queue.insert(self._position - 1 + index, item)
+        self._queue.insert(self._position - 1 + index, item)
+        self._tracks_changed()
 
     def skipto(self, index: int) -> None:
         if not 0 < index <= self.count:
@@ -113,9 +125,11 @@ class Queue:
     def history_clear(self, is_playing: bool) -> None:
         self._queue[:self._position - 1 if is_playing else self._position] = []
         self._position = 1 if is_playing else 0
+        self._tracks_changed()
 
     def clear(self) -> None:
         del self._queue[self._position:]
+        self._tracks_changed()
 
     def replace(self, queue_type: str, replacement: list) -> None:
         if queue_type == "queue":
@@ -123,11 +137,13 @@ class Queue:
             self._queue += replacement
         elif queue_type == "history":
             self._queue[:self._position] = replacement
+        self._tracks_changed()
 
     def swap(self, track_index1: int, track_index2: int) -> Tuple[Track, Track]:
         try:
             adjusted_position = self._position - 1
             self._queue[adjusted_position + track_index1], self._queue[adjusted_position + track_index2] = self._queue[adjusted_position + track_index2], self._queue[adjusted_position + track_index1]
+            self._tracks_changed()
             return self._queue[adjusted_position + track_index1], self._queue[adjusted_position + track_index2]
         except IndexError:
             raise OutofList(self.get_msg("voicelinkOutofList"))
@@ -137,9 +153,11 @@ class Queue:
             raise OutofList(self.get_msg("voicelinkOutofList"))
 
         try:
-            item = self._queue[self._position + target - 1]
-            self._queue.remove(item)
-            self.put_at_index(to, item)
+            # Pop by index rather than list.remove(item): no equality scan, and the right
+            # copy is moved when the same track is queued more than once
+            item = self._queue.pop(self._position + target - 1)
+            self._queue.insert(self._position - 1 + to, item)
+            self._tracks_changed()
             return item
         except:
             raise OutofList(self.get_msg("voicelinkOutofList"))
@@ -153,19 +171,28 @@ class Queue:
         elif index2 < index:
             index, index2 = index2, index
 
+        start, end = pos + index, pos + index2 + 1
         try:
-            removed_tracks: Dict[str, Track] = {}
-            for i, track in enumerate(self._queue[pos + index: pos + index2 + 1]):
+            removed_tracks: Dict[int, Track] = {}
+            kept_tracks: List[Track] = []
+            for i, track in enumerate(self._queue[start:end], start):
                 if member and track.requester != member:
+                    kept_tracks.append(track)
                     continue
-            
-                self._queue.remove(track)
-                removed_tracks[pos + index + i] = track
 
+                removed_tracks[i] = track
+
+            # Rewrite the range in one slice assignment instead of a list.remove() per track
+            self._queue[start:end] = kept_tracks
+            self._tracks_changed()
             return removed_tracks
         except:
             raise OutofList(self.get_msg("voicelinkOutofList"))
 
+    def _tracks_changed(self) -> None:
+        """Called whenever tracks are inserted, removed or reordered outside of put()."""
+        pass
+
     def history(self, incTrack: bool = False) -> List[Track]:
         if incTrack:
             return self._queue[:self._position]
@@ -178,7 +205,7 @@ class Queue:
 
     @property
     def count(self) -> int:
-        return len(self._queue[self._position:])
+        return max(0, len(self._queue) - self._position)
     
     @property
     def repeat(self) -> str:
@@ -186,33 +213,114 @@ class Queue:
 
     @property
     def is_empty(self) -> bool:
-        try:
-            self._queue[self._position]
-        except:
-            return True
-        return False
+        return self._position >= len(self._queue)
 
 class FairQueue(Queue):
+    """A queue that interleaves requesters so nobody can hog the upcoming tracks.
+
+    A new track goes after its requester's last upcoming track, then past the run of
+    tracks that follows it for as long as every requester in that run is distinct.
+    The index of each requester's last track is kept up to date so put() doesn't
+    have to scan the queue; the forward run can't be longer than the number of
+    requesters. Any other change to the queue drops the index and it is rebuilt
+    on the next put().
+    """
+
     def __init__(self, size: int, allow_duplicate: bool, get_msg) -> None:
         super().__init__(size, allow_duplicate, get_msg)
-        self._set = set()
+        self._last_index: Optional[Dict[Member, int]] = None  # requester -> index in _queue of their last track
+        self._indexed_length: int = 0
+
+    @property
+    def _window_start(self) -> int:
+        # Upcoming tracks, including the one that is playing
+        return self._position - 1 if self._position > 0 else 0
+
+    def _tracks_changed(self) -> None:
+        self._last_index = None
+
+    def _requester_index(self) -> Dict[Member, int]:
+        if self._last_index is None or self._indexed_length != len(self._queue):
+            self._last_index = {}
+            for index in range(self._window_start, len(self._queue)):
+                self._last_index[self._queue[index].requester] = index
+            self._indexed_length = len(self._queue)
+
+        return self._last_index
+
+    def _fair_index(self, requester: Member, last_index: Dict[Member, int]) -> int:
+        """Returns the index in _queue where the next track from requester belongs."""
+        start = self._window_start
+        index = last_index.get(requester, -1) + 1
+        if index <= start:
+            index = start
+
+        seen = set()
+        while index < len(self._queue) and (track_requester := self._queue[index].requester) not in seen:
+            seen.add(track_requester)
+            index += 1
+
+        return index
 
     def put(self, item: Track) -> int:
         if len(self._queue) >= self._size:
             raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
 
-        tracks = self.tracks(incTrack=True)
-        lastIndex = len(tracks)
-        for track in reversed(tracks):
-            if track.requester == item.requester:
-                break
-            lastIndex -= 1
-        self._set.clear()
-        for track in tracks[lastIndex:]:
-            if track.requester in self._set:
-                break
-            lastIndex += 1
-            self._set.add(track.requester)
-
-        self.put_at_index(lastIndex, item)
-        return lastIndex
+        last_index = self._requester_index()
+        index = self._fair_index(item.requester, last_index)
+        self._queue.insert(index, item)
+
+        for requester, requester_index in last_index.items():
+            if requester_index >= index:
+                last_index[requester] = requester_index + 1
+        last_index[item.requester] = index
+        self._indexed_length += 1
+
+        return index - self._window_start
+
+    def put_many(self, items: List[Track]) -> int:
+        """Places a batch of tracks exactly as repeated put() calls would.
+
+        Consecutive tracks from the same requester (a playlist) are merged into the
+        upcoming tracks in a single pass over the queue.
+        """
+        space = self._size - len(self._queue)
+        if items and space <= 0:
+            raise QueueFull(self.get_msg("voicelinkQueueFull").format(self._size))
+
+        added = items[:space]
+        run_start = 0
+        while run_start < len(added):
+            requester = added[run_start].requester
+            run_end = run_start + 1
+            while run_end < len(added) and added[run_end].requester == requester:
+                run_end += 1
+
+            if run_end - run_start == 1:
+                self.put(added[run_start])
+            else:
+                self._merge_run(added[run_start:run_end])
+            run_start = run_end
+
+        return len(added)
+
+    def _merge_run(self, items: List[Track]) -> None:
+        # After each inserted track, the next one from the same requester lands after the
+        # following run of distinct requesters. None of the existing tracks past the
+        # first slot belong to this requester, so one walk over them places every item.
+        index = self._fair_index(items[0].requester, self._requester_index())
+        existing = self._queue[index:]
+        merged: List[Track] = []
+        position = 0
+        for item in items:
+            if merged:
+                seen = set()
+                while position < len(existing) and existing[position].requester not in seen:
+                    seen.add(existing[position].requester)
+                    merged.append(existing[position])
+                    position += 1
+            merged.append(item)
+        merged.extend(existing[position:])
+
+        self._queue[index:] = merged
+        self._tracks_changed()
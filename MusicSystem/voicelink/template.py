@@ -0,0 +1,269 @@
+"""MIT License
+
+Copyright (c) 2023 - present Vocard Development
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import re
+import operator
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+VARIABLE_PATTERN = re.compile(r"@@(.*?)@@")
+CONDITION_PATTERN = re.compile(r"\{\{(.*?)\}\}")
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        @@(?P<variable>.*?)@@ |
+        (?P<number>-?\d+(?:\.\d+)?) |
+        (?P<string>'[^']*'|"[^"]*") |
+        (?P<operator>==|!=|>=|<=|>|<|\(|\)) |
+        (?P<name>[A-Za-z_]\w*)
+    )\s*""", re.VERBOSE)
+
+COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "in": lambda left, right: left in right,
+    "not in": lambda left, right: left not in right,
+}
+CONSTANTS: Dict[str, Any] = {"true": True, "True": True, "false": False, "False": False, "None": None}
+
+Expression = Callable[[Dict[str, Any]], Any]
+
+class TemplateSyntaxError(ValueError):
+    """A {{condition}} expression that can't be parsed"""
+
+def _coerce(value: Any) -> Any:
+    """Strings of digits compare as numbers, the same way a quoted '5' did in the old eval templates"""
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    return value
+
+class _Parser:
+    """Recursive descent parser turning a condition expression into nested closures.
+
+    Grammar:
+        expression := and_expr ("or" and_expr)*
+        and_expr   := not_expr ("and" not_expr)*
+        not_expr   := "not" not_expr | comparison
+        comparison := operand (("==" | "!=" | ">" | "<" | ">=" | "<=" | "in" | "not" "in") operand)*
+        operand    := @@variable@@ | name | number | 'string' | true | false | None | "(" expression ")"
+    """
+
+    def __init__(self, source: str) -> None:
+        self.tokens: List[Tuple[str, str]] = []
+        self.names: Set[str] = set()
+        self.index: int = 0
+
+        position = 0
+        while position < len(source):
+            match = TOKEN_PATTERN.match(source, position)
+            if not match or match.end() == position:
+                raise TemplateSyntaxError(f"Unexpected character {source[position]!r} at {position}")
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+
+    def peek(self) -> Tuple[str, str]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else (None, None)
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def is_keyword(self, word: str, offset: int = 0) -> bool:
+        position = self.index + offset
+        return position < len(self.tokens) and self.tokens[position] == ("name", word)
+
+    def parse(self) -> Expression:
+        if not self.tokens:
+            raise TemplateSyntaxError("Empty expression")
+        expression = self.expression()
+        if self.index != len(self.tokens):
+            raise TemplateSyntaxError(f"Unexpected {self.peek()[1]!r}")
+        return expression
+
+    def expression(self) -> Expression:
+        terms = [self.and_expr()]
+        while self.is_keyword("or"):
+            self.take()
+            terms.append(self.and_expr())
+        return terms[0] if len(terms) == 1 else lambda v: any(term(v) for term in terms)
+
+    def and_expr(self) -> Expression:
+        terms = [self.not_expr()]
+        while self.is_keyword("and"):
+            self.take()
+            terms.append(self.not_expr())
+        return terms[0] if len(terms) == 1 else lambda v: all(term(v) for term in terms)
+
+    def not_expr(self) -> Expression:
+        if self.is_keyword("not"):
+            self.take()
+            inner = self.not_expr()
+            return lambda v: not inner(v)
+        return self.comparison()
+
+    def comparison(self) -> Expression:
+        left = self.operand()
+        chain: List[Tuple[Callable[[Any, Any], bool], Expression]] = []
+        while True:
+            kind, value = self.peek()
+            if kind == "operator" and value in COMPARISONS:
+                self.take()
+                chain.append((COMPARISONS[value], self.operand()))
+            elif self.is_keyword("in"):
+                self.take()
+                chain.append((COMPARISONS["in"], self.operand()))
+            elif self.is_keyword("not") and self.is_keyword("in", 1):
+                self.index += 2
+                chain.append((COMPARISONS["not in"], self.operand()))
+            else:
+                break
+
+        if not chain:
+            return left
+
+        def compare(v: Dict[str, Any]) -> bool:
+            # Chained like Python: a < b < c means a < b and b < c
+            current = left(v)
+            for op, operand in chain:
+                right = operand(v)
+                if not op(current, right):
+                    return False
+                current = right
+            return True
+        return compare
+
+    def operand(self) -> Expression:
+        kind, value = self.take()
+        if kind == "variable":
+            self.names.add(value)
+            return lambda v: _coerce(str(v.get(value, "")))
+        if kind == "number":
+            number = float(value) if "." in value else int(value)
+            return lambda v: number
+        if kind == "string":
+            text = _coerce(value[1:-1])
+            return lambda v: text
+        if kind == "name" and value in CONSTANTS:
+            constant = CONSTANTS[value]
+            return lambda v: constant
+        if kind == "name" and value not in ("and", "or", "not", "in"):
+            self.names.add(value)
+            def lookup(v: Dict[str, Any]) -> Any:
+                if value not in v:
+                    raise NameError(value)
+                return _coerce(v[value])
+            return lookup
+        if (kind, value) == ("operator", "("):
+            inner = self.expression()
+            if self.take() != ("operator", ")"):
+                raise TemplateSyntaxError("Missing ')'")
+            return inner
+        raise TemplateSyntaxError(f"Unexpected {value!r}" if value else "Unexpected end of expression")
+
+def compile_expression(source: str) -> Tuple[Expression, Set[str]]:
+    """Compiles a condition expression, returning it and the variable names it reads"""
+    parser = _Parser(source)
+    return parser.parse(), parser.names
+
+class Condition:
+    """A `{{expression ?? true // false}}` block of a template"""
+
+    __slots__ = ("expression", "true_value", "false_value", "names")
+
+    def __init__(self, source: str) -> None:
+        parts: List[str] = source.split("??")
+        self.expression: Expression = None
+        self.true_value: Template = None
+        self.false_value: Template = None
+        self.names: Set[str] = set()
+
+        # A block without "??" or with an invalid expression renders nothing
+        if len(parts) < 2:
+            return
+        try:
+            self.expression, self.names = compile_expression(parts[0].strip())
+        except TemplateSyntaxError:
+            return
+
+        if "//" in parts[1]:
+            true_value, false_value = [part.strip() for part in parts[1].split("//")][:2]
+        else:
+            true_value, false_value = parts[1].strip(), ""
+        self.true_value, self.false_value = Template(true_value), Template(false_value)
+        self.names |= self.true_value.names | self.false_value.names
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        if self.expression is None:
+            return ""
+
+        try:
+            result = self.expression(variables)
+        except Exception:
+            return ""
+
+        return (self.true_value if result else self.false_value).render(variables)
+
+class Template:
+    """A placeholder string parsed once into text, `@@variables@@` and `{{conditions}}`,
+    so rendering it again is a single join and only the variables it uses need evaluating."""
+
+    __slots__ = ("parts", "names")
+
+    def __init__(self, text: str) -> None:
+        self.parts: List[Any] = []  # Plain text, a Condition, or a one-item tuple holding a variable name
+        self.names: Set[str] = set()
+
+        for index, chunk in enumerate(CONDITION_PATTERN.split(text)):
+            if index % 2:
+                condition = Condition(chunk)
+                self.parts.append(condition)
+                self.names |= condition.names
+                continue
+
+            for var_index, part in enumerate(VARIABLE_PATTERN.split(chunk)):
+                if var_index % 2:
+                    self.parts.append((part,))
+                    self.names.add(part)
+                elif part:
+                    self.parts.append(part)
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        return "".join(
+            part if isinstance(part, str) else
+            str(variables.get(part[0], '')) if isinstance(part, tuple) else
+            part.render(variables)
+            for part in self.parts
+        )
+
+@lru_cache(maxsize=512)
+def compile_template(text: str) -> Template:
+    """Compiles a template once - guild controller templates are rendered on every track change"""
+    return Template(text)
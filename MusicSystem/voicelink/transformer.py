@@ -26,8 +26,17 @@ import struct
 
 from io import BytesIO
 from base64 import b64decode, b64encode
+from functools import lru_cache
 from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Final
 
+# Encoded tracks decoded recently - playlists, history and restored sessions repeat a lot
+DECODE_CACHE_SIZE = 4096
+
+_BYTE: Final = struct.Struct('B')
+_UNSIGNED_SHORT: Final = struct.Struct('>H')
+_INT: Final = struct.Struct('>i')
+_LONG: Final = struct.Struct('>Q')
+
 V2_KEYSET = {'title', 'author', 'length', 'identifier', 'isStream', 'uri', 'sourceName', 'position'}
 V3_KEYSET = V2_KEYSET | {'artworkUrl', 'isrc'}
 
@@ -40,18 +49,19 @@ class _MissingObj:
 MISSING: Any = _MissingObj()
 
 class DataReader:
-    __slots__ = ('_buf', '_mark')
+    __slots__ = ('_buf', '_pos', '_mark')
 
     def __init__(self, base64_str: str):
-        self._buf: Final[BytesIO] = BytesIO(b64decode(base64_str))
+        self._buf: Final[memoryview] = memoryview(b64decode(base64_str))
+        self._pos: int = 0
         self._mark: Optional[int] = None
 
     @property
     def remaining(self) -> int:
-        return self._buf.getbuffer().nbytes - self._buf.tell()
+        return len(self._buf) - self._pos
 
     def mark(self) -> None:
-        self._mark = self._buf.tell()
+        self._mark = self._pos
 
     def rewind(self) -> None:
         if self._mark is None or not isinstance(self._mark, int):
@@ -60,30 +70,33 @@ class DataReader:
         if self._mark < 0:
             raise IOError('Cannot rewind buffer to a negative position!')
 
-        self._buf.seek(self._mark)
+        self._pos = self._mark
         self._mark = None
 
     def _read(self, count: int) -> bytes:
-        return self._buf.read(count)
+        start = self._pos
+        self._pos = min(start + count, len(self._buf))
+        return self._buf[start:self._pos].tobytes()
+
+    def _unpack(self, fmt: struct.Struct):
+        result, = fmt.unpack_from(self._buf, self._pos)
+        self._pos += fmt.size
+        return result
 
     def read_byte(self) -> bytes:
         return self._read(1)
 
     def read_boolean(self) -> bool:
-        result, = struct.unpack('B', self.read_byte())
-        return result != 0
+        return self._unpack(_BYTE) != 0
 
     def read_unsigned_short(self) -> int:
-        result, = struct.unpack('>H', self._read(2))
-        return result
+        return self._unpack(_UNSIGNED_SHORT)
 
     def read_int(self) -> int:
-        result, = struct.unpack('>i', self._read(4))
-        return result
+        return self._unpack(_INT)
 
     def read_long(self) -> int:
-        result, = struct.unpack('>Q', self._read(8))
-        return result
+        return self._unpack(_LONG)
 
     def read_nullable_utf(self, utfm: bool = False) -> Optional[str]:
         exists = self.read_boolean()
@@ -100,7 +113,12 @@ class DataReader:
     def read_utfm(self) -> str:
         text_length = self.read_unsigned_short()
         utf_string = self._read(text_length)
-        return read_utfm(text_length, utf_string)
+        try:
+            # Modified UTF-8 only differs from UTF-8 for NUL and characters outside the BMP,
+            # and both of those are invalid in strict UTF-8, so this never decodes them wrongly
+            return utf_string.decode('utf-8')
+        except UnicodeDecodeError:
+            return read_utfm(text_length, utf_string)
 
 class DataWriter:
     __slots__ = ('_buf',)
@@ -261,15 +279,19 @@ def decode(
     source_decoders: Mapping[str, Callable[[DataReader], Mapping[str, Any]]] = MISSING
 ) -> dict:
 
-    decoders = DEFAULT_DECODER_MAPPING.copy()
-
     if source_decoders is not MISSING:
+        decoders = DEFAULT_DECODER_MAPPING.copy()
         decoders.update(source_decoders)
+        return _decode(track, decoders)
 
+    # Copy so callers can't modify the cached result
+    return dict(_decode_cached(track))
+
+def _decode(track: str, decoders: Mapping[str, Callable[[DataReader], Mapping[str, Any]]]) -> dict:
     reader = DataReader(track)
 
     flags = (reader.read_int() & 0xC0000000) >> 30
-    version, = struct.unpack('B', reader.read_byte()) if flags & 1 != 0 else (1,)
+    version = reader._unpack(_BYTE) if flags & 1 != 0 else 1
 
     title, author, length, identifier, is_stream, uri = _read_track_common(reader)
     extra_fields = {}
@@ -299,6 +321,10 @@ def decode(
         **extra_fields
     }
 
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_cached(track: str) -> dict:
+    return _decode(track, DEFAULT_DECODER_MAPPING)
+
 def encode(
     track: Dict[str, Any],
     source_encoders: Mapping[str, Callable[[DataWriter, Dict[str, Any]], None]] = MISSING
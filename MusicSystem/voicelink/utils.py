@@ -24,13 +24,16 @@ SOFTWARE.
 import random
 import time
 import socket
+import asyncio
+from collections import OrderedDict
 from timeit import default_timer as timer
 from itertools import zip_longest
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Any, Hashable, Callable, Awaitable
 
 __all__ = [
     "ExponentialBackoff",
+    "TTLCache",
     "NodeStats",
     "NodeInfoVersion",
     "NodeInfo",
@@ -86,6 +89,91 @@ class ExponentialBackoff:
         return self._randfunc(0, self._base * 2 ** self._exp)
 
 
+class TTLCache:
+    """An LRU cache whose entries expire after ``ttl`` seconds.
+       Concurrent lookups for a key that is already being fetched wait for that
+       fetch instead of starting another one.
+    """
+
+    def __init__(self, max_size: int = 500, ttl: float = 600) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+
+        self._entries: Dict[Hashable, tuple] = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: value is not None
+    ) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            if should_cache(value):
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._pending.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served without a new request, including coalesced ones."""
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
 class NodeStats:
     """The base class for the node stats object.
        Gives critical information on the node, which is updated every minute.
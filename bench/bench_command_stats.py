@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the dashboard's command statistics (command_stats.py).
+Seeds a command_logs table, then times the three GROUP BY scans web_ui used to run
+on every refresh against the rollup queries, and the cost the rollups add per write.
+
+Usage:
+    python bench/bench_command_stats.py [--rows N] [--refreshes N] [--writes N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+COMMANDS = [f"command{number}" for number in range(60)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(COMMANDS))]  # A few commands get most of the use
+
+def timed(label: str, ops: int, func):
+    started_at = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started_at
+    print(f"   {label:<28} {elapsed * 1000:9.2f}ms total | {ops / elapsed:12,.1f} ops/sec")
+    return elapsed
+
+def legacy_refresh(conn, now: datetime):
+    """get_database_stats as it was before the rollups"""
+    conn.execute("SELECT guild_id, guild_name, COUNT(*) FROM command_logs GROUP BY guild_id, guild_name").fetchall()
+    conn.execute("SELECT command_name, COUNT(*) FROM command_logs WHERE timestamp > ? GROUP BY command_name",
+                 ((now - timedelta(days=1)).isoformat(),)).fetchall()
+    conn.execute("SELECT command_name, COUNT(*) FROM command_logs WHERE timestamp > ? GROUP BY command_name",
+                 ((now - timedelta(days=30)).isoformat(),)).fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard command statistics")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in command_logs")
+    parser.add_argument("--guilds", type=int, default=50, help="Distinct guilds")
+    parser.add_argument("--refreshes", type=int, default=10, help="Dashboard refreshes to time")
+    parser.add_argument("--writes", type=int, default=2_000, help="Logged commands to time")
+    args = parser.parse_args()
+
+    import command_stats
+
+    rng = random.Random(1234)
+    now = datetime.utcnow()
+    path = os.path.join(tempfile.mkdtemp(), "commands_global.db")
+
+    with command_stats.connect(path) as conn:
+        # Seed the raw table directly (90 days of history), then build the rollups the way an upgrade does
+        rows = []
+        for _ in range(args.rows):
+            guild = rng.randrange(args.guilds)
+            moment = now - timedelta(seconds=rng.randint(0, 90 * 86400))
+            rows.append((rng.choices(COMMANDS, WEIGHTS)[0], "1", "2", str(guild), f"Guild {guild}", moment.isoformat(), True))
+        with conn:
+            conn.executemany("""
+                INSERT INTO command_logs (command_name, user_id, channel_id, guild_id, guild_name, timestamp, success)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            command_stats.backfill_rollups(conn)
+        rollups = conn.execute("SELECT COUNT(*) FROM command_stats_hourly").fetchone()[0]
+
+        print(f"📊 Dashboard refresh with {args.rows:,} command logs ({rollups:,} hourly rollups)")
+        legacy_time = timed("GROUP BY command_logs", args.refreshes,
+                            lambda: [legacy_refresh(conn, now) for _ in range(args.refreshes)])
+        rollup_time = timed("rollups", args.refreshes,
+                            lambda: [command_stats.dashboard_stats(conn, now) for _ in range(args.refreshes)])
+        print(f"   speedup                      {legacy_time / rollup_time:9.2f}x")
+
+        print(f"📊 Logging {args.writes:,} commands")
+
+        def raw_writes():
+            for number in range(args.writes):
+                with conn:
+                    conn.execute("""
+                        INSERT INTO command_logs (command_name, user_id, channel_id, guild_id, guild_name, timestamp, success)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (rng.choice(COMMANDS), "1", "2", str(number % args.guilds), None, datetime.utcnow().isoformat(), True))
+        timed("raw insert", args.writes, raw_writes)
+
+        def rollup_writes():
+            for number in range(args.writes):
+                command_stats.record_command(conn, rng.choice(COMMANDS), "1", "2", str(number % args.guilds))
+        timed("insert + rollups", args.writes, rollup_writes)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the Lavalink track decoder (MusicSystem/voicelink/transformer.py).
+Encodes 10,000 synthetic tracks and times decoding them cold and from the decode cache.
+
+Usage:
+    python bench/bench_decode.py [--tracks N] [--repeat N]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "MusicSystem"))
+
+TITLE_WORDS = ["Never", "Gonna", "Give", "You", "Up", "Café", "Señorita", "東京", "Ночь", "☃", "Remix", "(Live)"]
+SOURCES = ["youtube", "soundcloud", "spotify"]
+
+def make_track(number: int, rng: random.Random) -> dict:
+    source = SOURCES[number % len(SOURCES)]
+    track = {
+        "title": " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(2, 8))),
+        "author": f"Artist {number % 500}",
+        "length": rng.randint(30_000, 600_000),
+        "identifier": f"id{number:08d}",
+        "isStream": False,
+        "uri": f"https://example.com/{source}/{number}",
+        "sourceName": source,
+        "artworkUrl": f"https://example.com/art/{number}.jpg",
+        "isrc": None,
+        "position": 0
+    }
+    if source == "spotify":
+        track.update({
+            "albumName": "Album", "albumUrl": None, "artistUrl": None,
+            "artistArtworkUrl": None, "previewUrl": None, "isPreview": False
+        })
+    return track
+
+def timed(label: str, ops: int, func):
+    started_at = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started_at
+    print(f"   {label:<28} {elapsed * 1000:9.2f}ms total | {ops / elapsed:12,.0f} ops/sec")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark voicelink.transformer.decode")
+    parser.add_argument("--tracks", type=int, default=10_000, help="Distinct encoded tracks")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the tracks")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed")
+    args = parser.parse_args()
+
+    from voicelink import transformer
+
+    rng = random.Random(args.seed)
+    encoded = [transformer.encode(make_track(i, rng)) for i in range(args.tracks)]
+    # Playlists and history repeat tracks, so the warm pass reuses a cache-sized working set
+    working_set = encoded[:transformer.DECODE_CACHE_SIZE]
+
+    print(f"📊 voicelink.transformer.decode with {args.tracks:,} tracks")
+
+    def uncached():
+        for _ in range(args.repeat):
+            for track in encoded:
+                transformer._decode(track, transformer.DEFAULT_DECODER_MAPPING)
+    timed(f"decode (no cache) x{args.tracks * args.repeat:,}", args.tracks * args.repeat, uncached)
+
+    def cold():
+        transformer._decode_cached.cache_clear()
+        for track in encoded:
+            transformer.decode(track)
+    timed(f"decode cold x{args.tracks:,}", args.tracks, cold)
+
+    def warm():
+        for _ in range(args.repeat):
+            for track in working_set:
+                transformer.decode(track)
+    transformer._decode_cached.cache_clear()
+    for track in working_set:
+        transformer.decode(track)
+    timed(f"decode cached x{len(working_set) * args.repeat:,}", len(working_set) * args.repeat, warm)
+
+    info = transformer._decode_cached.cache_info()
+    print(f"   cache: {info.currsize:,}/{info.maxsize:,} entries, {info.hits:,} hits, {info.misses:,} misses")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Event-loop lag benchmark for the logging pipeline (setup_logging in main.py).
+Logs bursts of debug records from a coroutine, the way handle_message_xp and the
+voice tracker do, while a sampler measures how late the loop wakes up. Compares
+RotatingFileHandlers on the loop with the QueueHandler/QueueListener pipeline.
+
+Usage:
+    python bench/bench_logging.py [--records N] [--burst N] [--fsync]
+"""
+
+import os
+import sys
+import time
+import queue
+import asyncio
+import logging
+import argparse
+import tempfile
+import statistics
+import logging.handlers
+
+FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+LEGACY_FORMAT = FORMAT + '\nContext: %(pathname)s:%(lineno)d'
+SAMPLE_INTERVAL = 0.001
+
+class FsyncRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Flushes to disk on every record - a stand-in for slow disks and network filesystems"""
+
+    def emit(self, record):
+        super().emit(record)
+        if self.stream:
+            os.fsync(self.stream.fileno())
+
+def file_handlers(directory: str, fmt: str, fsync: bool):
+    handler_cls = FsyncRotatingFileHandler if fsync else logging.handlers.RotatingFileHandler
+    debug_handler = handler_cls(os.path.join(directory, 'debug.log'), encoding='utf-8', maxBytes=32 * 1024 * 1024, backupCount=5)
+    debug_handler.setLevel(logging.DEBUG)
+    debug_handler.setFormatter(logging.Formatter(fmt))
+    error_handler = handler_cls(os.path.join(directory, 'error.log'), encoding='utf-8', maxBytes=32 * 1024 * 1024, backupCount=5)
+    error_handler.setLevel(logging.ERROR)
+    error_handler.setFormatter(logging.Formatter(fmt))
+    return [debug_handler, error_handler]
+
+async def sample_lag(samples: list, stop: asyncio.Event):
+    """Records how much later than requested each short sleep wakes up"""
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(SAMPLE_INTERVAL)
+        samples.append(time.perf_counter() - started_at - SAMPLE_INTERVAL)
+
+async def produce(logger: logging.Logger, records: int, burst: int):
+    """Logs like a busy guild: a burst of debug lines per message, then back to the loop"""
+    for number in range(records // burst):
+        for step in range(burst):
+            logger.debug("💬 MESSAGE XP: Processing message from %s (%s) step %s", f"user{number}", number, step)
+        await asyncio.sleep(0)
+
+async def run(logger: logging.Logger, records: int, burst: int):
+    samples, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_lag(samples, stop))
+    await asyncio.sleep(SAMPLE_INTERVAL * 5)
+    started_at = time.perf_counter()
+    await produce(logger, records, burst)
+    elapsed = time.perf_counter() - started_at
+    stop.set()
+    await sampler
+    return elapsed, samples
+
+def report(label: str, records: int, elapsed: float, samples: list):
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99)] if samples else 0.0
+    print(f"   {label:<28} {elapsed * 1000:9.2f}ms total | {records / elapsed:12,.0f} records/sec")
+    print(f"   {'':<28} loop lag p50 {statistics.median(samples) * 1000:7.2f}ms | p99 {p99 * 1000:7.2f}ms | max {samples[-1] * 1000:7.2f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event-loop lag caused by logging")
+    parser.add_argument("--records", type=int, default=50_000, help="Debug records to log")
+    parser.add_argument("--burst", type=int, default=25, help="Records logged between yields to the loop")
+    parser.add_argument("--fsync", action="store_true", help="fsync after every record to simulate a slow disk")
+    args = parser.parse_args()
+
+    print(f"📊 Logging {args.records:,} debug records in bursts of {args.burst}{' (fsync)' if args.fsync else ''}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Before: handlers attached to the logger write on the event loop
+        logger = logging.getLogger("bench.sync")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        handlers = file_handlers(directory, LEGACY_FORMAT, args.fsync)
+        for handler in handlers:
+            logger.addHandler(handler)
+        elapsed, samples = asyncio.run(run(logger, args.records, args.burst))
+        report("sync file handlers", args.records, elapsed, samples)
+        for handler in handlers:
+            logger.removeHandler(handler)
+            handler.close()
+
+        # After: the loop only enqueues, a listener thread formats and writes
+        logger = logging.getLogger("bench.queue")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, *file_handlers(directory, FORMAT, args.fsync), respect_handler_level=True
+        )
+        listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        elapsed, samples = asyncio.run(run(logger, args.records, args.burst))
+        report("QueueHandler + listener", args.records, elapsed, samples)
+        drain_started = time.perf_counter()
+        listener.stop()
+        print(f"   listener drained in          {(time.perf_counter() - drain_started) * 1000:9.2f}ms (off the loop)")
+        for handler in listener.handlers:
+            handler.close()
+
+        # Disabled debug: what LOG_LEVELS=lvl=INFO costs the hot paths
+        logger.setLevel(logging.INFO)
+        elapsed, samples = asyncio.run(run(logger, args.records, args.burst))
+        report("debug disabled", args.records, elapsed, samples)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
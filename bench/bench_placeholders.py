@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the music controller templates (MusicSystem/voicelink/template.py).
+Renders the default controller templates with the compiled engine and with the
+original regex + eval implementation of Placeholders.replace.
+
+Usage:
+    python bench/bench_placeholders.py [--renders N]
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "MusicSystem"))
+
+TEMPLATES = [
+    "**Now Playing: ```[@@track_name@@]```\nLink: [Click Me](@@track_url@@) | Requester: @@track_requester_mention@@ | DJ: @@dj@@**",
+    "Queue Length: @@queue_length@@ | Duration: @@track_duration@@ | Volume: @@volume@@% {{loop_mode != 'Off' ?? | Repeat: @@loop_mode@@}}",
+    "@@track_thumbnail@@",
+    "Music Controller | @@channel_name@@",
+    "@@bot_icon@@",
+    "@@track_color@@",
+    "{{@@queue_length@@ > 10 ?? Busy queue // Queue: @@queue_length@@}} {{loop_mode == 'Track' ?? 🔂}}",
+]
+
+VARIABLES = {
+    "track_name": "Never Gonna Give You Up",
+    "track_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "track_requester_mention": "<@1234>",
+    "track_duration": "3:33",
+    "track_thumbnail": "https://img.youtube.com/vi/dQw4w9WgXcQ/maxresdefault.jpg",
+    "track_color": "16711680",
+    "channel_name": "music",
+    "bot_icon": "https://i.imgur.com/dIFBwU7.png",
+    "queue_length": "12",
+    "volume": "100",
+    "loop_mode": "Track",
+    "dj": "<@&5678>",
+}
+
+def legacy_replace(text: str, variables: dict) -> str:
+    """Placeholders.replace as it was before templates were compiled"""
+    if not text or text.isspace(): return
+    pattern = r"\{\{(.*?)\}\}"
+    matches = re.findall(pattern, text)
+
+    for match in matches:
+        parts = match.split("??")
+        expression = parts[0].strip()
+        true_value, false_value = "", ""
+
+        if "//" in parts[1]:
+            true_value, false_value = [part.strip() for part in parts[1].split("//")]
+        else:
+            true_value = parts[1].strip()
+
+        try:
+            expression = re.sub(r'@@(.*?)@@', lambda x: "'" + variables.get(x.group(1), '') + "'", expression)
+            expression = re.sub(r"'(\d+)'", lambda x: str(int(x.group(1))), expression)
+            expression = re.sub(r"'(\d+)'\s*([><=!]+)\s*(\d+)", lambda x: f"{int(x.group(1))} {x.group(2)} {int(x.group(3))}", expression)
+            expression = expression.replace('false', 'False').replace('true', 'True')
+            result = eval(expression, {"__builtins__": None}, variables)
+            replacement = true_value if result else false_value
+            text = text.replace("{{" + match + "}}", replacement)
+        except:
+            text = text.replace("{{" + match + "}}", "")
+
+    text = re.sub(r'@@(.*?)@@', lambda x: str(variables.get(x.group(1), '')), text)
+    return text
+
+def timed(label: str, ops: int, func):
+    started_at = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started_at
+    print(f"   {label:<28} {elapsed * 1000:9.2f}ms total | {ops / elapsed:12,.0f} renders/sec")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the controller template engine")
+    parser.add_argument("--renders", type=int, default=5_000, help="Times to render the controller templates")
+    args = parser.parse_args()
+
+    from voicelink.template import compile_template
+
+    for template in TEMPLATES:
+        legacy, compiled = legacy_replace(template, dict(VARIABLES)), compile_template(template).render(VARIABLES)
+        if legacy != compiled:
+            print(f"❌ Output differs for {template!r}: {legacy!r} != {compiled!r}")
+            return 1
+
+    ops = args.renders * len(TEMPLATES)
+    print(f"📊 Controller templates x{args.renders:,} ({len(TEMPLATES)} templates each)")
+
+    def legacy():
+        for _ in range(args.renders):
+            for template in TEMPLATES:
+                legacy_replace(template, VARIABLES)
+    legacy_time = timed("regex + eval", ops, legacy)
+
+    def compiled():
+        for _ in range(args.renders):
+            for template in TEMPLATES:
+                compile_template(template).render(VARIABLES)
+    compiled_time = timed("compiled", ops, compiled)
+
+    print(f"   speedup                      {legacy_time / compiled_time:9.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for building voicelink Playlist/Track objects (MusicSystem/voicelink/objects.py).
+Times loading a 1,000-track playlist as Lavalink returns it and measures the memory it holds.
+
+Usage:
+    python bench/bench_playlist.py [--tracks N] [--repeat N]
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "MusicSystem"))
+
+def make_response(count: int) -> dict:
+    """A loadType=playlist response body, as returned by /v4/loadtracks"""
+    tracks = []
+    for number in range(count):
+        identifier = f"vid{number:08d}"
+        tracks.append({
+            "encoded": f"QAAA{number:012d}",
+            "info": {
+                "identifier": identifier,
+                "isSeekable": True,
+                "author": f"Artist {number % 300}",
+                "length": 180_000 + number,
+                "isStream": False,
+                "position": 0,
+                "title": f"Track {number}",
+                "uri": f"https://www.youtube.com/watch?v={identifier}",
+                "artworkUrl": None,
+                "isrc": None,
+                "sourceName": "youtube"
+            }
+        })
+    return {"info": {"name": "Benchmark playlist", "selectedTrack": -1}, "tracks": tracks}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark voicelink.Playlist construction")
+    parser.add_argument("--tracks", type=int, default=1_000, help="Tracks in the playlist")
+    parser.add_argument("--repeat", type=int, default=20, help="Playlists to build")
+    args = parser.parse_args()
+
+    from voicelink.objects import Playlist
+
+    response = make_response(args.tracks)
+
+    def build():
+        return Playlist(playlist_info=response["info"], tracks=response["tracks"], requester=None)
+
+    build()  # Warm up imports and source settings
+
+    started_at = time.perf_counter()
+    for _ in range(args.repeat):
+        playlist = build()
+    elapsed = time.perf_counter() - started_at
+
+    tracemalloc.start()
+    playlist = build()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"📊 voicelink.Playlist with {args.tracks:,} tracks")
+    print(f"   build x{args.repeat:<22} {elapsed * 1000:9.2f}ms total | {elapsed / args.repeat * 1000:8.2f}ms per playlist")
+    print(f"   memory held by Track objects {held / 1024:9.1f}KiB | {held / len(playlist.tracks):8.0f} bytes per track")
+
+    # What actually gets displayed: the now-playing track and one page of the queue
+    started_at = time.perf_counter()
+    for track in playlist.tracks[:10]:
+        track.source, track.emoji, track.thumbnail
+    print(f"   first page of derived fields {(time.perf_counter() - started_at) * 1000:9.2f}ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
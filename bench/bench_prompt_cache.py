@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the Mistral prompt-prefix cache in puddleai.
+Measures prompt-eval time on CPU with and without restoring the cached system prompt state.
+
+Usage:
+    python bench/bench_prompt_cache.py [path/to/model.gguf] [--runs N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+SAMPLE_MESSAGES = [
+    ("hi puddles", "Alice"),
+    ("what can you do?", "Bob"),
+    ("tell me a joke about ducks", "Charlie"),
+    ("how do I make a task?", "Dana"),
+    ("what's the capital of France?", "Eve"),
+]
+
+def find_model() -> str:
+    """Find the same model file the bot would use"""
+    models = sorted((ROOT_DIR / "models").glob("*mistral*7b*.gguf"))
+    return str(models[0]) if models else None
+
+def time_prompt_eval(model, prompt: str) -> float:
+    """Time a single-token completion, which is dominated by prompt evaluation"""
+    started_at = time.perf_counter()
+    model(prompt, max_tokens=1, temperature=0.0)
+    return time.perf_counter() - started_at
+
+def summarize(label: str, samples: list):
+    print(f"   {label:<14} mean {statistics.mean(samples) * 1000:8.1f}ms | "
+          f"median {statistics.median(samples) * 1000:8.1f}ms | "
+          f"min {min(samples) * 1000:8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the puddleai prompt-prefix cache")
+    parser.add_argument("model_path", nargs="?", default=None, help="GGUF model file (defaults to models/*mistral*7b*.gguf)")
+    parser.add_argument("--runs", type=int, default=3, help="Passes over the sample messages")
+    parser.add_argument("--threads", type=int, default=8, help="CPU threads (the bot uses 8)")
+    args = parser.parse_args()
+
+    model_path = args.model_path or find_model()
+    if not model_path or not os.path.exists(model_path):
+        print("❌ No Mistral 7B model found - pass a GGUF path or put one in models/")
+        return 1
+
+    try:
+        from llama_cpp import Llama
+    except ImportError:
+        print("❌ llama-cpp-python is not installed")
+        return 1
+
+    import puddleai
+
+    print(f"🧠 Loading {os.path.basename(model_path)} on CPU ({args.threads} threads)...")
+    model = Llama(model_path=model_path, n_ctx=4096, n_threads=args.threads, n_gpu_layers=0, verbose=False)
+
+    if not puddleai.prime_prefix_cache(model):
+        print("❌ This llama-cpp-python build can't save model state")
+        return 1
+    print(f"✅ Cached prefix: {puddleai.prefix_state.n_tokens} tokens")
+
+    uncached, cached = [], []
+    for run in range(args.runs):
+        print(f"🔄 Pass {run + 1}/{args.runs}")
+        for message, user_name in SAMPLE_MESSAGES:
+            prompt = puddleai.create_mistral_prompt(message, user_name)
+
+            # Without the cache: start from an empty context every time
+            model.reset()
+            uncached.append(time_prompt_eval(model, prompt))
+
+            # With the cache: restore the evaluated prefix first
+            puddleai.restore_prefix_cache(model)
+            cached.append(time_prompt_eval(model, prompt))
+
+    print()
+    print("📊 Prompt-eval time per request")
+    summarize("without cache", uncached)
+    summarize("with cache", cached)
+    print(f"   speedup        {statistics.mean(uncached) / statistics.mean(cached):8.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the music queue (MusicSystem/voicelink/queue.py).
+Times put, move, remove and shuffle on a queue of 10,000 tracks.
+
+Usage:
+    python bench/bench_queue.py [--tracks N] [--ops N]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "MusicSystem"))
+
+class FakeRequester:
+    """Stands in for a discord.Member - the queue only compares requesters"""
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+class FakeTrack:
+    """Just the attributes the queue touches, so no Lavalink or URL parsing is needed"""
+
+    __slots__ = ("title", "uri", "requester")
+
+    def __init__(self, number: int, requester: FakeRequester):
+        self.title = f"Track {number}"
+        self.uri = f"https://example.com/track/{number}"
+        self.requester = requester
+
+def make_tracks(count: int, requesters: int = 8) -> list:
+    members = [FakeRequester(i) for i in range(requesters)]
+    return [FakeTrack(i, members[i % requesters]) for i in range(count)]
+
+def make_queue(queue_class, size: int):
+    return queue_class(size, True, lambda key: key)
+
+def timed(label: str, ops: int, func):
+    started_at = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started_at
+    print(f"   {label:<28} {elapsed * 1000:9.2f}ms total | {ops / elapsed:12,.0f} ops/sec")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark voicelink.Queue operations")
+    parser.add_argument("--tracks", type=int, default=10_000, help="Tracks in the queue")
+    parser.add_argument("--ops", type=int, default=1_000, help="Random move/remove operations to time")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed")
+    args = parser.parse_args()
+
+    from voicelink.queue import Queue, FairQueue
+
+    random.seed(args.seed)
+    tracks = make_tracks(args.tracks)
+    size = args.tracks * 2
+
+    print(f"📊 voicelink.Queue with {args.tracks:,} tracks")
+
+    queue = make_queue(Queue, size)
+    timed(f"put x{args.tracks:,}", args.tracks, lambda: [queue.put(track) for track in tracks])
+
+    def move():
+        for _ in range(args.ops):
+            queue.move(random.randint(1, queue.count), random.randint(1, queue.count))
+    timed(f"move x{args.ops:,}", args.ops, move)
+
+    def count():
+        for _ in range(args.tracks):
+            queue.count
+    timed(f"count x{args.tracks:,}", args.tracks, count)
+
+    def shuffle():
+        replacement = queue.tracks()
+        random.shuffle(replacement)
+        queue.replace("queue", replacement)
+    timed("shuffle", 1, shuffle)
+
+    def remove():
+        for _ in range(args.ops):
+            queue.remove(random.randint(1, queue.count))
+    timed(f"remove x{args.ops:,}", args.ops, remove)
+
+    def remove_range():
+        members = {track.requester for track in tracks}
+        for member in members:
+            queue.remove(1, queue.count, member)
+    timed("remove all by requester", len({t.requester for t in tracks}), remove_range)
+
+    # A queue of mixed requests, then one member queues a big playlist
+    mixed, playlist_size = tracks[:args.tracks // 5], args.tracks - args.tracks // 5
+    playlist_owner = FakeRequester(len(tracks))
+    playlist = [FakeTrack(args.tracks + i, playlist_owner) for i in range(playlist_size)]
+
+    def fair_queue(bulk: bool):
+        fair = make_queue(FairQueue, size)
+        fair.put(mixed[0])
+        fair.get()  # Something is playing, as it would be in a real player
+        for track in mixed[1:]:
+            fair.put(track)
+        if bulk:
+            fair.put_many(playlist)
+        else:
+            for track in playlist:
+                fair.put(track)
+    timed(f"FairQueue put x{args.tracks:,}", args.tracks, lambda: fair_queue(False))
+    timed(f"FairQueue put_many x{args.tracks:,}", args.tracks, lambda: fair_queue(True))
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+A local Lavalink v4 stand-in for benchmarks.
+
+Serves just enough of the REST and WebSocket API for voicelink.Node to connect and
+load tracks: GET /v4/info, GET /v4/loadtracks, the /v4/websocket "ready" handshake
+and PATCH/DELETE on session players. Responses can be delayed by `latency` seconds
+to model a remote node.
+
+Usage:
+    python bench/fake_lavalink.py [--port N] [--latency SECONDS]
+"""
+
+import sys
+import json
+import zlib
+import asyncio
+import argparse
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+from aiohttp import web, WSMsgType
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "MusicSystem"))
+
+from voicelink import transformer
+
+PASSWORD = "youshallnotpass"
+SESSION_ID = "benchsession"
+
+def make_info(number: int, query: str, source: str = "youtube") -> dict:
+    identifier = f"bench{zlib.crc32(f'{query}:{number}'.encode()):010d}"
+    return {
+        "identifier": identifier,
+        "isSeekable": True,
+        "author": f"Artist {number % 50}",
+        "length": 180_000 + number * 1000,
+        "isStream": False,
+        "position": 0,
+        "title": f"{query[:40]} - result {number}",
+        "uri": f"https://www.youtube.com/watch?v={identifier}",
+        "artworkUrl": f"https://i.ytimg.com/vi/{identifier}/hqdefault.jpg",
+        "isrc": None,
+        "sourceName": source,
+    }
+
+def make_track(number: int, query: str) -> dict:
+    info = make_info(number, query)
+    return {"encoded": transformer.encode(info), "info": info, "pluginInfo": {}, "userData": {}}
+
+class FakeLavalink:
+    """Run with `await FakeLavalink().start()`; `port` is filled in once it is listening"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 search_results: int = 5, playlist_size: int = 100, password: str = PASSWORD):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.search_results = search_results
+        self.playlist_size = playlist_size
+        self.password = password
+        self.requests = 0
+        self._runner = None
+        self._sockets = set()
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/v4/info", self._info)
+        app.router.add_get("/v4/loadtracks", self._loadtracks)
+        app.router.add_get("/v4/websocket", self._websocket)
+        app.router.add_route("PATCH", "/v4/sessions/{session}/players/{guild}", self._player)
+        app.router.add_route("DELETE", "/v4/sessions/{session}/players/{guild}", self._player)
+        return app
+
+    async def start(self) -> "FakeLavalink":
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def stop(self):
+        for ws in list(self._sockets):
+            await ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _respond(self, request: web.Request, body) -> web.Response:
+        if request.headers.get("Authorization") != self.password:
+            return web.json_response({"status": 401, "error": "Unauthorized"}, status=401)
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.json_response(body)
+
+    async def _info(self, request: web.Request) -> web.Response:
+        return await self._respond(request, {
+            "version": {"semver": "4.0.8", "major": 4, "minor": 0, "patch": 8, "preRelease": None, "build": None},
+            "buildTime": 0, "git": {}, "jvm": "17", "lavaplayer": "2.2.1",
+            "sourceManagers": ["youtube"], "filters": [], "plugins": [],
+        })
+
+    async def _loadtracks(self, request: web.Request) -> web.Response:
+        identifier = request.query.get("identifier", "")
+        if identifier.startswith("ytsearch:") or identifier.startswith("scsearch:"):
+            query = identifier.split(":", 1)[1]
+            body = {"loadType": "search", "data": [make_track(number, query) for number in range(self.search_results)]}
+        elif "list=" in identifier:
+            playlist = parse_qs(urlparse(identifier).query).get("list", ["playlist"])[0]
+            body = {"loadType": "playlist", "data": {
+                "info": {"name": f"Playlist {playlist}", "selectedTrack": -1},
+                "pluginInfo": {},
+                "tracks": [make_track(number, playlist) for number in range(self.playlist_size)],
+            }}
+        elif identifier:
+            body = {"loadType": "track", "data": make_track(0, identifier)}
+        else:
+            body = {"loadType": "empty", "data": {}}
+        return await self._respond(request, body)
+
+    async def _player(self, request: web.Request) -> web.Response:
+        if request.method == "DELETE":
+            return await self._respond(request, None)
+        return await self._respond(request, {"guildId": request.match_info["guild"], "track": None, "volume": 100,
+                                             "paused": False, "state": {}, "voice": {}, "filters": {}})
+
+    async def _websocket(self, request: web.Request) -> web.StreamResponse:
+        if request.headers.get("Authorization") != self.password:
+            return web.Response(status=401)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        try:
+            await ws.send_str(json.dumps({"op": "ready", "resumed": False, "sessionId": SESSION_ID}))
+            async for msg in ws:
+                if msg.type in (WSMsgType.CLOSE, WSMsgType.ERROR):
+                    break
+        finally:
+            self._sockets.discard(ws)
+        return ws
+
+async def serve(port: int, latency: float):
+    server = await FakeLavalink(port=port, latency=latency).start()
+    print(f"🎵 Fake Lavalink listening on http://{server.host}:{server.port} (password: {server.password})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Lavalink v4 stand-in")
+    parser.add_argument("--port", type=int, default=2333, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to delay every REST response")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.port, args.latency))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
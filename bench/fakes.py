@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Stand-ins for the discord.py objects the bot's handlers touch.
+
+Only the attributes and coroutines the handlers actually use are implemented.
+Everything that would be a Discord REST call (send, defer, followup) is a stub
+that counts the call and optionally sleeps for `rest_latency` seconds, so the
+benchmarks measure the bot's own work and not the network.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+class RestStats:
+    """Counts the Discord REST calls the handlers would have made"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def call(self):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str = "role"):
+        self.id = role_id
+        self.name = name
+        self.mention = f"<@&{role_id}>"
+
+class FakeUser:
+    """A discord.User / discord.Member"""
+
+    def __init__(self, user_id: int, name: str = None, guild: "FakeGuild" = None, bot: bool = False,
+                 roles: List[FakeRole] = None):
+        self.id = user_id
+        self.name = name or f"user{user_id}"
+        self.display_name = self.name.title()
+        self.global_name = self.display_name
+        self.mention = f"<@{user_id}>"
+        self.bot = bot
+        self.guild = guild
+        self.roles = roles or []
+        self.display_avatar = FakeAsset(f"https://cdn.discordapp.com/avatars/{user_id}/avatar.png")
+        self.avatar = self.display_avatar
+        self.voice: Optional["FakeVoiceState"] = None
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FakeUser) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __str__(self) -> str:
+        return self.name
+
+class FakeMessage:
+    def __init__(self, message_id: int, content: str, author: FakeUser, channel: "FakeChannel", attachments: list = None):
+        self.id = message_id
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.attachments = attachments or []
+        self.embeds = []
+        self.mentions = []
+        self.reference = None
+        self.created_at = datetime.now(timezone.utc)
+
+    async def edit(self, **kwargs):
+        await self.channel.rest.call()
+        return self
+
+class FakeChannel:
+    """A text channel; send() is a stubbed REST call"""
+
+    def __init__(self, channel_id: int, guild: "FakeGuild", rest: RestStats, name: str = None):
+        self.id = channel_id
+        self.name = name or f"channel{channel_id}"
+        self.guild = guild
+        self.rest = rest
+        self.mention = f"<#{channel_id}>"
+        self._next_message_id = channel_id * 1000
+
+    async def send(self, content: str = None, **kwargs) -> FakeMessage:
+        await self.rest.call()
+        self._next_message_id += 1
+        return FakeMessage(self._next_message_id, content or "", self.guild.me, self)
+
+class FakeVoiceChannel:
+    """A voice channel; `members` is kept up to date by FakeGuild.move_member"""
+
+    def __init__(self, channel_id: int, guild: "FakeGuild", name: str = None):
+        self.id = channel_id
+        self.name = name or f"voice{channel_id}"
+        self.guild = guild
+        self.mention = f"<#{channel_id}>"
+        self.members: List[FakeUser] = []
+
+class FakeVoiceState:
+    def __init__(self, channel: Optional[FakeVoiceChannel] = None, deaf: bool = False):
+        self.channel = channel
+        self.deaf = deaf
+        self.self_deaf = deaf
+        self.mute = False
+        self.self_mute = False
+
+class FakeGuild:
+    def __init__(self, guild_id: int, rest: RestStats, name: str = None, members: int = 0, channels: int = 1,
+                 voice_channels: int = 0):
+        self.id = guild_id
+        self.name = name or f"Guild {guild_id}"
+        self.owner_id = guild_id * 10
+        self.me = FakeUser(1, "puddles", self, bot=True)
+        self.icon = None
+        self._members: Dict[int, FakeUser] = {}
+        self._channels: Dict[int, FakeChannel] = {}
+        for number in range(members):
+            self.add_member(FakeUser(guild_id * 100_000 + number, guild=self))
+        for number in range(channels):
+            channel = FakeChannel(guild_id * 100 + number, self, rest)
+            self._channels[channel.id] = channel
+        self.voice_channels: List[FakeVoiceChannel] = [
+            FakeVoiceChannel(guild_id * 100 + 50 + number, self) for number in range(voice_channels)
+        ]
+
+    def add_member(self, member: FakeUser) -> FakeUser:
+        member.guild = self
+        self._members[member.id] = member
+        return member
+
+    @property
+    def members(self) -> List[FakeUser]:
+        return list(self._members.values())
+
+    @property
+    def member_count(self) -> int:
+        return len(self._members)
+
+    @property
+    def text_channels(self) -> List[FakeChannel]:
+        return list(self._channels.values())
+
+    def get_member(self, user_id: int) -> Optional[FakeUser]:
+        return self._members.get(user_id)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self._channels.get(channel_id)
+
+    def move_member(self, member: FakeUser, channel: Optional[FakeVoiceChannel]) -> Tuple[FakeVoiceState, FakeVoiceState]:
+        """Update the voice state cache the way the gateway would; returns (before, after) for on_voice_state_update"""
+        before = member.voice or FakeVoiceState()
+        if before.channel is not None and member in before.channel.members:
+            before.channel.members.remove(member)
+        after = FakeVoiceState(channel)
+        if channel is not None:
+            channel.members.append(member)
+        member.voice = after if channel is not None else None
+        return before, after
+
+class FakeResponse:
+    """interaction.response"""
+
+    def __init__(self, rest: RestStats):
+        self.rest = rest
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **kwargs):
+        self._done = True
+        await self.rest.call()
+
+    async def send_message(self, content: str = None, **kwargs):
+        self._done = True
+        await self.rest.call()
+
+class FakeFollowup:
+    """interaction.followup"""
+
+    def __init__(self, rest: RestStats):
+        self.rest = rest
+
+    async def send(self, content: str = None, **kwargs):
+        await self.rest.call()
+
+class FakeCommand:
+    def __init__(self, name: str):
+        self.name = name
+        self.qualified_name = name
+
+class FakeInteraction:
+    def __init__(self, user: FakeUser, channel: FakeChannel, command_name: str = None):
+        self.user = user
+        self.guild = channel.guild
+        self.guild_id = channel.guild.id if channel.guild else None
+        self.channel = channel
+        self.channel_id = channel.id
+        self.command = FakeCommand(command_name) if command_name else None
+        self.extras = {}
+        self.locale = "en-US"
+        self.response = FakeResponse(channel.rest)
+        self.followup = FakeFollowup(channel.rest)
+
+class FakeClient:
+    """The parts of discord.Client the handlers reach for through their module-level _client"""
+
+    def __init__(self, guilds: List[FakeGuild], rest: RestStats):
+        self.rest = rest
+        self.user = FakeUser(1, "puddles", bot=True)
+        self._guilds = {guild.id: guild for guild in guilds}
+        self.loop = asyncio.get_event_loop()
+        self.latency = 0.05
+
+    @property
+    def guilds(self) -> List[FakeGuild]:
+        return list(self._guilds.values())
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return self._guilds.get(guild_id)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        for guild in self._guilds.values():
+            channel = guild.get_channel(channel_id)
+            if channel:
+                return channel
+        return None
+
+    async def fetch_channel(self, channel_id: int) -> FakeChannel:
+        await self.rest.call()
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            raise LookupError(channel_id)
+        return channel
+
+    def is_ready(self) -> bool:
+        return True
+
+    async def wait_until_ready(self):
+        return
+
+    def add_listener(self, func, name: str = None):
+        pass
+
+    def dispatch(self, event: str, *args, **kwargs):
+        pass
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Synthetic load generator for PuddlesBot.
+
+Replays multi-guild message, voice and slash-command traffic through the bot's own
+event handlers (PuddlesBot.on_message, on_voice_state_update and the command tree's
+interaction_check plus the leveling commands) in-process, using the fake discord.py
+objects in bench/fakes.py. No Discord connection is needed; every REST call the
+handlers would make is a counted stub.
+
+Traffic comes from a parametric model (Poisson arrivals, guild activity skewed so
+a few servers are much busier than the rest) or from a recorded trace. Events are
+dispatched open-loop at their scheduled time whether or not earlier ones finished,
+so a slow handler shows up as a growing in-flight count and loop lag instead of
+quietly lowering the offered load.
+
+Every --report-interval seconds a row is printed with throughput per event type,
+events in flight, event-loop lag, the number of per-server SQLite files and RSS.
+
+Trace format (JSONL, one event per line, sorted by "t" in seconds):
+    {"t": 0.12, "type": "message", "guild": 3, "channel": 0, "user": 17, "content": "quack"}
+    {"t": 0.50, "type": "voice", "guild": 3, "user": 17, "channel": 1}     (channel null = leave)
+    {"t": 0.93, "type": "command", "guild": 0, "channel": 0, "user": 4, "command": "rank"}
+
+Usage:
+    python bench/loadgen.py [--guilds 50] [--messages-per-sec 100] [--voice-users 200] [--duration 60]
+    python bench/loadgen.py --record trace.jsonl --duration 300
+    python bench/loadgen.py --replay trace.jsonl [--speed 2]
+"""
+
+import io
+import os
+import sys
+import csv
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+import itertools
+import contextlib
+from pathlib import Path
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import psutil
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "MusicSystem"))
+sys.path.insert(0, str(ROOT_DIR))
+
+from fakes import RestStats, FakeGuild, FakeMessage, FakeInteraction, FakeClient
+
+EVENT_TYPES = ("message", "voice", "command")
+COMMANDS = ("rank", "top")
+MESSAGES = [
+    "quack", "hello everyone", "anyone up for a game tonight?", "lol", "that's a great idea",
+    "has anyone seen the new update", "brb", "gg", "can someone help me with this?",
+    "I think the pond is frozen again 🦆", "what's everyone listening to", "nice",
+]
+
+# ============= TRAFFIC MODELS =============
+
+def guild_weights(guilds: int, skew: float) -> List[float]:
+    """Cumulative Zipf weights: guild 0 is the busiest"""
+    return list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(guilds)))
+
+def arrivals(rng: random.Random, rate: float, duration: float):
+    """Poisson arrival times in [0, duration)"""
+    if rate <= 0:
+        return
+    t = rng.expovariate(rate)
+    while t < duration:
+        yield t
+        t += rng.expovariate(rate)
+
+def parametric_events(args, rng: random.Random) -> List[dict]:
+    weights = guild_weights(args.guilds, args.skew)
+    guild_ids = range(args.guilds)
+    events = []
+
+    for t in arrivals(rng, args.messages_per_sec, args.duration):
+        guild = rng.choices(guild_ids, cum_weights=weights)[0]
+        events.append({"t": round(t, 4), "type": "message", "guild": guild, "channel": rng.randrange(args.channels),
+                       "user": rng.randrange(args.members), "content": rng.choice(MESSAGES)})
+
+    for t in arrivals(rng, args.commands_per_sec, args.duration):
+        guild = rng.choices(guild_ids, cum_weights=weights)[0]
+        events.append({"t": round(t, 4), "type": "command", "guild": guild, "channel": rng.randrange(args.channels),
+                       "user": rng.randrange(args.members), "command": rng.choice(COMMANDS)})
+
+    # Voice user k lives in guild k % guilds; each one joins, hops or leaves every hop_interval seconds on average
+    voice_users = min(args.voice_users, args.guilds * args.members)
+    current: Dict[int, Optional[int]] = {}
+    if voice_users and args.voice_channels and args.hop_interval > 0:
+        for t in arrivals(rng, voice_users / args.hop_interval, args.duration):
+            user = rng.randrange(voice_users)
+            channel = current.get(user)
+            if channel is None:
+                channel = rng.randrange(args.voice_channels)
+            elif rng.random() < 0.3 or args.voice_channels == 1:
+                channel = None
+            else:
+                channel = rng.choice([number for number in range(args.voice_channels) if number != channel])
+            current[user] = channel
+            events.append({"t": round(t, 4), "type": "voice", "guild": user % args.guilds,
+                           "user": user // args.guilds, "channel": channel})
+
+    events.sort(key=lambda event: event["t"])
+    return events
+
+def write_trace(path: str, events: List[dict]):
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+def read_trace(path: str) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    events.sort(key=lambda event: event["t"])
+    return events
+
+def trace_shape(events: List[dict]) -> dict:
+    """How many guilds, members and channels a recorded trace needs"""
+    shape = {"guilds": 1, "members": 1, "channels": 1, "voice_channels": 1}
+    for event in events:
+        shape["guilds"] = max(shape["guilds"], event["guild"] + 1)
+        shape["members"] = max(shape["members"], event["user"] + 1)
+        if event.get("channel") is not None:
+            key = "voice_channels" if event["type"] == "voice" else "channels"
+            shape[key] = max(shape[key], event["channel"] + 1)
+    return shape
+
+# ============= THE BOT UNDER LOAD =============
+
+class Stats:
+    """Counters for one run; `window` is reset after every report row"""
+
+    def __init__(self):
+        self.done = Counter()
+        self.window = Counter()
+        self.errors = Counter()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.behind = 0.0  # How far the dispatcher fell behind the schedule, worst case
+
+def member_of(guild: FakeGuild, number: int):
+    # FakeGuild numbers its members from guild_id * 100_000
+    return guild.get_member(guild.id * 100_000 + number)
+
+class LoadTarget:
+    """Fake guilds wired into the bot's modules, and one coroutine per event type"""
+
+    def __init__(self, main, guilds: List[FakeGuild], rest: RestStats):
+        import discord
+        from discord import app_commands
+        import lvl
+        import intmsg
+        import openchat
+
+        self.main = main
+        self.guilds = guilds
+        self.client = FakeClient(guilds, rest)
+        for module in (lvl, intmsg, openchat):
+            module._client = self.client
+        self.voice_tracker = lvl.voice_tracker
+
+        tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+        lvl.setup_level_commands(tree)
+        self.commands = {name: tree.get_command(name).callback for name in COMMANDS}
+
+    async def message(self, event: dict):
+        guild = self.guilds[event["guild"]]
+        channel = guild.text_channels[event["channel"]]
+        author = member_of(guild, event["user"])
+        await self.main.PuddlesBot.on_message(self.client, FakeMessage(0, event["content"], author, channel))
+
+    async def voice(self, event: dict):
+        guild = self.guilds[event["guild"]]
+        member = member_of(guild, event["user"])
+        channel = guild.voice_channels[event["channel"]] if event["channel"] is not None else None
+        if (member.voice.channel if member.voice else None) is channel:
+            return
+        before, after = guild.move_member(member, channel)
+        await self.main.PuddlesBot.on_voice_state_update(self.client, member, before, after)
+
+    async def command(self, event: dict):
+        guild = self.guilds[event["guild"]]
+        interaction = FakeInteraction(member_of(guild, event["user"]), guild.text_channels[event["channel"]], event["command"])
+        if not await self.main.CommandCheck.interaction_check(None, interaction):
+            return
+        if event["command"] == "top":
+            await self.commands["top"](interaction, "total", 1)
+        else:
+            await self.commands["rank"](interaction)
+
+def import_main():
+    if not (ROOT_DIR / ".env").exists():
+        # main.py writes a template .env and exits when there is none
+        print("❌ The load generator drives main.py's handlers and needs a configured .env")
+        return None
+    root_level = logging.getLogger().level
+    startup_output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(startup_output):
+            import main
+    except SystemExit:
+        # main.py explains on stdout why it refused to start (e.g. DISCORD_CLIENT_ID missing) and exits
+        print(startup_output.getvalue(), end="")
+        print("❌ main.py exited during import, see its output above")
+        return None
+    # main sends INFO to the console; keep the report readable
+    logging.getLogger().setLevel(max(root_level, logging.WARNING))
+    return main
+
+# ============= RUNNER =============
+
+def count_databases(data_dir: str) -> int:
+    return sum(1 for name in os.listdir(data_dir) if name.endswith(".db"))
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+async def dispatch(handler, event: dict, stats: Stats):
+    stats.in_flight += 1
+    stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+    started_at = time.perf_counter()
+    try:
+        await handler(event)
+    except Exception:
+        stats.errors[event["type"]] += 1
+    finally:
+        stats.in_flight -= 1
+        stats.latencies[event["type"]].append(time.perf_counter() - started_at)
+        stats.done[event["type"]] += 1
+        stats.window[event["type"]] += 1
+
+async def reporter(args, stats: Stats, monitor, data_dir: str, out, rows: list):
+    process = psutil.Process()
+    started_at = time.perf_counter()
+    last_report = started_at
+    print(f"   {'time':>6} | {'msg/s':>8} {'voice/s':>8} {'cmd/s':>7} | {'in flight':>9} | "
+          f"{'lag p99':>8} {'lag max':>8} | {'dbs':>5} | {'rss':>8}", file=out)
+    while True:
+        await asyncio.sleep(args.report_interval)
+        now = time.perf_counter()
+        elapsed, window = now - started_at, now - last_report
+        last_report = now
+        lags = sorted(monitor.lags)
+        monitor.lags.clear()
+        row = {
+            "elapsed_s": round(elapsed, 1),
+            **{f"{kind}_per_sec": round(stats.window[kind] / window, 1) for kind in EVENT_TYPES},
+            "in_flight": stats.in_flight,
+            "lag_p99_ms": round(percentile(lags, 0.99) * 1000, 1),
+            "lag_max_ms": round((lags[-1] if lags else 0.0) * 1000, 1),
+            "db_files": count_databases(data_dir),
+            "rss_mb": round(process.memory_info().rss / 1024 / 1024, 1),
+        }
+        stats.window.clear()
+        rows.append(row)
+        print(f"   {row['elapsed_s']:>5.0f}s | {row['message_per_sec']:>8,.1f} {row['voice_per_sec']:>8,.1f} "
+              f"{row['command_per_sec']:>7,.1f} | {row['in_flight']:>9,} | {row['lag_p99_ms']:>6.1f}ms "
+              f"{row['lag_max_ms']:>6.1f}ms | {row['db_files']:>5,} | {row['rss_mb']:>6.1f}MB", file=out)
+
+async def replay(events: List[dict], target: LoadTarget, stats: Stats, speed: float):
+    handlers = {"message": target.message, "voice": target.voice, "command": target.command}
+    tasks = set()
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    for event in events:
+        due = started_at + event["t"] / speed
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            stats.behind = max(stats.behind, -delay)
+        task = asyncio.create_task(dispatch(handlers[event["type"]], event, stats))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.wait(tasks)
+
+async def run(args, events: List[dict], shape: dict) -> int:
+    main = import_main()
+    if main is None:
+        return 1
+    import database
+    import openchat
+    import loop_monitor
+
+    out = sys.stdout
+    rest = RestStats(latency=args.rest_latency)
+    guilds = [FakeGuild(10_000 + number, rest, members=shape["members"], channels=shape["channels"],
+                        voice_channels=shape["voice_channels"]) for number in range(shape["guilds"])]
+
+    with contextlib.ExitStack() as stack:
+        if args.data_dir:
+            os.makedirs(args.data_dir, exist_ok=True)
+            data_dir = args.data_dir
+        else:
+            data_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        database.DATA_DIR = data_dir
+
+        target = LoadTarget(main, guilds, rest)
+        previous_openchat = dict(openchat.active_channels)
+        openchat.active_channels.clear()
+        openchat.active_channels.update({str(guild.id): str(guild.text_channels[0].id)
+                                         for guild in guilds[:args.openchat_guilds]})
+
+        counts = Counter(event["type"] for event in events)
+        span = events[-1]["t"] / args.speed if events else 0.0
+        print(f"📊 {len(events):,} events over {span:.0f}s across {len(guilds)} guilds "
+              f"({counts['message']:,} messages, {counts['voice']:,} voice updates, {counts['command']:,} commands)", file=out)
+
+        stats = Stats()
+        monitor = loop_monitor.LoopMonitor(threshold=args.lag_threshold / 1000, report_path=None)
+        monitor.start()
+        rows = []
+        report_task = asyncio.create_task(reporter(args, stats, monitor, data_dir, out, rows))
+        started_at = time.perf_counter()
+        try:
+            # Handlers print debug output; keep it out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    await replay(events, target, stats, args.speed)
+                finally:
+                    target.voice_tracker.stop_periodic_updates()
+        finally:
+            elapsed = time.perf_counter() - started_at
+            report_task.cancel()
+            monitor.stop()
+            openchat.active_channels.clear()
+            openchat.active_channels.update(previous_openchat)
+
+        print(f"\n📈 Totals after {elapsed:.1f}s (dispatcher fell behind by up to {stats.behind * 1000:.0f}ms, "
+              f"peak {stats.peak_in_flight:,} in flight, {rest.calls:,} stubbed REST calls)", file=out)
+        for kind in EVENT_TYPES:
+            latencies = sorted(stats.latencies[kind])
+            if not latencies:
+                continue
+            print(f"   {kind:<8} {stats.done[kind]:>8,} done | {stats.done[kind] / elapsed:>9,.1f}/sec "
+                  f"| p50 {percentile(latencies, 0.50) * 1000:8.2f}ms | p99 {percentile(latencies, 0.99) * 1000:8.2f}ms "
+                  f"| {stats.errors[kind]:,} errors", file=out)
+        print(f"   {count_databases(data_dir):,} database files, {monitor.stalls:,} loop stalls over "
+              f"{args.lag_threshold:.0f}ms", file=out)
+        for offender in monitor.top_offenders(3):
+            print(f"   ⚠️ {offender.count}× blocked {offender.worst * 1000:.0f}ms at {offender.hotspot}", file=out)
+
+    if args.csv and rows:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"💾 Wrote {len(rows)} report rows to {args.csv}", file=out)
+    return 1 if sum(stats.errors.values()) else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the bot's event handlers with synthetic multi-guild traffic")
+    parser.add_argument("--guilds", type=int, default=50, help="Number of servers")
+    parser.add_argument("--members", type=int, default=50, help="Members per server")
+    parser.add_argument("--channels", type=int, default=3, help="Text channels per server")
+    parser.add_argument("--voice-channels", type=int, default=2, help="Voice channels per server")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of server activity (0 = uniform)")
+    parser.add_argument("--messages-per-sec", type=float, default=100.0, help="Messages per second, all servers together")
+    parser.add_argument("--commands-per-sec", type=float, default=5.0, help="Slash commands per second")
+    parser.add_argument("--voice-users", type=int, default=200, help="Members who join, hop between and leave voice channels")
+    parser.add_argument("--hop-interval", type=float, default=30.0, help="Mean seconds between one voice user's state changes")
+    parser.add_argument("--openchat-guilds", type=int, default=0, help="Servers whose first channel is linked through OpenChat")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of traffic to generate")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed")
+    parser.add_argument("--record", help="Write the generated traffic to this JSONL trace")
+    parser.add_argument("--replay", help="Play back a JSONL trace instead of generating traffic")
+    parser.add_argument("--speed", type=float, default=1.0, help="Play the traffic this many times faster")
+    parser.add_argument("--rest-latency", type=float, default=0.0, help="Seconds every stubbed Discord REST call takes")
+    parser.add_argument("--lag-threshold", type=float, default=100.0, help="Loop lag (ms) counted as a stall")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="Seconds between report rows")
+    parser.add_argument("--data-dir", help="Keep the per-server databases here instead of a temporary directory")
+    parser.add_argument("--csv", help="Also write the report rows to this CSV file")
+    args = parser.parse_args()
+
+    if args.replay:
+        events = read_trace(args.replay)
+        shape = trace_shape(events)
+        shape["guilds"] = max(shape["guilds"], args.openchat_guilds)
+    else:
+        events = parametric_events(args, random.Random(args.seed))
+        shape = {"guilds": args.guilds, "members": args.members, "channels": args.channels,
+                 "voice_channels": args.voice_channels}
+    if args.record:
+        write_trace(args.record, events)
+        print(f"💾 Recorded {len(events):,} events to {args.record}")
+
+    for option in ("csv", "data_dir"):
+        if getattr(args, option):
+            setattr(args, option, os.path.abspath(getattr(args, option)))
+    os.chdir(ROOT_DIR)
+    return asyncio.run(run(args, events, shape))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the bot's hot paths.
+
+Drives the real handlers (leveling, OpenChat, the command check, translations,
+the music queue, the track codec, controller templates, /top and Node.get_tracks)
+with the fake discord.py objects in bench/fakes.py and a local Lavalink stand-in
+(bench/fake_lavalink.py). Every operation is timed on its own, so each case
+reports ops/sec plus p50 and p99 latency.
+
+Results can be saved as a JSON baseline and later runs compared against it; a
+case whose throughput or p50 is worse than the baseline by more than --tolerance
+is reported as a regression and the suite exits with status 1.
+
+Usage:
+    python bench/suite.py [--only NAME ...] [--scale X] [--save] [--baseline PATH] [--tolerance 0.25]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import inspect
+import logging
+import argparse
+import platform
+import tempfile
+import contextlib
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "MusicSystem"))
+sys.path.insert(0, str(ROOT_DIR))
+
+from fakes import RestStats, FakeGuild, FakeUser, FakeMessage, FakeInteraction, FakeClient
+
+BASELINE_DIR = ROOT_DIR / "bench" / "baselines"
+WARMUP = 20  # Untimed operations before each case
+
+class SkipCase(Exception):
+    """Raised by a case that can't run in this checkout"""
+
+class BenchEnv:
+    """Shared state for one suite run: a scratch data directory and cleanup callbacks"""
+
+    def __init__(self, data_dir: str, rng: random.Random):
+        self.data_dir = data_dir
+        self.rng = rng
+        self.rest = RestStats()
+        self._cleanups: List[Callable] = []
+
+    def on_cleanup(self, func: Callable):
+        self._cleanups.append(func)
+
+    async def cleanup(self):
+        while self._cleanups:
+            result = self._cleanups.pop()()
+            if inspect.isawaitable(result):
+                await result
+
+class Case:
+    def __init__(self, name: str, iterations: int, setup: Callable):
+        self.name = name
+        self.iterations = iterations
+        self.setup = setup
+
+CASES: Dict[str, Case] = {}
+
+def case(name: str, iterations: int):
+    """Register a case; the decorated coroutine sets up and returns the operation to time"""
+    def decorator(setup):
+        CASES[name] = Case(name, iterations, setup)
+        return setup
+    return decorator
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+async def run_case(bench_case: Case, env: BenchEnv, iterations: int) -> dict:
+    operation = await bench_case.setup(env)
+    is_async = inspect.iscoroutinefunction(operation)
+    for _ in range(min(WARMUP, iterations)):
+        if is_async:
+            await operation()
+        else:
+            operation()
+
+    durations = []
+    perf_counter = time.perf_counter
+    started_at = perf_counter()
+    for _ in range(iterations):
+        op_started_at = perf_counter()
+        if is_async:
+            await operation()
+        else:
+            operation()
+        durations.append(perf_counter() - op_started_at)
+    elapsed = perf_counter() - started_at
+
+    durations.sort()
+    return {
+        "iterations": iterations,
+        "total_ms": elapsed * 1000,
+        "ops_per_sec": iterations / elapsed,
+        "p50_us": percentile(durations, 0.50) * 1_000_000,
+        "p99_us": percentile(durations, 0.99) * 1_000_000,
+    }
+
+# ============= DATABASE-BACKED HANDLERS =============
+
+def use_scratch_database(env: BenchEnv):
+    """Point the per-server SQLite files at the scratch directory"""
+    import database
+    database.DATA_DIR = env.data_dir
+    return database
+
+@case("lvl.handle_message_xp", iterations=500)
+async def bench_message_xp(env: BenchEnv):
+    database = use_scratch_database(env)
+    import lvl
+
+    guild = FakeGuild(9001, env.rest, members=200)
+    lvl._client = FakeClient([guild], env.rest)
+    # No cooldown, so every message takes the full path: settings, user row, commit
+    session = database.get_session(str(guild.id))
+    session.add(database.LevelSettings(guild_id=str(guild.id), text_cooldown=0))
+    session.commit()
+    session.close()
+
+    channel = guild.text_channels[0]
+    members = guild.members
+
+    async def operation():
+        await lvl.handle_message_xp(FakeMessage(1, "quack quack", env.rng.choice(members), channel))
+    return operation
+
+@case("openchat.handle_openchat_message", iterations=500)
+async def bench_openchat(env: BenchEnv):
+    use_scratch_database(env)
+    import openchat
+
+    guilds = [FakeGuild(9100 + number, env.rest, members=5) for number in range(10)]
+    openchat._client = FakeClient(guilds, env.rest)
+    previous = dict(openchat.active_channels)
+    openchat.active_channels.clear()
+    openchat.active_channels.update({str(guild.id): str(guild.text_channels[0].id) for guild in guilds})
+    env.on_cleanup(lambda: (openchat.active_channels.clear(), openchat.active_channels.update(previous)))
+
+    source = guilds[0]
+    channel = source.text_channels[0]
+    members = source.members
+
+    async def operation():
+        await openchat.handle_openchat_message(FakeMessage(1, "hello from the other pond", env.rng.choice(members), channel))
+    return operation
+
+@case("lvl /top", iterations=200)
+async def bench_top(env: BenchEnv):
+    database = use_scratch_database(env)
+    import discord
+    from discord import app_commands
+    import lvl
+
+    guild = FakeGuild(9200, env.rest, members=1000)
+    session = database.get_session(str(guild.id))
+    for member in guild.members:
+        text_xp, voice_xp = env.rng.randint(0, 50_000), env.rng.randint(0, 50_000)
+        session.add(database.UserLevel(
+            user_id=str(member.id), guild_id=str(guild.id), text_xp=text_xp, voice_xp=voice_xp,
+            text_level=lvl.calculate_level(text_xp), voice_level=lvl.calculate_level(voice_xp),
+            total_messages=0, total_voice_time=0
+        ))
+    session.commit()
+    session.close()
+
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+    lvl.setup_level_commands(tree)
+    top = tree.get_command("top").callback
+    channel = guild.text_channels[0]
+    members = guild.members
+
+    async def operation():
+        interaction = FakeInteraction(env.rng.choice(members), channel, "top")
+        await top(interaction, "total", env.rng.randint(1, 5))
+    return operation
+
+@case("CommandCheck.interaction_check", iterations=1000)
+async def bench_interaction_check(env: BenchEnv):
+    if not (ROOT_DIR / ".env").exists():
+        # main.py writes a template .env and exits when there is none
+        raise SkipCase("needs a configured .env, main.py exits without one")
+    use_scratch_database(env)
+    root_level = logging.getLogger().level
+    with contextlib.redirect_stderr(io.StringIO()):
+        import main
+    # main configures logging for the bot; keep the rest of the run comparable
+    logging.getLogger().setLevel(root_level)
+
+    check = main.CommandCheck.interaction_check
+    guild = FakeGuild(9300, env.rest, members=50)
+    channel = guild.text_channels[0]
+    members = guild.members
+    commands = ["roll", "8ball", "play", "rank", "remind", "coinflip"]
+
+    async def operation():
+        await check(None, FakeInteraction(env.rng.choice(members), channel, env.rng.choice(commands)))
+    return operation
+
+# ============= IN-MEMORY HOT PATHS =============
+
+@case("language.get_text", iterations=5000)
+async def bench_get_text(env: BenchEnv):
+    import language
+
+    keys = sorted(language.load_language_file("en"))
+    if not keys:
+        raise SkipCase("no language files in langs/")
+
+    def operation():
+        language.get_text(env.rng.choice(keys), "en", user="Puddles", index=1)
+    return operation
+
+def require_music_settings():
+    # Importing voicelink loads MusicSystem/function.py, which refuses to start without settings.json
+    if not (ROOT_DIR / "MusicSystem" / "settings.json").exists():
+        raise SkipCase("needs MusicSystem/settings.json (run the bot or setup_music.py once)")
+
+def make_tracks(count: int, requesters: int = 8) -> list:
+    require_music_settings()
+    from voicelink import Track
+    from fake_lavalink import make_info
+
+    members = [FakeUser(number) for number in range(requesters)]
+    return [Track(track_id=None, info=make_info(number, "queue"), requester=members[number % requesters])
+            for number in range(count)]
+
+@case("Queue.put+get", iterations=20000)
+async def bench_queue(env: BenchEnv):
+    from voicelink.queue import Queue
+
+    tracks = make_tracks(1000)
+    queue = Queue(10 ** 9, True, lambda key: key)
+    for track in tracks:
+        queue.put(track)
+
+    def operation():
+        queue.put(env.rng.choice(tracks))
+        queue.get()
+    return operation
+
+@case("FairQueue.put", iterations=5000)
+async def bench_fair_queue(env: BenchEnv):
+    from voicelink.queue import FairQueue
+
+    tracks = make_tracks(1000, requesters=25)
+    queue = FairQueue(10 ** 9, True, lambda key: key)
+    queue.put(tracks[0])
+    queue.get()  # Something is playing, as it would be in a real player
+
+    def operation():
+        queue.put(env.rng.choice(tracks))
+    return operation
+
+@case("voicelink.encode", iterations=5000)
+async def bench_encode(env: BenchEnv):
+    require_music_settings()
+    from voicelink import transformer
+    from fake_lavalink import make_info
+
+    infos = [make_info(number, "encode") for number in range(1000)]
+
+    def operation():
+        transformer.encode(env.rng.choice(infos))
+    return operation
+
+@case("voicelink.decode", iterations=5000)
+async def bench_decode(env: BenchEnv):
+    require_music_settings()
+    from voicelink import transformer
+    from fake_lavalink import make_info
+
+    # More distinct tracks than the decode cache holds, like a busy node
+    encoded = [transformer.encode(make_info(number, "decode")) for number in range(transformer.DECODE_CACHE_SIZE * 2)]
+
+    def operation():
+        transformer.decode(env.rng.choice(encoded))
+    return operation
+
+@case("Placeholders controller embed", iterations=2000)
+async def bench_placeholders(env: BenchEnv):
+    require_music_settings()
+    import function as func
+    from addons import Settings
+    from voicelink.placeholders import Placeholders, build_embed
+
+    with open(ROOT_DIR / "MusicSystem" / "settings Example.json", encoding="utf-8") as f:
+        example = json.load(f)
+    example["client_id"] = "1"  # The example file has a placeholder here
+    previous = func.settings
+    func.settings = Settings(example)
+    env.on_cleanup(lambda: setattr(func, "settings", previous))
+
+    guild = FakeGuild(9400, env.rest, members=3)
+    track = make_tracks(1)[0]
+    track.requester = guild.members[0]
+
+    class FakePlayer:
+        """The player attributes the controller templates read"""
+        channel = guild.text_channels[0]
+        current = track
+        volume = 100
+        settings = {}
+        dj = guild.members[1]
+
+        class queue:
+            count = 12
+            repeat = "Off"
+
+        @staticmethod
+        def get_msg(key: str) -> str:
+            return key
+
+    bot = FakeClient([guild], env.rest)
+    raw = example["default_controller"]["embeds"]["active"]
+
+    def operation():
+        build_embed(raw, Placeholders(bot, FakePlayer))
+    return operation
+
+# ============= LAVALINK =============
+
+async def connect_node(env: BenchEnv):
+    require_music_settings()
+    import aiohttp
+    from voicelink.pool import Node
+    from fake_lavalink import FakeLavalink
+
+    server = await FakeLavalink().start()
+    env.on_cleanup(server.stop)
+
+    class FakePool:
+        _nodes = {}  # Empty, so the node doesn't try to reconnect when the server stops
+
+    session = aiohttp.ClientSession()
+    env.on_cleanup(session.close)
+    node = Node(
+        pool=FakePool, bot=FakeClient([], env.rest), host=server.host, port=server.port,
+        password=server.password, identifier="BENCH", session=session,
+        logger=logging.getLogger("bench.voicelink")
+    )
+    await node.connect()
+
+    async def disconnect():
+        node._task.cancel()
+        await node._websocket.close()
+    env.on_cleanup(disconnect)
+    return node
+
+@case("Node.get_tracks (REST)", iterations=300)
+async def bench_get_tracks(env: BenchEnv):
+    node = await connect_node(env)
+    requester = FakeUser(42)
+    counter = iter(range(10 ** 9))
+
+    async def operation():
+        # A new search every time, so each call goes to the node
+        await node.get_tracks(f"duck song {next(counter)}", requester=requester)
+    return operation
+
+@case("Node.get_tracks (cached)", iterations=2000)
+async def bench_get_tracks_cached(env: BenchEnv):
+    node = await connect_node(env)
+    requester = FakeUser(42)
+    queries = [f"duck song {number}" for number in range(20)]
+    for query in queries:
+        await node.get_tracks(query, requester=requester)
+
+    async def operation():
+        await node.get_tracks(env.rng.choice(queries), requester=requester)
+    return operation
+
+# ============= BASELINES =============
+
+def default_baseline_path() -> Path:
+    return BASELINE_DIR / f"{platform.node() or 'local'}.json"
+
+def load_baseline(path: Path) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_baseline(path: Path, results: Dict[str, dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    existing = (load_baseline(path) or {}).get("results", {})
+    existing.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.node(),
+            "results": existing,
+        }, f, indent=2, sort_keys=True)
+
+def compare(result: dict, baseline: dict, tolerance: float) -> str:
+    """Describe the change against the baseline; regressions start with ❌"""
+    throughput = result["ops_per_sec"] / baseline["ops_per_sec"] - 1
+    p50 = result["p50_us"] / baseline["p50_us"] - 1
+    summary = f"ops/sec {throughput:+.0%}, p50 {p50:+.0%}"
+    if throughput < -tolerance / (1 + tolerance) or p50 > tolerance:
+        return f"❌ {summary}"
+    return f"   {summary}"
+
+def print_result(name: str, result: dict):
+    print(f"   {name:<34} {result['total_ms']:9.2f}ms total | {result['ops_per_sec']:12,.1f} ops/sec "
+          f"| p50 {result['p50_us']:9.1f}µs | p99 {result['p99_us']:9.1f}µs")
+
+async def run_suite(args) -> int:
+    names = [name for name in CASES if not args.only or any(part.lower() in name.lower() for part in args.only)]
+    if not names:
+        print(f"❌ No cases match {args.only}")
+        return 1
+
+    baseline_path = Path(args.baseline) if args.baseline else default_baseline_path()
+    baseline = (load_baseline(baseline_path) or {}).get("results", {})
+    print(f"📊 {len(names)} benchmark cases" + (f", comparing with {baseline_path}" if baseline else ""))
+
+    results, regressions = {}, []
+    with tempfile.TemporaryDirectory() as data_dir:
+        for name in names:
+            env = BenchEnv(data_dir, random.Random(args.seed))
+            bench_case = CASES[name]
+            iterations = max(1, int(bench_case.iterations * args.scale))
+            quiet = io.StringIO()
+            try:
+                # Handlers print debug output; keep it out of the report
+                with contextlib.redirect_stdout(quiet):
+                    result = await run_case(bench_case, env, iterations)
+            except SkipCase as e:
+                print(f"   {name:<34} ⚠️ skipped: {e}")
+                continue
+            except Exception as e:
+                print(f"   {name:<34} ❌ failed: {type(e).__name__}: {e}")
+                regressions.append(name)
+                continue
+            finally:
+                with contextlib.redirect_stdout(quiet):
+                    await env.cleanup()
+            results[name] = result
+            print_result(name, result)
+            if name in baseline:
+                verdict = compare(result, baseline[name], args.tolerance)
+                print(f"   {'':<34} {verdict}")
+                if verdict.startswith("❌"):
+                    regressions.append(name)
+
+    if args.save:
+        save_baseline(baseline_path, results)
+        print(f"💾 Saved baseline to {baseline_path}")
+    if regressions:
+        print(f"❌ {len(regressions)} regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bot's hot paths")
+    parser.add_argument("--only", nargs="*", help="Run only cases whose name contains one of these")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every case's iteration count")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed")
+    parser.add_argument("--baseline", help="Baseline JSON file (default: bench/baselines/<hostname>.json)")
+    parser.add_argument("--save", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a case counts as a regression")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, bench_case in CASES.items():
+            print(f"   {name:<34} {bench_case.iterations:>6,} iterations")
+        return 0
+
+    os.chdir(ROOT_DIR)
+    return asyncio.run(run_suite(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Global command statistics for the web dashboard.
+
+Every command is written to the raw command_logs table and counted into hourly
+rollups in the same transaction, so the dashboard reads a few hundred rollup
+rows instead of scanning command_logs. Raw rows older than
+COMMAND_LOG_RETENTION_DAYS are pruned; the rollups keep the history.
+
+Nothing slow runs on the bot's event loop: migrate() backfills the rollups of an
+older database at startup, and retention passes run on an executor thread and
+delete in batches of PRUNE_BATCH rows.
+"""
+
+import os
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+logger = logging.getLogger("command_stats")
+
+DB_PATH = "data/commands_global.db"
+COMMAND_LOG_RETENTION_DAYS = max(31, int(os.getenv("COMMAND_LOG_RETENTION_DAYS", "90")))  # The 30-day window needs raw rows for its first hour
+ROLLUP_RETENTION_DAYS = 400
+PRUNE_INTERVAL = 3600  # Seconds between retention passes by the log writer
+PRUNE_BATCH = 5000  # Rows per DELETE, so a retention pass never holds the write lock for long
+SCHEMA_VERSION = 1  # Stored in PRAGMA user_version once the rollups are backfilled
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS command_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        command_name TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        channel_id TEXT NOT NULL,
+        guild_id TEXT NOT NULL,
+        guild_name TEXT,
+        timestamp TEXT NOT NULL,
+        success BOOLEAN NOT NULL DEFAULT 1
+    );
+    CREATE INDEX IF NOT EXISTS idx_guild_id ON command_logs(guild_id);
+    CREATE INDEX IF NOT EXISTS idx_timestamp ON command_logs(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_command_name ON command_logs(command_name);
+
+    CREATE TABLE IF NOT EXISTS command_stats_hourly (
+        hour TEXT NOT NULL,
+        command_name TEXT NOT NULL,
+        guild_id TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (hour, command_name, guild_id)
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS command_stats_guilds (
+        guild_id TEXT PRIMARY KEY,
+        guild_name TEXT,
+        count INTEGER NOT NULL DEFAULT 0
+    );
+"""
+
+_schema_ready = set()
+_schema_lock = threading.Lock()
+_prune_lock = threading.Lock()
+_last_prune = time.monotonic()  # The first pass waits a full interval, keeping it out of startup
+
+def hour_key(moment: datetime) -> str:
+    """The rollup bucket for a UTC time, e.g. 2024-05-01T13"""
+    return moment.strftime("%Y-%m-%dT%H")
+
+def ensure_schema(conn: sqlite3.Connection, db_path: str = DB_PATH):
+    """Create the tables once per process. New databases start at SCHEMA_VERSION;
+    older ones keep their version until migrate() backfills them"""
+    if db_path in _schema_ready:
+        return
+    with _schema_lock:
+        if db_path in _schema_ready:
+            return
+        is_new = not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'command_logs'").fetchone()
+        conn.executescript(SCHEMA)
+        if is_new:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+        _schema_ready.add(db_path)
+
+def migrate(db_path: str = DB_PATH) -> bool:
+    """Backfill the rollups of a database logged before they existed.
+    Run once at startup, before the bot or dashboard start serving; returns True if it did anything"""
+    if not os.path.exists(db_path):
+        return False
+    with connect(db_path) as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return False
+        started = time.perf_counter()
+        with conn:
+            backfill_rollups(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    logger.info("📊 Backfilled command statistics rollups in %.1fs", time.perf_counter() - started)
+    return True
+
+def backfill_rollups(conn: sqlite3.Connection):
+    """Rebuild the rollups from command_logs - used once when upgrading an existing database"""
+    conn.execute("DELETE FROM command_stats_hourly")
+    conn.execute("DELETE FROM command_stats_guilds")
+    conn.execute("""
+        INSERT INTO command_stats_hourly (hour, command_name, guild_id, count)
+        SELECT substr(timestamp, 1, 13), command_name, guild_id, COUNT(*)
+        FROM command_logs
+        GROUP BY substr(timestamp, 1, 13), command_name, guild_id
+    """)
+    conn.execute("""
+        INSERT INTO command_stats_guilds (guild_id, guild_name, count)
+        SELECT guild_id, MAX(guild_name), COUNT(*)
+        FROM command_logs
+        GROUP BY guild_id
+    """)
+
+@contextmanager
+def connect(db_path: str = DB_PATH):
+    """Context manager for the global command statistics database"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=10)
+    try:
+        ensure_schema(conn, db_path)
+        yield conn
+    finally:
+        conn.close()
+
+def record_command(conn: sqlite3.Connection, command_name, user_id, channel_id, guild_id,
+                   guild_name=None, success=True, moment: datetime = None):
+    """Insert a raw log row and bump its hourly and per-guild rollups in one transaction"""
+    moment = moment or datetime.utcnow()
+    guild_id = str(guild_id)
+    with conn:
+        conn.execute("""
+            INSERT INTO command_logs (command_name, user_id, channel_id, guild_id, guild_name, timestamp, success)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (command_name, str(user_id), str(channel_id), guild_id, guild_name, moment.isoformat(), success))
+        conn.execute("""
+            INSERT INTO command_stats_hourly (hour, command_name, guild_id, count) VALUES (?, ?, ?, 1)
+            ON CONFLICT (hour, command_name, guild_id) DO UPDATE SET count = count + 1
+        """, (hour_key(moment), command_name, guild_id))
+        conn.execute("""
+            INSERT INTO command_stats_guilds (guild_id, guild_name, count) VALUES (?, ?, 1)
+            ON CONFLICT (guild_id) DO UPDATE SET
+                count = count + 1,
+                guild_name = COALESCE(excluded.guild_name, guild_name)
+        """, (guild_id, guild_name))
+
+def _delete_in_batches(conn: sqlite3.Connection, sql: str, cutoff: str, batch_size: int) -> int:
+    """Run a DELETE ... LIMIT statement until it runs dry, committing after every batch"""
+    deleted = 0
+    while True:
+        with conn:
+            count = conn.execute(sql, (cutoff, batch_size)).rowcount
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+def prune(conn: sqlite3.Connection, now: datetime = None, batch_size: int = PRUNE_BATCH):
+    """Delete raw rows past COMMAND_LOG_RETENTION_DAYS and rollups past ROLLUP_RETENTION_DAYS,
+    batch_size rows per transaction so logging commands can write in between"""
+    now = now or datetime.utcnow()
+    raw = _delete_in_batches(conn, """
+        DELETE FROM command_logs WHERE rowid IN (
+            SELECT rowid FROM command_logs WHERE timestamp < ? LIMIT ?
+        )
+    """, (now - timedelta(days=COMMAND_LOG_RETENTION_DAYS)).isoformat(), batch_size)
+    rollups = _delete_in_batches(conn, """
+        DELETE FROM command_stats_hourly WHERE (hour, command_name, guild_id) IN (
+            SELECT hour, command_name, guild_id FROM command_stats_hourly WHERE hour < ? LIMIT ?
+        )
+    """, hour_key(now - timedelta(days=ROLLUP_RETENTION_DAYS)), batch_size)
+    return raw, rollups
+
+def prune_due() -> bool:
+    """True at most once every PRUNE_INTERVAL seconds; the caller then runs prune_database()
+    on an executor thread"""
+    global _last_prune
+    with _prune_lock:
+        if time.monotonic() - _last_prune < PRUNE_INTERVAL:
+            return False
+        _last_prune = time.monotonic()
+        return True
+
+def prune_database(db_path: str = DB_PATH):
+    """A retention pass on its own connection, meant for an executor thread"""
+    try:
+        with connect(db_path) as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Until migrate() builds the rollups, the raw rows are the only history
+                return
+            raw, rollups = prune(conn)
+    except sqlite3.Error as e:
+        logger.warning("⚠️ Command log retention pass failed: %s", e)
+        return
+    if raw or rollups:
+        logger.info("🧹 Pruned %s command logs and %s hourly rollups past retention", raw, rollups)
+
+def usage_since(conn: sqlite3.Connection, since: datetime) -> dict:
+    """Commands used since a UTC time: whole hours come from the rollups,
+    only the partial first hour reads raw rows (through idx_timestamp)"""
+    first_full_hour = since.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    usage = dict(conn.execute("""
+        SELECT command_name, SUM(count) FROM command_stats_hourly
+        WHERE hour >= ?
+        GROUP BY command_name
+    """, (hour_key(first_full_hour),)).fetchall())
+    for command_name, count in conn.execute("""
+        SELECT command_name, COUNT(*) FROM command_logs
+        WHERE timestamp > ? AND timestamp < ?
+        GROUP BY command_name
+    """, (since.isoformat(), first_full_hour.isoformat())):
+        usage[command_name] = usage.get(command_name, 0) + count
+    return usage
+
+def server_totals(conn: sqlite3.Connection) -> dict:
+    """All-time command counts keyed the way the dashboard shows servers"""
+    return {
+        f"{guild_name} ({guild_id})" if guild_name else guild_id: count
+        for guild_id, guild_name, count in conn.execute(
+            "SELECT guild_id, guild_name, count FROM command_stats_guilds"
+        )
+    }
+
+def dashboard_stats(conn: sqlite3.Connection, now: datetime = None) -> dict:
+    """Everything the dashboard's command panels need, read from the rollups"""
+    now = now or datetime.utcnow()
+    return {
+        'server_commands': server_totals(conn),
+        'command_usage_24h': usage_since(conn, now - timedelta(days=1)),
+        'command_usage_month': usage_since(conn, now - timedelta(days=30)),
+    }
+
+def reset(conn: sqlite3.Connection):
+    """Delete all command logs and rollups"""
+    with conn:
+        conn.execute("DELETE FROM command_logs")
+        conn.execute("DELETE FROM command_stats_hourly")
+        conn.execute("DELETE FROM command_stats_guilds")
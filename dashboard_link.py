@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Live link between the bot and the web dashboard.
+
+The bot sends small JSON events (commands as they are logged, and a heartbeat with
+its PID, memory and CPU) as UDP datagrams to the dashboard on localhost. Sending never
+blocks and silently does nothing when the dashboard isn't running. The dashboard
+pushes the events on to the browser over Server-Sent Events.
+
+The bot also writes its PID to BOT_PID_FILE, so the dashboard can tell whether it
+is running without scanning every process on the machine.
+"""
+
+import os
+import json
+import time
+import socket
+
+DASHBOARD_EVENT_HOST = "127.0.0.1"
+DASHBOARD_EVENT_PORT = int(os.getenv("DASHBOARD_EVENT_PORT", "42070"))
+BOT_PID_FILE = "data/bot.pid"
+HEARTBEAT_INTERVAL = 5  # Seconds between bot heartbeats
+HEARTBEAT_TIMEOUT = HEARTBEAT_INTERVAL * 3  # After this the dashboard falls back to the PID file
+MAX_EVENT_SIZE = 8192
+
+_socket = None
+
+def _get_socket() -> socket.socket:
+    global _socket
+    if _socket is None:
+        _socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _socket.setblocking(False)
+    return _socket
+
+def send_event(event_type: str, **data):
+    """Fire-and-forget an event to the dashboard"""
+    payload = json.dumps({"type": event_type, "time": time.time(), **data}, default=str).encode("utf-8")
+    if len(payload) > MAX_EVENT_SIZE:
+        return
+    try:
+        _get_socket().sendto(payload, (DASHBOARD_EVENT_HOST, DASHBOARD_EVENT_PORT))
+    except OSError:
+        # Nobody listening, or the send buffer is full - the periodic resync catches up
+        pass
+
+def write_pid_file():
+    """Record the running bot's PID and start time"""
+    try:
+        os.makedirs(os.path.dirname(BOT_PID_FILE), exist_ok=True)
+        with open(BOT_PID_FILE, "w") as f:
+            json.dump({"pid": os.getpid(), "started_at": time.time()}, f)
+    except OSError as e:
+        print(f"⚠️ Could not write {BOT_PID_FILE}: {e}")
+
+def remove_pid_file():
+    """Remove the PID file on shutdown, if it is ours"""
+    try:
+        if read_pid_file().get("pid") == os.getpid():
+            os.remove(BOT_PID_FILE)
+    except OSError:
+        pass
+
+def read_pid_file() -> dict:
+    try:
+        with open(BOT_PID_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def process_status(pid: int, started_at: float = None) -> dict:
+    """Status of a single process, in the shape the dashboard shows"""
+    import psutil
+
+    try:
+        process = psutil.Process(pid)
+        create_time = process.create_time()
+        # A recycled PID belongs to a different process that started later
+        if started_at is not None and create_time > started_at + 5:
+            return {"running": False}
+        with process.oneshot():
+            return {
+                "running": True,
+                "pid": pid,
+                "memory_mb": round(process.memory_info().rss / 1024 / 1024, 1),
+                "cpu_percent": process.cpu_percent(),
+                "uptime": time.time() - create_time,
+            }
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return {"running": False}
+
+_own_process = None
+
+def heartbeat(bot=None):
+    """Send the bot's status to the dashboard - run every HEARTBEAT_INTERVAL seconds"""
+    global _own_process
+    import psutil
+
+    if _own_process is None:
+        _own_process = psutil.Process()
+        _own_process.cpu_percent()  # The first call only primes the counter
+    with _own_process.oneshot():
+        status = {
+            "running": True,
+            "pid": _own_process.pid,
+            "memory_mb": round(_own_process.memory_info().rss / 1024 / 1024, 1),
+            "cpu_percent": _own_process.cpu_percent(),
+            "uptime": time.time() - _own_process.create_time(),
+        }
+    if bot is not None and bot.is_ready():
+        status["total_servers"] = len(bot.guilds)
+        status["total_users"] = sum(guild.member_count or 0 for guild in bot.guilds)
+    send_event("heartbeat", status=status)
+
+def open_receiver() -> socket.socket:
+    """Bind the dashboard's end of the link"""
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind((DASHBOARD_EVENT_HOST, DASHBOARD_EVENT_PORT))
+    return receiver
+
+def receive_event(receiver: socket.socket) -> dict:
+    """Block until the next well-formed event arrives"""
+    while True:
+        payload, _ = receiver.recvfrom(MAX_EVENT_SIZE)
+        try:
+            event = json.loads(payload.decode("utf-8"))
+        except ValueError:
+            continue
+        if isinstance(event, dict) and "type" in event:
+            return event
@@ -12,6 +12,7 @@ import time
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+import metrics
 
 # Get the absolute path to the data directory
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -27,6 +28,24 @@ except Exception as e:
     print(f"[ERROR] Failed to create database directories: {str(e)}")
     # Try to continue anyway
 
+# Database timings for the /metrics exporter
+DB_SESSION_OPEN_SECONDS = metrics.histogram(
+    "puddlesbot_db_session_open_seconds", "Time to open and test a per-server database session"
+)
+DB_COMMIT_SECONDS = metrics.histogram(
+    "puddlesbot_db_commit_seconds", "Time spent committing database sessions"
+)
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "before_commit")
+def _commit_started(session):
+    session.info['commit_started_at'] = time.perf_counter()
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_commit")
+def _commit_finished(session):
+    started_at = session.info.pop('commit_started_at', None)
+    if started_at is not None:
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - started_at)
+
 # Lock for database initialization
 _init_lock = threading.Lock()
 _engines = {}  # server_id -> engine
@@ -373,6 +392,10 @@ def get_engine(server_id):
 
 def get_session(server_id):
     """Get a database session for the given server_id."""
+    with DB_SESSION_OPEN_SECONDS.time():
+        return _open_session(server_id)
+
+def _open_session(server_id):
     try:
         print(f"[DEBUG] Getting database session for server {server_id}")
         
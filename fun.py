@@ -1,14 +1,18 @@
 import discord
 from discord import app_commands
-import requests
+import io
+import aiohttp
+import asyncio
 import functools
-from typing import Callable, Any
+from typing import Callable, Any, Dict, List, Optional
 import traceback
 import random
 import json
 import os
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+
+import metrics
 
 # Store reference to the client
 _client = None
@@ -16,10 +20,354 @@ _client = None
 # Cooldown tracking for fortune cookie
 fortune_cooldowns = defaultdict(float)
 
+# ============= OUTBOUND HTTP =============
+
+DUCK_API_URL = 'https://random-d.uk/api/v2/random'
+MEME_API_URL = 'https://meme-api.com/gimme'
+
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=3)
+HTTP_RETRIES = 2  # Extra attempts after the first, for timeouts, connection errors and 5xx
+HTTP_RETRY_BACKOFF = 0.5  # Seconds, doubled after every attempt
+PREFETCH_SIZE = 5  # Results kept ready in memory per API
+FALLBACK_SIZE = 20  # Recently served results reused while an API is down
+BREAKER_FAILURES = 3  # Consecutive failed fetches before the circuit opens
+BREAKER_RESET = 60  # Seconds the circuit stays open before one trial request
+LIVE_FETCH_WAIT = 2.5  # Total timeout of the single request a command makes when the buffer is empty
+
+FUN_API_REQUESTS = metrics.counter(
+    "puddlesbot_fun_api_requests_total", "Requests to the fun command APIs by outcome", ["api", "outcome"]
+)
+FUN_API_SERVED = metrics.counter(
+    "puddlesbot_fun_api_served_total", "Fun command results by where they came from", ["api", "source"]
+)
+
+_http_session = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """The shared session for every outbound request in this module"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+        _http_session = aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+    return _http_session
+
+async def close_http():
+    """Stop the prefetchers and the asset watcher and close the shared session (called from the bot's close())"""
+    global _http_session
+    for buffer in (duck_buffer, meme_buffer):
+        buffer.stop()
+    assets.stop()
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+class APIUnavailable(Exception):
+    """A fun API could not be reached; `status` is the HTTP status if it answered at all"""
+
+    def __init__(self, api: str, status: Optional[int] = None, timed_out: bool = False):
+        self.api = api
+        self.status = status
+        self.timed_out = timed_out
+        if status:
+            reason = f"HTTP {status}"
+        else:
+            reason = "timed out" if timed_out else "unreachable (circuit open or network error)"
+        super().__init__(f"{api} API {reason}")
+
+class ContentRejected(APIUnavailable):
+    """The API answered, but with something we won't show (an NSFW or malformed result)"""
+
+    def __init__(self, api: str, data: dict):
+        self.data = data
+        super().__init__(api)
+
+class CircuitBreaker:
+    """Stops calling an API that keeps failing, then lets one request through every `reset_after` seconds"""
+
+    def __init__(self, failures: int = BREAKER_FAILURES, reset_after: float = BREAKER_RESET):
+        self.max_failures = failures
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._trial_at = None  # When the half-open trial request was let through
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        # A trial that never reported back (its task was cancelled) stops blocking after reset_after too
+        if now - self.opened_at >= self.reset_after and (self._trial_at is None or now - self._trial_at >= self.reset_after):
+            self._trial_at = now  # Half-open: this caller tests the API
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_at is not None or self.failures >= self.max_failures:
+            if self.opened_at is None:
+                print(f"⚠️ Fun API circuit opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+        self._trial_at = None
+
+    def record_cancelled(self):
+        """The request was abandoned before it finished; a trial counts as failed, anything else as nothing"""
+        if self._trial_at is not None:
+            self.opened_at = time.monotonic()
+            self._trial_at = None
+
+async def fetch_json(api: str, url: str, breaker: CircuitBreaker, timeout: Optional[aiohttp.ClientTimeout] = None,
+                     retries: int = HTTP_RETRIES) -> dict:
+    """GET a JSON document through the shared session, retrying transient failures"""
+    if not breaker.allow():
+        FUN_API_REQUESTS.labels(api=api, outcome="rejected").inc()
+        raise APIUnavailable(api)
+    try:
+        return await _fetch_with_retries(api, url, breaker, timeout or HTTP_TIMEOUT, retries)
+    except asyncio.CancelledError:
+        breaker.record_cancelled()
+        raise
+
+async def _fetch_with_retries(api: str, url: str, breaker: CircuitBreaker, timeout: aiohttp.ClientTimeout,
+                              retries: int) -> dict:
+    error = APIUnavailable(api)
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(HTTP_RETRY_BACKOFF * 2 ** (attempt - 1))
+        try:
+            async with get_http_session().get(url, timeout=timeout) as response:
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                    FUN_API_REQUESTS.labels(api=api, outcome="ok").inc()
+                    breaker.record_success()
+                    return data
+                error = APIUnavailable(api, status=response.status)
+                FUN_API_REQUESTS.labels(api=api, outcome="http_error").inc()
+                if response.status < 500 and response.status != 429:
+                    break  # Retrying won't fix a 4xx
+        except asyncio.TimeoutError:
+            error = APIUnavailable(api, timed_out=True)
+            FUN_API_REQUESTS.labels(api=api, outcome="timeout").inc()
+        except (aiohttp.ClientError, ValueError) as e:
+            error = APIUnavailable(api)
+            FUN_API_REQUESTS.labels(api=api, outcome="error").inc()
+            print(f"⚠️ {api} API request failed: {e}")
+    breaker.record_failure()
+    raise error
+
+class PrefetchBuffer:
+    """
+    Keeps a few API results ready so commands answer from memory.
+
+    get() takes the oldest buffered result and starts a background refill. With an
+    empty buffer it makes one live request within LIVE_FETCH_WAIT; if that fails,
+    is rejected by `accept`, or the circuit is open, it reuses one of the last
+    FALLBACK_SIZE results it served.
+    """
+
+    def __init__(self, api: str, url: str, accept: Callable[[dict], bool], size: int = PREFETCH_SIZE):
+        self.api = api
+        self.url = url
+        self.accept = accept
+        self.size = size
+        self.breaker = CircuitBreaker()
+        self.ready = deque()
+        self.recent = deque(maxlen=FALLBACK_SIZE)
+        self._refill_task = None
+
+    async def _fetch(self, **kwargs) -> dict:
+        """One result; raises ContentRejected if the API answered with something we won't show"""
+        data = await fetch_json(self.api, self.url, self.breaker, **kwargs)
+        if not self.accept(data):
+            raise ContentRejected(self.api, data)
+        return data
+
+    async def _refill(self):
+        misses = 0
+        while len(self.ready) < self.size and misses < self.size:
+            try:
+                self.ready.append(await self._fetch())
+            except ContentRejected:
+                misses += 1
+            except APIUnavailable:
+                return  # The breaker decides when to try again
+
+    def refill(self):
+        """Top the buffer up in the background, unless that's already happening"""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.get_running_loop().create_task(self._refill())
+
+    def stop(self):
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            self._refill_task = None
+
+    async def get(self) -> dict:
+        if self.ready:
+            data = self.ready.popleft()
+            source = "buffer"
+        else:
+            try:
+                # Discord wants the interaction answered within 3 seconds, so one short attempt
+                data = await self._fetch(timeout=aiohttp.ClientTimeout(total=LIVE_FETCH_WAIT), retries=0)
+                source = "live"
+            except APIUnavailable:
+                if not self.recent:
+                    FUN_API_SERVED.labels(api=self.api, source="none").inc()
+                    raise
+                data = random.choice(self.recent)
+                source = "fallback"
+        if source != "fallback":
+            self.recent.append(data)
+        FUN_API_SERVED.labels(api=self.api, source=source).inc()
+        self.refill()
+        return data
+
+duck_buffer = PrefetchBuffer("duck", DUCK_API_URL, accept=lambda data: 'url' in data)
+# NSFW and malformed memes are dropped while prefetching; /meme only refuses one it fetched live with no fallback
+meme_buffer = PrefetchBuffer("meme", MEME_API_URL,
+                             accept=lambda data: 'url' in data and 'title' in data and not data.get('nsfw', False))
+
+# ============= LOCAL ASSETS =============
+
+FORTUNES_DIR = 'fortunes'
+FORTUNES_FALLBACK = 'fortunes.txt'
+COINFLIP_DIRS = {'Heads': 'Media/coinflip/head', 'Tails': 'Media/coinflip/tail'}
+ASSET_CHECK_INTERVAL = 60  # Seconds between checks for changed fortune and coin files
+
+class AssetCache:
+    """
+    Fortunes per language and coin images, held in memory.
+
+    load() reads only the files whose size or modification time changed since the
+    last load and then swaps the new tables in whole, so it can run on a worker
+    thread while commands read. The commands themselves never touch the disk.
+    """
+
+    def __init__(self):
+        self.fortunes: Dict[str, List[str]] = {}  # 'en' -> fortunes, '' for the root fortunes.txt
+        self.coins: Dict[str, List[bytes]] = {side: [] for side in COINFLIP_DIRS}
+        self.coin_filenames = {side: f"coin_{side.lower()}.png" for side in COINFLIP_DIRS}
+        self.loaded = False
+        self._signatures: Dict[str, tuple] = {}
+        self._contents: Dict[str, Any] = {}
+        self._watch_task = None
+
+    def _files(self) -> Dict[str, str]:
+        """Every asset file on disk, as path -> fortunes language or coin side"""
+        files = {}
+        if os.path.isdir(FORTUNES_DIR):
+            for name in os.listdir(FORTUNES_DIR):
+                if name.startswith('fortunes-') and name.endswith('.txt'):
+                    files[os.path.join(FORTUNES_DIR, name)] = name[len('fortunes-'):-len('.txt')]
+        if os.path.isfile(FORTUNES_FALLBACK):
+            files[FORTUNES_FALLBACK] = ''
+        for side, folder in COINFLIP_DIRS.items():
+            if os.path.isdir(folder):
+                for name in sorted(os.listdir(folder)):
+                    if name.lower().endswith('.png'):
+                        files[os.path.join(folder, name)] = side
+        return files
+
+    def load(self) -> int:
+        """Re-read new and changed files; returns how many changed (blocking, so not on the event loop)"""
+        files = self._files()
+        changed = len(self._signatures.keys() - files.keys())
+        for path in list(self._signatures):
+            if path not in files:
+                del self._signatures[path]
+                self._contents.pop(path, None)
+
+        for path, key in files.items():
+            try:
+                stat = os.stat(path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if self._signatures.get(path) == signature:
+                    continue
+                if key in COINFLIP_DIRS:
+                    with open(path, 'rb') as f:
+                        content = f.read()
+                else:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        content = [line.strip() for line in f if line.strip()]
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error reading {path}: {e}")
+                continue  # Keep the previous contents and try again on the next check
+            self._signatures[path] = signature
+            self._contents[path] = content
+            changed += 1
+
+        if changed or not self.loaded:
+            fortunes = {}
+            coins = {side: [] for side in COINFLIP_DIRS}
+            for path, key in files.items():
+                if path not in self._contents:
+                    continue
+                if key in COINFLIP_DIRS:
+                    coins[key].append(self._contents[path])
+                else:
+                    fortunes[key] = self._contents[path]
+            self.fortunes, self.coins = fortunes, coins
+            self.loaded = True
+        return changed
+
+    def fortunes_for(self, lang: str) -> Optional[List[str]]:
+        """The language's fortunes, else English, else fortunes.txt; None if there are none at all"""
+        if not self.loaded:
+            self.load()
+        for key in (lang, 'en', ''):
+            if key in self.fortunes:
+                return self.fortunes[key]
+        return None
+
+    def coin_images(self, side: str) -> List[bytes]:
+        if not self.loaded:
+            self.load()
+        return self.coins.get(side, [])
+
+    async def _watch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(ASSET_CHECK_INTERVAL)
+            try:
+                changed = await loop.run_in_executor(None, self.load)
+                if changed:
+                    print(f"🔄 Reloaded {changed} fortune/coinflip files")
+            except Exception as e:
+                print(f"Error checking fun assets: {e}")
+
+    def start(self):
+        """Load everything now and start checking for changes (needs a running loop)"""
+        self.load()
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.get_running_loop().create_task(self._watch())
+
+    def stop(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+assets = AssetCache()
+
 def setup_fun_system(client):
     """Initialize the fun system with client reference"""
     global _client
     _client = client
+    try:
+        # Fill the buffers before the first /quack or /meme, and load fortunes and coin images
+        duck_buffer.refill()
+        meme_buffer.refill()
+        assets.start()
+    except RuntimeError:
+        pass  # No running loop; everything loads on first use
 
 def log_command(func: Callable) -> Callable:
     @functools.wraps(func)
@@ -49,35 +397,34 @@ def log_command(func: Callable) -> Callable:
 async def quack(interaction: discord.Interaction):
     """Get a random duck image from random-d.uk API"""
     try:
-        # Get a random duck image from random-d.uk API
-        response = requests.get('https://random-d.uk/api/v2/random')
-        if response.status_code == 200:
-            data = response.json()
-            # Get server's language preference
-            import language
-            server_lang = language.get_server_language(interaction.guild_id)
-            
-            # Get translated text
-            title_text = language.get_text("quack_title", server_lang)
-            footer_text = language.get_text("quack_footer", server_lang)
-            
-            embed = discord.Embed(
-                title=title_text,
-                color=discord.Color.yellow()
-            )
-            embed.set_image(url=data['url'])
-            embed.set_footer(text=footer_text)
-            await interaction.response.send_message(embed=embed)
-        else:
-            # Get server's language preference for error message
-            import language
-            server_lang = language.get_server_language(interaction.guild_id)
-            error_text = language.get_text("quack_error", server_lang)
-            
-            await interaction.response.send_message(
-                error_text,
-                ephemeral=True
-            )
+        # Get a random duck image from random-d.uk API (usually already prefetched)
+        data = await duck_buffer.get()
+        # Get server's language preference
+        import language
+        server_lang = language.get_server_language(interaction.guild_id)
+        
+        # Get translated text
+        title_text = language.get_text("quack_title", server_lang)
+        footer_text = language.get_text("quack_footer", server_lang)
+        
+        embed = discord.Embed(
+            title=title_text,
+            color=discord.Color.yellow()
+        )
+        embed.set_image(url=data['url'])
+        embed.set_footer(text=footer_text)
+        await interaction.response.send_message(embed=embed)
+    except APIUnavailable as e:
+        print(f"⚠️ Quack unavailable: {e}")
+        # Get server's language preference for error message
+        import language
+        server_lang = language.get_server_language(interaction.guild_id)
+        error_text = language.get_text("quack_error", server_lang)
+        
+        await interaction.response.send_message(
+            error_text,
+            ephemeral=True
+        )
     except Exception as e:
         print(f"Error in quack command: {str(e)}")
         print(traceback.format_exc())
@@ -102,27 +449,25 @@ async def coinflip(interaction: discord.Interaction):
         # Generate random result
         result = random.choice(['Heads', 'Tails'])
         
-        # Get the appropriate folder path
+        # Pick the side's look
         if result == 'Heads':
-            folder_path = 'Media/coinflip/head'
             emoji = '🟡'
             color = discord.Color.gold()
         else:
-            folder_path = 'Media/coinflip/tail'
             emoji = '⚪'
             color = discord.Color.from_rgb(192, 192, 192)  # Silver color for tails
         
-        # Get all PNG files from the appropriate folder
+        # Coin images are preloaded, so this doesn't touch the disk
         try:
-            image_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.png')]
+            images = assets.coin_images(result)
             
-            if not image_files:
+            if not images:
                 # Fallback if no images found
-                raise FileNotFoundError(f"No images found in {folder_path}")
+                raise FileNotFoundError(f"No images found in {COINFLIP_DIRS[result]}")
             
             # Select a random image
-            random_image = random.choice(image_files)
-            image_path = os.path.join(folder_path, random_image)
+            image = random.choice(images)
+            filename = assets.coin_filenames[result]
             
             # Get user's language preference
             import language
@@ -150,10 +495,9 @@ async def coinflip(interaction: discord.Interaction):
             embed.set_footer(text=footer_text)
             
             # Send the message with the coin image
-            with open(image_path, 'rb') as image_file:
-                discord_file = discord.File(image_file, filename=f"coin_{result.lower()}.png")
-                embed.set_image(url=f"attachment://coin_{result.lower()}.png")
-                await interaction.response.send_message(embed=embed, file=discord_file)
+            discord_file = discord.File(io.BytesIO(image), filename=filename)
+            embed.set_image(url=f"attachment://{filename}")
+            await interaction.response.send_message(embed=embed, file=discord_file)
                 
         except (FileNotFoundError, OSError) as file_error:
             print(f"File error in coinflip: {str(file_error)}")
@@ -211,99 +555,73 @@ async def coinflip(interaction: discord.Interaction):
 async def meme(interaction: discord.Interaction):
     """Get a random meme from meme-api.com"""
     try:
-        # Use the reliable meme-api.com service
-        api_url = 'https://meme-api.com/gimme'
-        
-        response = requests.get(api_url, timeout=10)
+        # Usually served from the prefetch buffer, where NSFW memes are already filtered out
+        data = await meme_buffer.get()
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Get server's language preference
-            import language
-            server_lang = language.get_server_language(interaction.guild_id)
-            
-            # Check if we got valid meme data and it's not NSFW
-            if 'url' in data and 'title' in data and not data.get('nsfw', False):
-                # Get translated text
-                title_text = data.get('title', language.get_text("meme_title", server_lang))
-                footer_text = language.get_text("meme_footer", server_lang)
-                posted_by_text = language.get_text("meme_posted_by", server_lang)
-                from_text = language.get_text("meme_from", server_lang)
-                upvotes_text = language.get_text("meme_upvotes", server_lang)
-                original_post_text = language.get_text("meme_original_post", server_lang)
-                view_on_reddit_text = language.get_text("meme_view_on_reddit", server_lang)
-                
-                embed = discord.Embed(
-                    title=title_text,
-                    color=discord.Color.purple()
-                )
-                embed.set_image(url=data['url'])
-                
-                # Add meme information
-                if 'author' in data:
-                    embed.add_field(name=posted_by_text, value=f"u/{data['author']}", inline=True)
-                if 'subreddit' in data:
-                    embed.add_field(name=from_text, value=f"r/{data['subreddit']}", inline=True)
-                if 'ups' in data:
-                    embed.add_field(name=upvotes_text, value=f"{data['ups']:,}", inline=True)
-                
-                # Add post link if available
-                if 'postLink' in data:
-                    embed.add_field(name=original_post_text, value=f"[{view_on_reddit_text}]({data['postLink']})", inline=False)
-                
-                embed.set_footer(text=footer_text)
-                await interaction.response.send_message(embed=embed)
-            else:
-                # Handle NSFW or invalid content
-                if data.get('nsfw', False):
-                    nsfw_title = language.get_text("meme_nsfw_filtered", server_lang)
-                    nsfw_message = language.get_text("meme_nsfw_message", server_lang)
-                    embed = discord.Embed(
-                        title=nsfw_title,
-                        description=nsfw_message,
-                        color=discord.Color.orange()
-                    )
-                    await interaction.response.send_message(embed=embed, ephemeral=True)
-                else:
-                    raise Exception("Invalid meme data received")
-        else:
-            # API returned an error status
-            service_unavailable_title = language.get_text("meme_service_unavailable", server_lang)
-            service_error_message = language.get_text("meme_service_error", server_lang, status=response.status_code)
-            embed = discord.Embed(
-                title=service_unavailable_title,
-                description=service_error_message,
-                color=discord.Color.red()
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            
-    except requests.exceptions.Timeout:
-        # Get server's language preference for timeout error
+        # Get server's language preference
         import language
         server_lang = language.get_server_language(interaction.guild_id)
-        timeout_title = language.get_text("meme_timeout", server_lang)
-        timeout_message = language.get_text("meme_timeout_message", server_lang)
+        
+        # Get translated text
+        title_text = data.get('title', language.get_text("meme_title", server_lang))
+        footer_text = language.get_text("meme_footer", server_lang)
+        posted_by_text = language.get_text("meme_posted_by", server_lang)
+        from_text = language.get_text("meme_from", server_lang)
+        upvotes_text = language.get_text("meme_upvotes", server_lang)
+        original_post_text = language.get_text("meme_original_post", server_lang)
+        view_on_reddit_text = language.get_text("meme_view_on_reddit", server_lang)
         
         embed = discord.Embed(
-            title=timeout_title,
-            description=timeout_message,
-            color=discord.Color.orange()
+            title=title_text,
+            color=discord.Color.purple()
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        embed.set_image(url=data['url'])
         
-    except requests.exceptions.RequestException as req_error:
-        print(f"Request error in meme command: {str(req_error)}")
-        # Get server's language preference for network error
+        # Add meme information
+        if 'author' in data:
+            embed.add_field(name=posted_by_text, value=f"u/{data['author']}", inline=True)
+        if 'subreddit' in data:
+            embed.add_field(name=from_text, value=f"r/{data['subreddit']}", inline=True)
+        if 'ups' in data:
+            embed.add_field(name=upvotes_text, value=f"{data['ups']:,}", inline=True)
+        
+        # Add post link if available
+        if 'postLink' in data:
+            embed.add_field(name=original_post_text, value=f"[{view_on_reddit_text}]({data['postLink']})", inline=False)
+        
+        embed.set_footer(text=footer_text)
+        await interaction.response.send_message(embed=embed)
+            
+    except APIUnavailable as e:
+        print(f"⚠️ Meme unavailable: {e}")
+        # Get server's language preference for the error
         import language
         server_lang = language.get_server_language(interaction.guild_id)
-        network_title = language.get_text("meme_network_error", server_lang)
-        network_message = language.get_text("meme_network_message", server_lang)
+        if isinstance(e, ContentRejected) and e.data.get('nsfw', False):
+            error_title = language.get_text("meme_nsfw_filtered", server_lang)
+            error_message = language.get_text("meme_nsfw_message", server_lang)
+            color = discord.Color.orange()
+        elif isinstance(e, ContentRejected):
+            error_title = language.get_text("meme_unexpected_error", server_lang)
+            error_message = language.get_text("meme_unexpected_message", server_lang)
+            color = discord.Color.red()
+        elif e.timed_out:
+            error_title = language.get_text("meme_timeout", server_lang)
+            error_message = language.get_text("meme_timeout_message", server_lang)
+            color = discord.Color.orange()
+        elif e.status:
+            error_title = language.get_text("meme_service_unavailable", server_lang)
+            error_message = language.get_text("meme_service_error", server_lang, status=e.status)
+            color = discord.Color.red()
+        else:
+            error_title = language.get_text("meme_network_error", server_lang)
+            error_message = language.get_text("meme_network_message", server_lang)
+            color = discord.Color.red()
         
         embed = discord.Embed(
-            title=network_title,
-            description=network_message,
-            color=discord.Color.red()
+            title=error_title,
+            description=error_message,
+            color=color
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
         
@@ -329,7 +647,7 @@ async def meme(interaction: discord.Interaction):
 )
 @log_command
 async def fortunecookie(interaction: discord.Interaction):
-    """Get a random fortune from fortunes.txt file"""
+    """Get a random fortune from the fortunes files"""
     try:
         # Get server's language preference
         import language
@@ -361,31 +679,12 @@ async def fortunecookie(interaction: discord.Interaction):
                 )
                 return
         
-        # Check if language-specific fortunes file exists, fallback to English
-        fortunes_file = f'fortunes/fortunes-{server_lang}.txt'
-        if not os.path.exists(fortunes_file):
-            # Fallback to English if language-specific file doesn't exist
-            fortunes_file = 'fortunes/fortunes-en.txt'
-            if not os.path.exists(fortunes_file):
-                # Final fallback to root fortunes.txt
-                fortunes_file = 'fortunes.txt'
-                if not os.path.exists(fortunes_file):
-                    file_not_found_text = language.get_text("fortune_cookie_file_not_found", server_lang)
-                    await interaction.response.send_message(
-                        file_not_found_text,
-                        ephemeral=True
-                    )
-                    return
-        
-        # Read fortunes from file
-        try:
-            with open(fortunes_file, 'r', encoding='utf-8') as file:
-                fortunes = [line.strip() for line in file if line.strip()]
-        except Exception as e:
-            print(f"Error reading fortunes file {fortunes_file}: {str(e)}")
-            read_error_text = language.get_text("fortune_cookie_read_error", server_lang)
+        # Fortunes are preloaded per language, falling back to English and then fortunes.txt
+        fortunes = assets.fortunes_for(server_lang)
+        if fortunes is None:
+            file_not_found_text = language.get_text("fortune_cookie_file_not_found", server_lang)
             await interaction.response.send_message(
-                read_error_text,
+                file_not_found_text,
                 ephemeral=True
             )
             return
@@ -40,6 +40,10 @@ def setup_language_system(client):
     global _client
     _client = client
     load_language_settings()
+    try:
+        start_language_watcher()
+    except RuntimeError:
+        pass  # No running loop; files load on first use and aren't watched
 
 def log_command(func: Callable) -> Callable:
     @functools.wraps(func)
@@ -65,19 +69,74 @@ def get_language_file_path(lang_code: str) -> str:
     """Get the path to a language file"""
     return f"langs/{lang_code}.json"
 
-def load_language_file(lang_code: str) -> Dict:
-    """Load a language file"""
+# Parsed language files, refreshed in the background when a file changes
+LANGUAGE_CHECK_INTERVAL = 60  # Seconds between checks for edited language files
+_language_tables: Dict[str, Optional[Dict]] = {}  # lang_code -> translations, None if the file doesn't exist
+_language_signatures: Dict[str, Optional[tuple]] = {}  # lang_code -> (mtime_ns, size) of the loaded file
+_language_watch_task = None
+
+def _read_language_file(lang_code: str):
+    """Read one language file from disk: (translations or None if missing, signature)"""
     file_path = get_language_file_path(lang_code)
     try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            # Return English as fallback
-            return load_language_file("en")
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None, None
+    except OSError as e:
+        print(f"Error loading language file {file_path}: {e}")
+        return {}, None
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f), (stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         print(f"Error loading language file {file_path}: {e}")
-        return {}
+        return {}, None  # No signature, so the next refresh tries again
+
+def load_language_file(lang_code: str) -> Dict:
+    """Load a language file (read from disk once, then served from memory)"""
+    if lang_code not in _language_tables:
+        _language_tables[lang_code], _language_signatures[lang_code] = _read_language_file(lang_code)
+    table = _language_tables[lang_code]
+    if table is None:
+        # Return English as fallback
+        return load_language_file("en") if lang_code != "en" else {}
+    return table
+
+def refresh_language_files() -> int:
+    """Re-read the cached language files that changed on disk; returns how many did (blocking)"""
+    changed = 0
+    for lang_code in list(_language_tables):
+        try:
+            stat = os.stat(get_language_file_path(lang_code))
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature is not None and signature == _language_signatures.get(lang_code):
+            continue
+        if signature is None and _language_tables[lang_code] is None:
+            continue  # Still missing
+        _language_tables[lang_code], _language_signatures[lang_code] = _read_language_file(lang_code)
+        changed += 1
+    return changed
+
+async def _watch_language_files():
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(LANGUAGE_CHECK_INTERVAL)
+        try:
+            changed = await loop.run_in_executor(None, refresh_language_files)
+            if changed:
+                print(f"🔄 Reloaded {changed} language files")
+        except Exception as e:
+            print(f"Error checking language files: {e}")
+
+def start_language_watcher():
+    """Load every supported language now and reload edited files in the background (needs a running loop)"""
+    global _language_watch_task
+    for lang_code in SUPPORTED_LANGUAGES:
+        load_language_file(lang_code)
+    if _language_watch_task is None or _language_watch_task.done():
+        _language_watch_task = asyncio.get_running_loop().create_task(_watch_language_files())
 
 def get_text(key: str, lang_code: str = None, **kwargs) -> str:
     """Get translated text for a key"""
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Event-loop lag watchdog for PuddlesBot.
+
+A heartbeat task on the event loop wakes every LOOP_MONITOR_INTERVAL seconds and
+records how late it woke up. A watchdog thread checks the heartbeat; when the loop
+has not ticked for LOOP_LAG_THRESHOLD_MS it captures the stack of the loop thread,
+which is the callback or coroutine that is blocking it. Each stall is written to
+logs/loop_lag.log (rotating) and counted per hotspot, the innermost frame in the
+bot's own code, so the owner can see the worst offenders with /looplag.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import logging.handlers
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import metrics
+
+logger = logging.getLogger("loop_monitor")
+
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "250")) / 1000  # 0 disables the watchdog
+LOOP_MONITOR_INTERVAL = 0.1  # Seconds between heartbeat ticks
+REPORT_PATH = "logs/loop_lag.log"
+REPORT_MAX_BYTES = 5 * 1024 * 1024
+REPORT_BACKUPS = 3
+RECENT_LAGS = 3000  # Heartbeat samples kept for percentiles (about 5 minutes)
+MAX_STACK_FRAMES = 25
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+LOOP_LAG_SECONDS = metrics.histogram(
+    "puddlesbot_event_loop_lag_seconds", "How late the event loop heartbeat woke up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+LOOP_STALLS = metrics.counter("puddlesbot_event_loop_stalls_total", "Times the event loop was blocked past the threshold")
+
+def _is_own_code(filename: str) -> bool:
+    return filename.startswith(ROOT_DIR) and "site-packages" not in filename
+
+def loop_frames(frame) -> List[traceback.FrameSummary]:
+    """The loop thread's stack from the running callback down, without the asyncio machinery above it"""
+    frames = traceback.extract_stack(frame)
+    for index in range(len(frames) - 1, -1, -1):
+        # Handle._run in asyncio/events.py calls the callback that is blocking the loop
+        if frames[index].filename.startswith(ASYNCIO_DIR) and frames[index].name == "_run":
+            frames = frames[index + 1:]
+            break
+    return frames[-MAX_STACK_FRAMES:]
+
+def hotspot(frames: List[traceback.FrameSummary]) -> str:
+    """The innermost frame in the bot's own code, e.g. 'fun.py:88 in quack'"""
+    for frame in reversed(frames):
+        if _is_own_code(frame.filename):
+            return f"{os.path.relpath(frame.filename, ROOT_DIR)}:{frame.lineno} in {frame.name}"
+    if frames:
+        return f"{os.path.basename(frames[-1].filename)}:{frames[-1].lineno} in {frames[-1].name}"
+    return "unknown"
+
+class _Offender:
+    __slots__ = ("hotspot", "count", "total", "worst", "last_seen", "stack")
+
+    def __init__(self, hotspot: str, stack: str):
+        self.hotspot = hotspot
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.last_seen = None
+        self.stack = stack
+
+class LoopMonitor:
+    """Measures event-loop lag and records what blocked the loop"""
+
+    def __init__(self, threshold: float = LOOP_LAG_THRESHOLD, interval: float = LOOP_MONITOR_INTERVAL,
+                 report_path: Optional[str] = REPORT_PATH):
+        self.threshold = threshold
+        self.interval = interval
+        self.report_path = report_path
+        self.lags = deque(maxlen=RECENT_LAGS)
+        self.stalls = 0
+        self.offenders: Dict[str, _Offender] = {}
+        self._lock = threading.Lock()
+        self._late_ticks = deque(maxlen=64)  # (tick the stall started from, measured lag)
+        self._last_tick = 0.0
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._report = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the heartbeat on the running loop and the watchdog thread"""
+        if self.running or self.threshold <= 0:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        if self._report is not None:
+            self._report.close()
+            self._report = None
+
+    async def _heartbeat(self):
+        while True:
+            tick = self._last_tick
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - tick - self.interval)
+            self.lags.append(lag)
+            LOOP_LAG_SECONDS.observe(lag)
+            if lag >= self.threshold:
+                self._late_ticks.append((tick, lag))
+            self._last_tick = now
+
+    def _watch(self):
+        stalled_since = None  # The heartbeat tick the current stall started from
+        frames = None
+        while not self._stop.wait(min(self.interval, self.threshold) / 2):
+            tick = self._last_tick
+            if stalled_since is not None and tick != stalled_since:
+                self._record(stalled_since, frames, time.monotonic() - stalled_since - self.interval)
+                stalled_since = None
+            if stalled_since is None and time.monotonic() - tick - self.interval >= self.threshold:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                frames = loop_frames(frame)
+                del frame
+                # The loop may have moved on while we were looking
+                if self._last_tick == tick:
+                    stalled_since = tick
+
+    def _record(self, stalled_since: float, frames: List[traceback.FrameSummary], estimate: float):
+        """Count a finished stall against its hotspot and write it to the report"""
+        duration = next((lag for tick, lag in list(self._late_ticks) if tick == stalled_since), estimate)
+        spot = hotspot(frames)
+        stack = "".join(traceback.format_list(frames))
+        with self._lock:
+            offender = self.offenders.get(spot)
+            if offender is None:
+                offender = self.offenders[spot] = _Offender(spot, stack)
+            offender.count += 1
+            offender.total += duration
+            offender.last_seen = datetime.now()
+            if duration >= offender.worst:
+                offender.worst = duration
+                offender.stack = stack
+            self.stalls += 1
+        LOOP_STALLS.inc()
+        logger.warning("Event loop blocked for %.0fms at %s", duration * 1000, spot)
+        self._write_report(f"{datetime.now():%Y-%m-%d %H:%M:%S} Event loop blocked for {duration * 1000:.0f}ms "
+                           f"(threshold {self.threshold * 1000:.0f}ms) at {spot}\n{stack}")
+
+    def _write_report(self, entry: str):
+        # Runs on the watchdog thread, never on the event loop
+        if not self.report_path:
+            return
+        try:
+            if self._report is None:
+                os.makedirs(os.path.dirname(self.report_path) or ".", exist_ok=True)
+                self._report = logging.handlers.RotatingFileHandler(
+                    self.report_path, maxBytes=REPORT_MAX_BYTES, backupCount=REPORT_BACKUPS, encoding="utf-8"
+                )
+                self._report.setFormatter(logging.Formatter("%(message)s"))
+            self._report.emit(logging.makeLogRecord({"msg": entry, "levelno": logging.WARNING}))
+        except OSError as e:
+            logger.error("Could not write %s: %s", self.report_path, e)
+
+    def lag_summary(self) -> dict:
+        """Percentiles of the recent heartbeat lag, in milliseconds"""
+        lags = sorted(self.lags)
+        if not lags:
+            return {"samples": 0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        return {
+            "samples": len(lags),
+            "p50": lags[len(lags) // 2] * 1000,
+            "p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000,
+            "max": lags[-1] * 1000,
+        }
+
+    def top_offenders(self, limit: int = 5) -> List[_Offender]:
+        """Hotspots that blocked the loop the longest in total"""
+        with self._lock:
+            return sorted(self.offenders.values(), key=lambda offender: offender.total, reverse=True)[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.offenders.clear()
+            self.stalls = 0
+        self.lags.clear()
+
+monitor = LoopMonitor()
@@ -10,6 +10,9 @@ import time
 from typing import Optional, Dict, List, Tuple
 import functools
 import traceback
+import logging
+
+logger = logging.getLogger("lvl")
 
 # Store reference to the client
 _client = None
@@ -23,12 +26,11 @@ def log_command(func):
     @functools.wraps(func)
     async def wrapper(interaction: discord.Interaction, *args, **kwargs):
         try:
-            print(f"Executing leveling command: {func.__name__}")
-            print(f"Command called by: {interaction.user.name}")
+            logger.debug("Executing leveling command: %s", func.__name__)
+            logger.debug("Command called by: %s", interaction.user.name)
             return await func(interaction, *args, **kwargs)
         except Exception as e:
-            print(f"Error in {func.__name__}:")
-            print(traceback.format_exc())
+            logger.exception("Error in %s", func.__name__)
             if not interaction.response.is_done():
                 import language
                 user_lang = language.get_server_language(interaction.guild_id)
@@ -72,19 +74,19 @@ class VoiceTracker:
         """Start periodic voice XP updates"""
         if self.periodic_update_task is None:
             self.periodic_update_task = asyncio.create_task(self._periodic_voice_xp_update())
-            print("🔄 Started periodic voice XP updates")
+            logger.info("🔄 Started periodic voice XP updates")
         
     def stop_periodic_updates(self):
         """Stop periodic voice XP updates"""
         if self.periodic_update_task:
             self.periodic_update_task.cancel()
             self.periodic_update_task = None
-            print("🛑 Stopped periodic voice XP updates")
+            logger.info("🛑 Stopped periodic voice XP updates")
         
     def user_joined_voice(self, guild_id: int, user_id: int, channel: discord.VoiceChannel):
         """Track when a user joins a voice channel"""
-        print(f"🎙️ VOICE JOIN: User {user_id} joined {channel.name} in guild {guild_id}")
-        print(f"   Channel members: {len(channel.members)} total")
+        logger.debug("🎙️ VOICE JOIN: User %s joined %s in guild %s", user_id, channel.name, guild_id)
+        logger.debug("   Channel members: %s total", len(channel.members))
         
         if guild_id not in self.voice_sessions:
             self.voice_sessions[guild_id] = {}
@@ -92,44 +94,44 @@ class VoiceTracker:
         # Get the member object to check conditions
         member = channel.guild.get_member(user_id)
         if not member:
-            print(f"   🚫 Could not find member {user_id} in guild {guild_id}")
+            logger.debug("   🚫 Could not find member %s in guild %s", user_id, guild_id)
             return
             
         # Check if user should get voice XP
         if should_get_voice_xp(member, channel):
             self.voice_sessions[guild_id][user_id] = datetime.utcnow()
             real_people = [m for m in channel.members if not m.bot]
-            print(f"   ✅ Voice tracking started for user {user_id} - {len(real_people)} real people in channel")
+            logger.debug("   ✅ Voice tracking started for user %s - %s real people in channel", user_id, len(real_people))
             
             # Start periodic updates if not already running
             self.start_periodic_updates()
         else:
             # Check why they're not eligible
             if member.voice and member.voice.deaf:
-                print(f"   🚫 Not tracking voice for user {user_id} - user is deafened")
+                logger.debug("   🚫 Not tracking voice for user %s - user is deafened", user_id)
             else:
                 real_people = [m for m in channel.members if not m.bot]
-                print(f"   🚫 Not tracking voice for user {user_id} - only {len(real_people)} real people in channel (need 2+)")
+                logger.debug("   🚫 Not tracking voice for user %s - only %s real people in channel (need 2+)", user_id, len(real_people))
             
     def user_left_voice(self, guild_id: int, user_id: int) -> Optional[int]:
         """Calculate voice time when user leaves and award XP"""
-        print(f"🎙️ VOICE LEAVE: User {user_id} left voice in guild {guild_id}")
+        logger.debug("🎙️ VOICE LEAVE: User %s left voice in guild %s", user_id, guild_id)
         
         if guild_id in self.voice_sessions and user_id in self.voice_sessions[guild_id]:
             join_time = self.voice_sessions[guild_id][user_id]
             duration = (datetime.utcnow() - join_time).total_seconds() / 60  # minutes
             del self.voice_sessions[guild_id][user_id]
-            print(f"   Voice session duration: {duration:.1f} minutes")
+            logger.debug("   Voice session duration: %.1f minutes", duration)
             if duration >= 1:
                 minutes_to_award = int(duration)
-                print(f"   ✅ Awarding {minutes_to_award} minutes of voice time")
+                logger.debug("   ✅ Awarding %s minutes of voice time", minutes_to_award)
                 return minutes_to_award
             else:
-                print(f"   ⚠️ Session too short ({duration:.1f} min), not awarding XP")
+                logger.debug("   ⚠️ Session too short (%.1f min), not awarding XP", duration)
                 return None
         else:
-            print(f"   🚫 User {user_id} was not being tracked in guild {guild_id}")
-            print(f"   Current sessions: {list(self.voice_sessions.get(guild_id, {}).keys())}")
+            logger.debug("   🚫 User %s was not being tracked in guild %s", user_id, guild_id)
+            logger.debug("   Current sessions: %s", self.voice_sessions.get(guild_id, {}).keys())
             return None
         
     def user_moved_voice(self, guild_id: int, user_id: int, old_channel: Optional[discord.VoiceChannel], new_channel: Optional[discord.VoiceChannel]):
@@ -188,44 +190,44 @@ class VoiceTracker:
                 for guild_id, user_id in users_to_remove:
                     if guild_id in self.voice_sessions and user_id in self.voice_sessions[guild_id]:
                         del self.voice_sessions[guild_id][user_id]
-                        print(f"🔄 Removed user {user_id} from voice tracking - no longer eligible")
+                        logger.debug("🔄 Removed user %s from voice tracking - no longer eligible", user_id)
                 
                 # Award XP to all users
                 for guild_id, user_id, minutes in users_to_award:
                     try:
                         await self._award_voice_xp(guild_id, user_id, minutes)
                     except Exception as e:
-                        print(f"❌ Error in periodic voice XP update for user {user_id}: {e}")
+                        logger.error("❌ Error in periodic voice XP update for user %s: %s", user_id, e)
                         
             except asyncio.CancelledError:
-                print("🛑 Periodic voice XP update task cancelled")
+                logger.debug("🛑 Periodic voice XP update task cancelled")
                 break
             except Exception as e:
-                print(f"❌ Error in periodic voice XP update: {e}")
+                logger.error("❌ Error in periodic voice XP update: %s", e)
                 await asyncio.sleep(60)  # Wait before retrying
             
     async def _award_voice_xp(self, guild_id: int, user_id: int, minutes: int):
         """Award voice XP for time spent in voice"""
-        print(f"🎙️ VOICE XP: Attempting to award {minutes} minutes to user {user_id} in guild {guild_id}")
+        logger.debug("🎙️ VOICE XP: Attempting to award %s minutes to user %s in guild %s", minutes, user_id, guild_id)
         
         session = get_session(str(guild_id))
         try:
             # Get settings
             settings = session.query(LevelSettings).filter_by(guild_id=str(guild_id)).first()
             if not settings:
-                print(f"   Creating new settings for guild {guild_id}")
+                logger.debug("   Creating new settings for guild %s", guild_id)
                 settings = LevelSettings(guild_id=str(guild_id))
                 session.add(settings)
                 session.flush()
                 
             if not settings.voice_xp_enabled:  # type: ignore
-                print(f"   Voice XP disabled for guild {guild_id}")
+                logger.debug("   Voice XP disabled for guild %s", guild_id)
                 return
                 
             # Calculate XP
             base_xp = minutes * settings.voice_xp_rate  # type: ignore
             xp_to_award = int(base_xp * settings.multiplier)  # type: ignore
-            print(f"   Voice XP calculation: {minutes} min * {settings.voice_xp_rate} rate * {settings.multiplier} multiplier = {xp_to_award} XP")
+            logger.debug("   Voice XP calculation: %s min * %s rate * %s multiplier = %s XP", minutes, settings.voice_xp_rate, settings.multiplier, xp_to_award)
             
             # Get or create user level
             user_level = session.query(UserLevel).filter_by(
@@ -234,7 +236,7 @@ class VoiceTracker:
             ).first()
             
             if not user_level:
-                print(f"   Creating new user level record for user {user_id}")
+                logger.debug("   Creating new user level record for user %s", user_id)
                 user_level = UserLevel(
                     user_id=str(user_id),
                     guild_id=str(guild_id),
@@ -258,23 +260,22 @@ class VoiceTracker:
             user_level.last_voice_update = datetime.utcnow()  # type: ignore
             user_level.voice_level = calculate_level(old_xp + xp_to_award)  # type: ignore
             
-            print(f"   Voice XP updated: {old_xp} -> {user_level.voice_xp}")
-            print(f"   Voice time updated: {old_voice_time} -> {user_level.total_voice_time} minutes")
-            print(f"   Voice level updated: {old_level} -> {user_level.voice_level}")
+            logger.debug("   Voice XP updated: %s -> %s", old_xp, user_level.voice_xp)
+            logger.debug("   Voice time updated: %s -> %s minutes", old_voice_time, user_level.total_voice_time)
+            logger.debug("   Voice level updated: %s -> %s", old_level, user_level.voice_level)
             
             session.commit()
             
             # Check for level up
             new_level = calculate_level(old_xp + xp_to_award)
             if new_level > old_level:
-                print(f"   🎉 Voice level up! {old_level} -> {new_level}")
+                logger.debug("   🎉 Voice level up! %s -> %s", old_level, new_level)
                 await self._handle_level_up(guild_id, user_id, old_level, new_level, "voice")
                 
-            print(f"   ✅ Successfully awarded {xp_to_award} voice XP to user {user_id}")
+            logger.debug("   ✅ Successfully awarded %s voice XP to user %s", xp_to_award, user_id)
             
         except Exception as e:
-            print(f"❌ Error awarding voice XP: {e}")
-            print(f"   Full error: {traceback.format_exc()}")
+            logger.exception("❌ Error awarding voice XP: %s", e)
             session.rollback()
         finally:
             session.close()
@@ -334,7 +335,7 @@ class VoiceTracker:
                         role = guild.get_role(int(reward.role_id))
                         if role and role not in user.roles:
                             await user.add_roles(role, reason=f"Level reward: {xp_type} level {new_level}")
-                            print(f"🏆 Gave role {role.name} to {user.name} for reaching level {new_level}")
+                            logger.debug("🏆 Gave role %s to %s for reaching level %s", role.name, user.name, new_level)
                             
                             if reward.dm_user:
                                 try:
@@ -351,7 +352,7 @@ class VoiceTracker:
                 session.close()
                 
         except Exception as e:
-            print(f"Error handling level up: {e}")
+            logger.error("Error handling level up: %s", e)
 
 # Global voice tracker instance
 voice_tracker = VoiceTracker()
@@ -443,50 +444,50 @@ async def handle_message_xp(message: discord.Message):
     if message.author.bot or not message.guild:
         return
         
-    print(f"💬 MESSAGE XP: Processing message from {message.author.name} ({message.author.id}) in {message.guild.name}")
+    logger.debug("💬 MESSAGE XP: Processing message from %s (%s) in %s", message.author.name, message.author.id, message.guild.name)
     
     session = get_session(str(message.guild.id))
     try:
         # Check permissions and cooldown
-        print(f"   Step 1: Checking permissions and cooldown")
+        logger.debug("   Step 1: Checking permissions and cooldown")
         can_get_xp = await should_give_xp(message.author, message.channel)
         can_gain_now = await can_gain_text_xp(message.author.id, message.guild.id)
         
-        print(f"   Can get XP: {can_get_xp}")
-        print(f"   Can gain now (cooldown): {can_gain_now}")
+        logger.debug("   Can get XP: %s", can_get_xp)
+        logger.debug("   Can gain now (cooldown): %s", can_gain_now)
         
         if not can_get_xp or not can_gain_now:
-            print(f"   ❌ Cannot gain XP - permissions: {can_get_xp}, cooldown: {can_gain_now}")
+            logger.debug("   ❌ Cannot gain XP - permissions: %s, cooldown: %s", can_get_xp, can_gain_now)
             return
             
         # Get or create settings
-        print(f"   Step 2: Getting or creating settings")
+        logger.debug("   Step 2: Getting or creating settings")
         settings = session.query(LevelSettings).filter_by(guild_id=str(message.guild.id)).first()
         if not settings:
-            print(f"   Creating new settings for guild {message.guild.id}")
+            logger.debug("   Creating new settings for guild %s", message.guild.id)
             settings = LevelSettings(guild_id=str(message.guild.id))
             session.add(settings)
             session.flush()
             
         if not settings.text_xp_enabled:
-            print(f"   Text XP disabled for guild {message.guild.id}")
+            logger.debug("   Text XP disabled for guild %s", message.guild.id)
             return
             
         # Calculate XP to award
-        print(f"   Step 3: Calculating XP")
+        logger.debug("   Step 3: Calculating XP")
         base_xp = random.randint(settings.text_xp_min, settings.text_xp_max)
         xp_to_award = int(base_xp * settings.multiplier)
-        print(f"   Base XP: {base_xp}, Multiplier: {settings.multiplier}, Final XP: {xp_to_award}")
+        logger.debug("   Base XP: %s, Multiplier: %s, Final XP: %s", base_xp, settings.multiplier, xp_to_award)
         
         # Get or create user level
-        print(f"   Step 4: Getting or creating user level")
+        logger.debug("   Step 4: Getting or creating user level")
         user_level = session.query(UserLevel).filter_by(
             user_id=str(message.author.id),
             guild_id=str(message.guild.id)
         ).first()
         
         if not user_level:
-            print(f"   Creating new user level record for user {message.author.id}")
+            logger.debug("   Creating new user level record for user %s", message.author.id)
             user_level = UserLevel(
                 user_id=str(message.author.id),
                 guild_id=str(message.guild.id),
@@ -501,7 +502,7 @@ async def handle_message_xp(message: discord.Message):
             session.flush()
             
         # Award XP
-        print(f"   Step 5: Awarding XP")
+        logger.debug("   Step 5: Awarding XP")
         old_level = user_level.text_level
         old_xp = user_level.text_xp
         old_msg_count = user_level.total_messages
@@ -511,16 +512,16 @@ async def handle_message_xp(message: discord.Message):
         user_level.last_text_xp = datetime.utcnow()
         user_level.text_level = calculate_level(user_level.text_xp)
         
-        print(f"   Text XP updated: {old_xp} -> {user_level.text_xp}")
-        print(f"   Message count updated: {old_msg_count} -> {user_level.total_messages}")
-        print(f"   Text level updated: {old_level} -> {user_level.text_level}")
+        logger.debug("   Text XP updated: %s -> %s", old_xp, user_level.text_xp)
+        logger.debug("   Message count updated: %s -> %s", old_msg_count, user_level.total_messages)
+        logger.debug("   Text level updated: %s -> %s", old_level, user_level.text_level)
         
         session.commit()
-        print(f"   ✅ Database committed successfully")
+        logger.debug("   ✅ Database committed successfully")
         
         # Check for level up
         if user_level.text_level > old_level:
-            print(f"   🎉 Text level up! {old_level} -> {user_level.text_level}")
+            logger.debug("   🎉 Text level up! %s -> %s", old_level, user_level.text_level)
             # Store the channel for level up messages
             if not hasattr(_client, 'last_active_channel'):
                 _client.last_active_channel = {}
@@ -530,11 +531,10 @@ async def handle_message_xp(message: discord.Message):
                 message.guild.id, message.author.id, old_level, user_level.text_level, "text"
             )
             
-        print(f"   ✅ Successfully awarded {xp_to_award} text XP to {message.author.name}")
+        logger.debug("   ✅ Successfully awarded %s text XP to %s", xp_to_award, message.author.name)
         
     except Exception as e:
-        print(f"❌ Error in handle_message_xp: {e}")
-        print(f"   Full error: {traceback.format_exc()}")
+        logger.exception("❌ Error in handle_message_xp: %s", e)
         session.rollback()
     finally:
         session.close()
@@ -550,50 +550,49 @@ async def handle_voice_state_update(member: discord.Member, before: discord.Voic
     # Debug voice state change
     before_channel = before.channel.name if before.channel else "None"
     after_channel = after.channel.name if after.channel else "None"
-    print(f"🔄 VOICE STATE: {member.name} ({user_id}) in {member.guild.name}")
-    print(f"   Before: {before_channel}")
-    print(f"   After: {after_channel}")
+    logger.debug("🔄 VOICE STATE: %s (%s) in %s", member.name, user_id, member.guild.name)
+    logger.debug("   Before: %s", before_channel)
+    logger.debug("   After: %s", after_channel)
     
     try:
         # User left voice completely
         if before.channel and not after.channel:
-            print(f"   📤 User left voice completely")
+            logger.debug("   📤 User left voice completely")
             voice_time = voice_tracker.user_left_voice(guild_id, user_id)
             if voice_time:
                 await voice_tracker._award_voice_xp(guild_id, user_id, voice_time)
                 
         # User joined voice from being disconnected
         elif not before.channel and after.channel:
-            print(f"   📥 User joined voice from disconnected")
+            logger.debug("   📥 User joined voice from disconnected")
             voice_tracker.user_joined_voice(guild_id, user_id, after.channel)
             
         # User moved between channels
         elif before.channel and after.channel and before.channel != after.channel:
-            print(f"   🔄 User moved between channels")
+            logger.debug("   🔄 User moved between channels")
             voice_tracker.user_moved_voice(guild_id, user_id, before.channel, after.channel)
             
         # User stayed in same channel but something changed (mute, deafen, etc.)
         elif before.channel == after.channel and after.channel:
-            print(f"   ⚡ Same channel state change in {after.channel.name}")
+            logger.debug("   ⚡ Same channel state change in %s", after.channel.name)
             
             # Check if user should still get voice XP
             should_get_xp = should_get_voice_xp(member, after.channel)
             currently_tracked = user_id in voice_tracker.voice_sessions.get(guild_id, {})
             
             if should_get_xp and not currently_tracked:
-                print(f"   ✅ User now qualifies for voice XP, starting tracking")
+                logger.debug("   ✅ User now qualifies for voice XP, starting tracking")
                 voice_tracker.user_joined_voice(guild_id, user_id, after.channel)
             elif not should_get_xp and currently_tracked:
-                print(f"   🚫 User no longer qualifies for voice XP, stopping tracking")
+                logger.debug("   🚫 User no longer qualifies for voice XP, stopping tracking")
                 voice_time = voice_tracker.user_left_voice(guild_id, user_id)
                 if voice_time:
                     await voice_tracker._award_voice_xp(guild_id, user_id, voice_time)
             else:
-                print(f"   ➡️ No tracking change needed")
+                logger.debug("   ➡️ No tracking change needed")
                 
     except Exception as e:
-        print(f"❌ Error in voice state handling: {e}")
-        print(f"   Full error: {traceback.format_exc()}")
+        logger.exception("❌ Error in voice state handling: %s", e)
 
 # ============= COMMAND SETUP =============
 
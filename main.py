@@ -4,6 +4,8 @@ from discord.ext import commands
 import requests
 import os
 from dotenv import load_dotenv
+# Load .env before any local module import: database pulls in metrics, and several modules read settings when imported
+load_dotenv()
 from datetime import datetime, timedelta, timezone
 from dateutil import parser
 from database import Task, TaskCreator, get_session, TaskReminder, TimezoneSettings, MultidimensionalOptIn
@@ -12,6 +14,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from typing import Optional, Callable, Any
 import traceback
 import sys
+import io
 import functools
 from discord.app_commands import checks
 import sqlalchemy
@@ -20,13 +23,13 @@ import pathlib
 import utils
 import logging
 import logging.handlers
+import queue
+import atexit
 import platform
 import psutil
 import time
 import aiohttp
 from aiohttp import ClientConnectorError, ClientError
-import sqlite3
-from contextlib import contextmanager
 
 # Fix Unicode encoding issues on Windows
 if os.name == 'nt':  # Windows
@@ -38,25 +41,51 @@ if os.name == 'nt':  # Windows
 
 # Made by Charlie
 # Set up logging configuration
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+DEBUG_LOG_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def parse_log_level(value, default="INFO"):
+    """Parse LOG_LEVEL, falling back to the default with a warning when it is not a level name"""
+    level = (value or "").strip().upper()
+    if not level:
+        return default
+    if not isinstance(logging.getLevelName(level), int):
+        print(f"⚠️ Ignoring unknown LOG_LEVEL {value!r}, using {default}")
+        return default
+    return level
+
+def parse_log_levels(spec):
+    """Parse LOG_LEVELS ("discord=WARNING,lvl=INFO") into {logger name: level}"""
+    levels = {}
+    for entry in (spec or "").split(","):
+        name, _, level = entry.partition("=")
+        name, level = name.strip(), level.strip().upper()
+        if not name or not level:
+            continue
+        if not isinstance(logging.getLevelName(level), int):
+            print(f"⚠️ Ignoring unknown log level {level!r} for {name!r}")
+            continue
+        levels[name] = level
+    return levels
+
 def setup_logging():
-    """Configure detailed logging for the bot"""
+    """Configure logging for the bot.
+
+    Loggers put records on a queue; a QueueListener thread owns the console and
+    rotating file handlers, so no file I/O happens on the event loop. The calling
+    thread still merges the message arguments and renders tracebacks
+    (QueueHandler.prepare); the listener applies each handler's format and writes.
+    """
+    load_dotenv()
     # Create logs directory if it doesn't exist
     if not os.path.exists('logs'):
         os.makedirs('logs')
 
-    # Set up the root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-
     # Console handler with color formatting
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_format = logging.Formatter(
-        '%(asctime)s [%(levelname)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(console_format)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
 
     # File handler for detailed debug logs
     debug_handler = logging.handlers.RotatingFileHandler(
@@ -66,12 +95,7 @@ def setup_logging():
         backupCount=5,
     )
     debug_handler.setLevel(logging.DEBUG)
-    debug_format = logging.Formatter(
-        '%(asctime)s [%(levelname)s] %(name)s: %(message)s\nContext: %(pathname)s:%(lineno)d',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    debug_handler.setFormatter(debug_format)
-    root_logger.addHandler(debug_handler)
+    debug_handler.setFormatter(logging.Formatter(DEBUG_LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
 
     # Error handler for critical issues
     error_handler = logging.handlers.RotatingFileHandler(
@@ -84,61 +108,71 @@ def setup_logging():
     error_format = logging.Formatter(
         '%(asctime)s [%(levelname)s] %(name)s: %(message)s\n'
         'Path: %(pathname)s:%(lineno)d\n'
-        'Function: %(funcName)s\n'
-        'Exception:\n%(exc_info)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+        'Function: %(funcName)s',
+        datefmt=LOG_DATE_FORMAT
     )
     error_handler.setFormatter(error_format)
-    root_logger.addHandler(error_handler)
+
+    # The event loop builds each message and enqueues it; the handlers' formatting and writes happen on the listener thread
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, console_handler, debug_handler, error_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # Set up the root logger
+    root_logger = logging.getLogger()
+    root_logger.setLevel(parse_log_level(os.getenv('LOG_LEVEL')))
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    # Per-subsystem levels, e.g. LOG_LEVELS=discord=WARNING,lvl=INFO
+    for name, level in parse_log_levels(os.getenv('LOG_LEVELS')).items():
+        logging.getLogger(name).setLevel(level)
 
     return root_logger
 
 # Initialize logging
 logger = setup_logging()
 
-# Command logging system - Global database
-@contextmanager
-def get_command_db():
-    """Context manager for global command logging database"""
-    db_path = "data/commands_global.db"
-    os.makedirs("data", exist_ok=True)
-    
-    conn = sqlite3.connect(db_path)
-    try:
-        # Create table if it doesn't exist
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS command_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                command_name TEXT NOT NULL,
-                user_id TEXT NOT NULL,
-                channel_id TEXT NOT NULL,
-                guild_id TEXT NOT NULL,
-                guild_name TEXT,
-                timestamp TEXT NOT NULL,
-                success BOOLEAN NOT NULL DEFAULT 1
-            )
-        """)
-        
-        # Create index for better performance
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_guild_id ON command_logs(guild_id)
-        """)
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_timestamp ON command_logs(timestamp)
-        """)
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_command_name ON command_logs(command_name)
-        """)
-        
-        conn.commit()
-        yield conn
-    finally:
-        conn.close()
+# These read their settings from .env at import time
+import command_stats
+import dashboard_link
+import metrics
+import loop_monitor
+import profiler
+
+# Metrics served at /metrics (see metrics.py)
+COMMAND_SECONDS = metrics.histogram(
+    "puddlesbot_command_seconds", "Slash command latency from the interaction check to completion", ["command", "status"]
+)
+ON_MESSAGE_SECONDS = metrics.histogram(
+    "puddlesbot_on_message_stage_seconds", "Time spent in each on_message handler", ["stage"]
+)
+LAVALINK_REQUEST_SECONDS = metrics.histogram(
+    "puddlesbot_lavalink_request_seconds", "Lavalink REST latency", ["method", "endpoint", "status"]
+)
+BOT_HEALTH = metrics.gauge("puddlesbot_health", "Counters from the bot's health monitoring", ["stat"])
+BOT_LATENCY = metrics.gauge("puddlesbot_gateway_latency_seconds", "Discord gateway heartbeat latency")
+BOT_GUILDS = metrics.gauge("puddlesbot_guilds", "Guilds the bot is in")
+
+def observe_command(interaction, command_name, status):
+    """Record how long a slash command took, from interaction_check to completion or error"""
+    started_at = interaction.extras.get('command_started_at')
+    if started_at is not None:
+        COMMAND_SECONDS.labels(command=command_name, status=status).observe(time.perf_counter() - started_at)
+
+def observe_lavalink_request(method, endpoint, status, seconds):
+    LAVALINK_REQUEST_SECONDS.labels(method=method, endpoint=endpoint, status=status).observe(seconds)
+
+# Command logging system - Global database with hourly rollups (see command_stats.py)
+get_command_db = command_stats.connect
 
 def log_command(command_name, user_id, channel_id, guild_id, success=True):
     """Log a command execution to global database"""
     try:
-        print(f"🔍 LOG_COMMAND CALLED: {command_name} from guild {guild_id}")
+        logger.debug("🔍 LOG_COMMAND CALLED: %s from guild %s", command_name, guild_id)
         
         # Get guild name for better display
         guild_name = None
@@ -148,46 +182,39 @@ def log_command(command_name, user_id, channel_id, guild_id, success=True):
                 guild = log_command._bot_instance.get_guild(int(guild_id)) if guild_id else None
                 if guild:
                     guild_name = guild.name
-                    print(f"🔍 GUILD NAME FOUND: {guild_name}")
+                    logger.debug("🔍 GUILD NAME FOUND: %s", guild_name)
         except Exception as e:
-            print(f"⚠️ GUILD NAME ERROR: {e}")
+            logger.debug("⚠️ GUILD NAME ERROR: %s", e)
         
         with get_command_db() as conn:
-            conn.execute("""
-                INSERT INTO command_logs (command_name, user_id, channel_id, guild_id, guild_name, timestamp, success)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (command_name, str(user_id), str(channel_id), str(guild_id), guild_name,
-                  datetime.utcnow().isoformat(), success))
-            conn.commit()
-            print(f"✅ COMMAND INSERTED INTO DATABASE: {command_name}")
+            command_stats.record_command(conn, command_name, user_id, channel_id, guild_id, guild_name, success)
+            logger.debug("✅ COMMAND INSERTED INTO DATABASE: %s", command_name)
+        if command_stats.prune_due():
+            start_command_log_prune()
         
-        # Ping the web UI to update the dashboard
-        ping_web_ui()
-        print(f"📡 PING SENT TO WEB UI")
+        # Push the command to the live dashboard
+        dashboard_link.send_event("command", command=command_name, guild_id=str(guild_id), guild_name=guild_name)
+        logger.debug("📡 COMMAND SENT TO WEB UI")
         
     except Exception as e:
-        logger.error(f"Failed to log command {command_name}: {e}")
-        print(f"❌ LOG_COMMAND ERROR: {e}")
+        logger.error("Failed to log command %s: %s", command_name, e)
+
+def start_command_log_prune():
+    """Run a command log retention pass on an executor thread, off the event loop"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        command_stats.prune_database()
+        return
+    loop.run_in_executor(None, command_stats.prune_database)
 
 def set_bot_instance_for_logging(bot_instance):
     """Set bot instance for guild name lookup in logging"""
     log_command._bot_instance = bot_instance
 
 def ping_web_ui():
-    """Send a ping to the web UI to update the dashboard"""
-    try:
-        # Method 1: Try HTTP request
-        import requests
-        requests.post('http://localhost:42069/api/refresh', timeout=1)
-    except Exception:
-        try:
-            # Method 2: Create a ping file that web UI can monitor
-            ping_file = 'data/dashboard_ping.txt'
-            with open(ping_file, 'w') as f:
-                f.write(str(time.time()))
-        except Exception:
-            # Silently fail if both methods fail
-            pass
+    """Ask the web UI to reload its statistics from the database"""
+    dashboard_link.send_event("refresh")
 
 async def log_interaction_command(interaction):
     """Log a slash command interaction"""
@@ -457,6 +484,7 @@ class VocardTranslator(discord.app_commands.Translator):
 
 class CommandCheck(discord.app_commands.CommandTree):
     async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        interaction.extras['command_started_at'] = time.perf_counter()
         if not interaction.guild:
             await interaction.response.send_message("This command can only be used in guilds!")
             return False
@@ -499,6 +527,7 @@ class CommandCheck(discord.app_commands.CommandTree):
         try:
             # Log failed command
             if interaction.command:
+                observe_command(interaction, interaction.command.name, "error")
                 log_command(
                     command_name=interaction.command.name,
                     user_id=interaction.user.id,
@@ -562,6 +591,13 @@ class PuddlesBot(commands.Bot):
             'uptime_start': time.time()
         }
         
+        # Expose the health counters and connection state as metrics
+        for stat in ('disconnects', 'reconnects', 'high_latency_count', 'commands_processed', 'errors_encountered'):
+            BOT_HEALTH.labels(stat=stat).set_function(lambda stat=stat: self.health_stats[stat])
+        BOT_LATENCY.set_function(lambda: self.latency)
+        BOT_GUILDS.set_function(lambda: len(self.guilds))
+        self.metrics_runner = None
+        
         logger.info("PuddlesBot initialized with enhanced monitoring")
         
         self.ipc = None  # Will be initialized in setup_hook if enabled
@@ -826,6 +862,19 @@ class PuddlesBot(commands.Bot):
             # Add persistent view for special features
             self.add_view(SpecialFeaturesView())
             
+            # Start the Prometheus metrics exporter
+            metrics_host, metrics_port = metrics.server_address()
+            if metrics_port:
+                try:
+                    self.metrics_runner = await metrics.start_server(metrics_host, metrics_port)
+                except OSError as e:
+                    logger.warning(f"Metrics exporter not started on port {metrics_port}: {e}")
+            if voicelink and observe_lavalink_request not in voicelink.pool.REST_OBSERVERS:
+                voicelink.pool.REST_OBSERVERS.append(observe_lavalink_request)
+            
+            # Watch for sync work blocking the event loop (see /looplag)
+            loop_monitor.monitor.start()
+            
             # Initialize database session
             logger.debug("Initializing database...")
             session = get_session('global')
@@ -967,6 +1016,10 @@ class PuddlesBot(commands.Bot):
             self.scheduler.add_job(self.log_health_stats, 'interval', minutes=15)
             self.scheduler.add_job(lambda: cache_guild_info(self), 'interval', minutes=5)
             
+            # Let the web dashboard know the bot is alive
+            dashboard_link.write_pid_file()
+            self.scheduler.add_job(lambda: dashboard_link.heartbeat(self), 'interval', seconds=dashboard_link.HEARTBEAT_INTERVAL)
+            
             # SIMPLE COMMAND REGISTRATION - Just ensure commands are registered
             try:
                 print("🔄 Starting simple command registration...")
@@ -1299,6 +1352,21 @@ class PuddlesBot(commands.Bot):
                 self.scheduler.shutdown(wait=False)
                 logger.info("Scheduler shutdown complete")
             
+            # Stop the event loop watchdog
+            loop_monitor.monitor.stop()
+            
+            # Stop the fun API prefetchers and close their HTTP session
+            await fun.close_http()
+            
+            # Stop the metrics exporter
+            if self.metrics_runner:
+                await self.metrics_runner.cleanup()
+                self.metrics_runner = None
+            
+            # Tell the web dashboard the bot is gone
+            dashboard_link.remove_pid_file()
+            dashboard_link.send_event("heartbeat", status={'running': False})
+            
             # Clean up music nodes
             if hasattr(self, 'node_pool') and self.node_pool:
                 logger.info("Cleaning up music nodes...")
@@ -1798,32 +1866,44 @@ class PuddlesBot(commands.Bot):
         else:
             print("ℹ️ No messages were refreshed")
 
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        """Record command latency for the metrics exporter"""
+        self.health_stats['commands_processed'] += 1
+        observe_command(interaction, command.name, "ok")
+
     async def on_message(self, message: discord.Message):
         """Handle messages - includes Vocard music request channel logic"""
+        # Let music controllers know about every new message, including the bot's own
+        if music_func:
+            music_func.record_message(message)
+
         # Ignore messages from bots or DMs
         if message.author.bot or not message.guild:
             return
             
         # Handle AI chat bot mentions first
         try:
-            handled = await puddleai.handle_bot_mention(message, self)
+            with ON_MESSAGE_SECONDS.labels(stage="ai").time():
+                handled = await puddleai.handle_bot_mention(message, self)
             if handled:
                 return  # Don't process further if it was an AI response
         except Exception as e:
-            print(f"Error in AI chat message handling: {e}")
+            logger.exception("Error in AI chat message handling: %s", e)
             
         # Handle OpenChat messages
         try:
-            handled = await openchat.handle_openchat_message(message)
+            with ON_MESSAGE_SECONDS.labels(stage="openchat").time():
+                handled = await openchat.handle_openchat_message(message)
             if handled:
                 return  # Don't process further if it was an OpenChat message
         except Exception as e:
-            print(f"Error in OpenChat message handling: {e}")
+            logger.exception("Error in OpenChat message handling: %s", e)
         
         # Check for music request channel (Vocard functionality)
         if music_func and hasattr(music_func, 'settings'):
             try:
-                settings = await music_func.get_settings(message.guild.id)
+                with ON_MESSAGE_SECONDS.labels(stage="music_settings").time():
+                    settings = await music_func.get_settings(message.guild.id)
                 if settings and (request_channel := settings.get("music_request_channel")):
                     if message.channel.id == request_channel.get("text_channel_id"):
                         ctx = await self.get_context(message)
@@ -1838,24 +1918,26 @@ class PuddlesBot(commands.Bot):
                         except Exception as e:
                             await music_func.send(ctx, str(e), ephemeral=True)
                         finally:
+                            music_func.forget_message(message.channel.id, message.id)
                             return await message.delete()
             except Exception as e:
-                print(f"Error in music request channel handling: {e}")
+                logger.exception("Error in music request channel handling: %s", e)
         
         # Handle intmsg conversation messages
         try:
-            handled = await intmsg.handle_intmsg_message(message)
+            with ON_MESSAGE_SECONDS.labels(stage="intmsg").time():
+                handled = await intmsg.handle_intmsg_message(message)
             if handled:
                 return  # Don't process as command if handled by intmsg
         except Exception as e:
-            print(f"Error in intmsg message handling: {e}")
-            print(traceback.format_exc())
+            logger.exception("Error in intmsg message handling: %s", e)
         
         # Handle leveling XP from messages
         try:
-            await lvl.handle_message_xp(message)
+            with ON_MESSAGE_SECONDS.labels(stage="leveling").time():
+                await lvl.handle_message_xp(message)
         except Exception as e:
-            print(f"Error in leveling message handling: {e}")
+            logger.exception("Error in leveling message handling: %s", e)
         
         # Remove command processing since we're using slash commands
         # await self.process_commands(message)
@@ -1964,6 +2046,130 @@ def setup_owner_commands(tree: app_commands.CommandTree):
             await interaction.followup.send(f"❌ Failed to sync commands: {str(e)}", ephemeral=True)
             print(f"❌ Manual command sync failed: {e}")
     
+    @tree.command(
+        name="aistatus",
+        description="Show AI model residency and optionally unload it (owner only)"
+    )
+    @app_commands.describe(unload="If 'true', unloads the AI model now to free memory")
+    async def aistatus(interaction: discord.Interaction, unload: bool = False):
+        """Show whether the AI model is resident in memory"""
+        owner_id = int(os.getenv('BOT_OWNER_ID', '0'))
+        if interaction.user.id != owner_id:
+            await interaction.response.send_message("❌ This command is only for the bot owner.", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        unloaded = False
+        if unload:
+            loop = asyncio.get_running_loop()
+            unloaded = await loop.run_in_executor(None, puddleai.unload_model, f"requested by {interaction.user}")
+        
+        residency = puddleai.get_model_residency()
+        embed = discord.Embed(title="🧠 AI Model Status", description=puddleai.get_model_status(), color=discord.Color.blue())
+        embed.add_field(name="Resident", value="Yes" if residency['resident'] else "No", inline=True)
+        embed.add_field(name="Loads / Unloads", value=f"{residency['loads']} / {residency['unloads']}", inline=True)
+        if residency['size_gb'] is not None:
+            embed.add_field(name="Model File", value=f"{os.path.basename(residency['model_path'])} ({residency['size_gb']:.2f}GB)", inline=False)
+        embed.add_field(name="Memory Mapping", value=f"mmap: {residency['use_mmap']}, mlock: {residency['use_mlock']}", inline=True)
+        idle_unload = residency['idle_unload_seconds']
+        embed.add_field(name="Idle Unload", value=f"after {idle_unload / 60:.0f}m" if idle_unload > 0 else "disabled", inline=True)
+        cache = puddleai.response_cache
+        embed.add_field(name="Response Cache", value=f"{cache.size} replies, {cache.hit_rate:.0%} hit rate", inline=True)
+        if unload:
+            embed.set_footer(text="Model unloaded" if unloaded else "No model was resident")
+        
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    
+    @tree.command(
+        name="profile",
+        description="Sample the bot's CPU usage for a few seconds and get a flamegraph file (owner only)"
+    )
+    @app_commands.describe(
+        seconds="How long to sample (1-60 seconds)",
+        include_idle="If 'true', also include threads that are only waiting"
+    )
+    async def profile(interaction: discord.Interaction, seconds: app_commands.Range[int, 1, 60] = 10, include_idle: bool = False):
+        """Run the sampling profiler in the live process and return collapsed stacks"""
+        owner_id = int(os.getenv('BOT_OWNER_ID', '0'))
+        if interaction.user.id != owner_id:
+            await interaction.response.send_message("❌ This command is only for the bot owner.", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, profiler.profile, seconds, profiler.DEFAULT_INTERVAL, include_idle)
+        if result is None:
+            await interaction.followup.send("⚠️ A profile is already running, try again when it finishes.", ephemeral=True)
+            return
+        if not result.stacks:
+            await interaction.followup.send(f"💤 No busy threads in {result.samples} samples - the bot was idle.", ephemeral=True)
+            return
+        
+        total = sum(result.stacks.values())
+        embed = discord.Embed(
+            title="🔥 CPU Profile",
+            description=f"{result.samples} samples over {result.duration:.1f}s every {result.interval * 1000:.0f}ms "
+                        f"(sampler busy {result.overhead:.1%} of the time)",
+            color=discord.Color.orange()
+        )
+        embed.add_field(
+            name="Hottest Functions (self time)",
+            value="\n".join(f"`{count / total:6.1%}` {label}" for label, count in result.top_functions(10))[:1024],
+            inline=False
+        )
+        embed.add_field(
+            name="Hottest Files",
+            value="\n".join(f"`{count / total:6.1%}` {label}" for label, count in result.top_modules(5))[:1024],
+            inline=False
+        )
+        embed.set_footer(text="Open the file in speedscope.app or run it through flamegraph.pl")
+        
+        filename = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded"
+        data = io.BytesIO(result.collapsed().encode('utf-8'))
+        await interaction.followup.send(embed=embed, file=discord.File(data, filename=filename), ephemeral=True)
+    
+    @tree.command(
+        name="looplag",
+        description="Show event loop lag and what blocked the loop (owner only)"
+    )
+    @app_commands.describe(reset="If 'true', clears the recorded offenders after showing them")
+    async def looplag(interaction: discord.Interaction, reset: bool = False):
+        """Show event loop lag percentiles and the worst blocking hotspots"""
+        owner_id = int(os.getenv('BOT_OWNER_ID', '0'))
+        if interaction.user.id != owner_id:
+            await interaction.response.send_message("❌ This command is only for the bot owner.", ephemeral=True)
+            return
+        
+        monitor = loop_monitor.monitor
+        if not monitor.running:
+            await interaction.response.send_message("⚠️ The event loop watchdog is not running (`LOOP_LAG_THRESHOLD_MS=0`?).", ephemeral=True)
+            return
+        
+        lag = monitor.lag_summary()
+        embed = discord.Embed(
+            title="⏱️ Event Loop Lag",
+            description=f"p50 {lag['p50']:.1f}ms · p99 {lag['p99']:.1f}ms · max {lag['max']:.0f}ms over the last {lag['samples']} ticks\n"
+                        f"{monitor.stalls} stalls over {monitor.threshold * 1000:.0f}ms since the last reset",
+            color=discord.Color.blue()
+        )
+        for offender in monitor.top_offenders(5):
+            # The last few frames of the worst stall are usually enough to spot the sync call
+            stack = "\n".join(offender.stack.rstrip().splitlines()[-6:])
+            embed.add_field(
+                name=f"{offender.hotspot} ({offender.count}x, {offender.total * 1000:.0f}ms total, worst {offender.worst * 1000:.0f}ms)"[:256],
+                value=f"```{stack[-1000:]}```",
+                inline=False
+            )
+        if not monitor.offenders:
+            embed.add_field(name="No stalls", value="Nothing has blocked the loop past the threshold.", inline=False)
+        embed.set_footer(text=f"Full stacks: {loop_monitor.REPORT_PATH}" + (" · offenders cleared" if reset else ""))
+        if reset:
+            monitor.reset()
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @tree.command(
         name="multidimensionaltravel",
         description="Get invites to opted-in servers (owner-only execution, public visibility)."
@@ -2342,6 +2548,9 @@ if __name__ == "__main__":
             logger.info("   4. Consider running as administrator")
             logger.info("")
         
+        # Backfill the command statistics rollups of an older database before the event loop starts
+        command_stats.migrate()
+
         # Run bot with reconnection
         asyncio.run(run_bot_with_reconnection())
         
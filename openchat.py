@@ -9,6 +9,9 @@ import disable
 import sqlalchemy
 import asyncio
 import io
+import logging
+
+logger = logging.getLogger("openchat")
 
 # Store reference to the client
 _client = None
@@ -65,9 +68,9 @@ def setup_openchat_system(client):
                 
                 for setting in enabled_settings:
                     active_channels[setting.guild_id] = setting.channel_id
-                print(f"✅ Loaded {len(enabled_settings)} active OpenChat channels")
+                logger.info("✅ Loaded %s active OpenChat channels", len(enabled_settings))
         except Exception as e:
-            print(f"❌ Error loading OpenChat channels: {e}")
+            logger.error("❌ Error loading OpenChat channels: %s", e)
 
     # Schedule the loading of active channels
     asyncio.create_task(load_active_channels())
@@ -76,12 +79,11 @@ def log_command(func):
     @functools.wraps(func)
     async def wrapper(interaction: discord.Interaction, *args, **kwargs):
         try:
-            print(f"Executing OpenChat command: {func.__name__}")
-            print(f"Command called by: {interaction.user.name}")
+            logger.debug("Executing OpenChat command: %s", func.__name__)
+            logger.debug("Command called by: %s", interaction.user.name)
             return await func(interaction, *args, **kwargs)
         except Exception as e:
-            print(f"Error in {func.__name__}:")
-            print(traceback.format_exc())
+            logger.exception("Error in %s", func.__name__)
             if not interaction.response.is_done():
                 import language
                 user_lang = language.get_server_language(interaction.guild_id)
@@ -171,7 +173,7 @@ async def handle_openchat_message(message: discord.Message):
                     try:
                         channel = await _client.fetch_channel(int(channel_id))
                     except discord.NotFound:
-                        print(f"Channel {channel_id} not found, removing from active channels")
+                        logger.warning("Channel %s not found, removing from active channels", channel_id)
                         active_channels.pop(guild_id, None)
                         async with get_async_session() as session:
                             settings = await session.get(OpenChatSettings, guild_id)
@@ -180,7 +182,7 @@ async def handle_openchat_message(message: discord.Message):
                                 await session.commit()
                         continue
                     except Exception as e:
-                        print(f"Error fetching channel {channel_id}: {e}")
+                        logger.error("Error fetching channel %s: %s", channel_id, e)
                         continue
 
                 if channel:
@@ -188,27 +190,25 @@ async def handle_openchat_message(message: discord.Message):
                         await channel.send(embed=embed, view=view)
                         sent_to.append(channel.guild.name)
                     except discord.Forbidden:
-                        print(f"No permission to send messages in channel {channel_id}")
+                        logger.warning("No permission to send messages in channel %s", channel_id)
                         continue
                     except Exception as e:
-                        print(f"Error sending message to channel {channel_id}: {e}")
+                        logger.error("Error sending message to channel %s: %s", channel_id, e)
                         continue
 
             except Exception as e:
-                print(f"Error handling channel {channel_id} in guild {guild_id}: {e}")
-                traceback.print_exc()
+                logger.exception("Error handling channel %s in guild %s: %s", channel_id, guild_id, e)
                 # Don't remove the channel here - only remove if we explicitly know it's invalid
 
         if sent_to:
-            print(f"✅ OpenChat message forwarded to: {', '.join(sent_to)}")
+            logger.debug("✅ OpenChat message forwarded to: %s", ', '.join(sent_to))
             return True
         else:
-            print("❌ No active OpenChat channels to forward to")
+            logger.debug("❌ No active OpenChat channels to forward to")
             return False
 
     except Exception as e:
-        print(f"Error in OpenChat message handling: {e}")
-        traceback.print_exc()
+        logger.exception("Error in OpenChat message handling: %s", e)
         return False
 
 def setup_openchat_commands(tree):
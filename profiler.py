@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Sampling profiler for the running bot.
+
+A thread wakes every `interval` seconds, reads the current stack of every other
+thread with sys._current_frames() and counts each stack. Nothing is installed in
+the profiled code (no sys.setprofile), so it runs on any platform and the bot
+only pays for the sampler holding the GIL while it walks the stacks. The result
+is written in the collapsed-stack format ("thread;outer;...;inner count" per line)
+that flamegraph.pl, speedscope.app and inferno read directly.
+
+Threads that are only waiting (the event loop in select(), idle executor workers,
+the log listener) are left out unless include_idle is set, so the flamegraph shows
+where the CPU went. A thread counts as waiting when it used almost no CPU since the
+previous sample (per-thread CPU clocks, where the platform has them) or when its
+innermost frame is a known blocking call.
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_INTERVAL = 0.005  # 200 samples per second
+MAX_SECONDS = 120
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Innermost frames of threads that are blocked rather than running
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("handlers.py", "dequeue"),  # logging QueueListener
+    ("socket.py", "accept"),
+    ("connection.py", "wait"),
+    ("thread.py", "_worker"),  # concurrent.futures worker waiting for work
+}
+
+IDLE_CPU_SHARE = 0.1  # Threads using less of the interval than this are waiting
+
+_labels: Dict[object, str] = {}
+
+def frame_label(code) -> str:
+    """'fun.py:quack' for the bot's own code, 'aiohttp/client.py:_request' for libraries"""
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(ROOT_DIR) and "site-packages" not in filename:
+            path = os.path.relpath(filename, ROOT_DIR)
+        elif "site-packages" in filename:
+            path = filename.split("site-packages", 1)[1].lstrip("/\\")
+        else:
+            path = os.path.basename(filename)
+        label = _labels[code] = f"{path.replace(os.sep, '/')}:{code.co_name}".replace(";", ":").replace(" ", "_")
+    return label
+
+def is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+def thread_cpu_time(ident: int) -> Optional[float]:
+    """CPU seconds a thread has used, or None where per-thread clocks aren't available (Windows)"""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError):
+        return None
+
+class ProfileResult:
+    """Collapsed stacks from one profiling run"""
+
+    def __init__(self, stacks: Counter, samples: int, duration: float, sampling_time: float, interval: float):
+        self.stacks = stacks
+        self.samples = samples  # Sampling passes, across all threads
+        self.duration = duration
+        self.sampling_time = sampling_time  # Time the sampler itself spent walking stacks
+        self.interval = interval
+
+    @property
+    def overhead(self) -> float:
+        """Share of wall time the sampler was busy (and holding the GIL)"""
+        return self.sampling_time / self.duration if self.duration else 0.0
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Functions by self time: how often they were the innermost frame"""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+    def top_modules(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Files by self time"""
+        modules = Counter()
+        for label, count in self.top_functions(limit=None):
+            modules[label.rsplit(":", 1)[0]] += count
+        return modules.most_common(limit)
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self._cpu_times: Dict[int, float] = {}
+
+    def _used_cpu(self, ident: int) -> bool:
+        cpu_time = thread_cpu_time(ident)
+        if cpu_time is None:
+            return True
+        previous = self._cpu_times.get(ident)
+        self._cpu_times[ident] = cpu_time
+        return previous is None or cpu_time - previous >= self.interval * IDLE_CPU_SHARE
+
+    def sample_once(self, stacks: Counter, exclude: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+            if not self.include_idle and (not self._used_cpu(ident) or is_idle(frame)):
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}").replace(";", ":").replace(" ", "_"))
+            stacks[";".join(reversed(labels))] += 1
+
+    def run(self, seconds: float, stop: Optional[threading.Event] = None) -> ProfileResult:
+        """Profile the process for `seconds` - blocks, so call it from a thread"""
+        seconds = min(max(seconds, 0.0), MAX_SECONDS)
+        stacks = Counter()
+        own_ident = threading.get_ident()
+        samples = 0
+        sampling_time = 0.0
+        started_at = time.perf_counter()
+        deadline = started_at + seconds
+        next_sample = started_at
+        while True:
+            now = time.perf_counter()
+            if now >= deadline or (stop is not None and stop.is_set()):
+                break
+            self.sample_once(stacks, own_ident)
+            samples += 1
+            sampling_time += time.perf_counter() - now
+            next_sample = max(next_sample + self.interval, time.perf_counter())
+            time.sleep(max(0.0, min(next_sample, deadline) - time.perf_counter()))
+        return ProfileResult(stacks, samples, time.perf_counter() - started_at, sampling_time, self.interval)
+
+_running = threading.Lock()
+
+def profile(seconds: float, interval: float = DEFAULT_INTERVAL, include_idle: bool = False) -> Optional[ProfileResult]:
+    """Profile the whole process; returns None if a profile is already running"""
+    if not _running.acquire(blocking=False):
+        return None
+    try:
+        return SamplingProfiler(interval, include_idle).run(seconds)
+    finally:
+        _running.release()
@@ -2,197 +2,748 @@ import discord
 from discord.ext import commands
 import asyncio
 import logging
-from typing import Optional
+from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
 import os
+import re
+import math
+import time
 import threading
+import gc
+import sys
+import json
+import subprocess
+import atexit
+import aiohttp
 from pathlib import Path
 import disable  # Add this to imports
+import metrics
 
 # Set up logging for AI Chat
 logger = logging.getLogger(__name__)
 
+# Generation timings for the /metrics exporter
+AI_QUEUE_SECONDS = metrics.histogram(
+    "puddlesbot_ai_queue_seconds", "Time a reply waited for the in-process model lock"
+)
+AI_INFERENCE_SECONDS = metrics.histogram(
+    "puddlesbot_ai_inference_seconds", "Time spent generating a reply", ["backend", "mode"]
+)
+AI_REQUESTS = metrics.counter(
+    "puddlesbot_ai_requests_total", "AI replies by how they were answered", ["source"]
+)
+
 # Global variables
 mistral_model = None
 model_lock = threading.Lock()
 model_loaded = False
 model_loading = False
+load_lock = threading.Lock()  # Serializes loads/unloads so concurrent mentions share one load
 
-def setup_ai_chat_system(bot: commands.Bot):
-    """Set up the AI Chat system using Mistral 7B"""
-    global mistral_model, model_loaded, model_loading
+# Lazy loading and residency (the model only occupies memory while it's being used)
+LAZY_LOAD = os.getenv('PUDDLEAI_LAZY_LOAD', 'true').lower() in ('true', '1', 'yes', 'on')
+USE_MMAP = os.getenv('PUDDLEAI_USE_MMAP', 'true').lower() in ('true', '1', 'yes', 'on')
+USE_MLOCK = os.getenv('PUDDLEAI_USE_MLOCK', 'false').lower() in ('true', '1', 'yes', 'on')
+IDLE_UNLOAD_SECONDS = float(os.getenv('PUDDLEAI_IDLE_UNLOAD', '1800'))  # 0 keeps the model loaded forever
+loaded_model_path = None
+last_used_at = 0.0  # time.monotonic() of the last request that needed the model
+load_count = 0
+unload_count = 0
+idle_thread = None
+
+# Prompt-prefix KV cache (set PUDDLEAI_PREFIX_CACHE=false to evaluate the full prompt every time)
+PREFIX_CACHE_ENABLED = os.getenv('PUDDLEAI_PREFIX_CACHE', 'true').lower() in ('true', '1', 'yes', 'on')
+prefix_state = None  # llama-cpp state saved right after evaluating SYSTEM_PROMPT_PREFIX
+
+# Response cache for repeated questions (per guild, exact match plus optional embedding similarity)
+RESPONSE_CACHE_ENABLED = os.getenv('PUDDLEAI_CACHE', 'true').lower() in ('true', '1', 'yes', 'on')
+RESPONSE_CACHE_SIZE = int(os.getenv('PUDDLEAI_CACHE_SIZE', '256'))  # Entries kept per guild
+RESPONSE_CACHE_TTL = float(os.getenv('PUDDLEAI_CACHE_TTL', '3600'))  # Seconds before a cached reply expires
+RESPONSE_CACHE_THRESHOLD = float(os.getenv('PUDDLEAI_CACHE_THRESHOLD', '0.92'))  # Cosine similarity needed for a hit
+EMBED_MODEL_PATH = os.getenv('PUDDLEAI_EMBED_MODEL', '')  # Optional small GGUF embedding model
+
+# Out-of-process inference (set PUDDLEAI_WORKER=true to run the model in puddleai_worker.py)
+WORKER_ENABLED = os.getenv('PUDDLEAI_WORKER', 'false').lower() in ('true', '1', 'yes', 'on')
+WORKER_URL = os.getenv('PUDDLEAI_WORKER_URL', '')  # Use an already running worker instead of starting one
+WORKER_SOCKET = os.getenv('PUDDLEAI_WORKER_SOCKET', '')  # Talk to the worker over a Unix socket instead of TCP
+WORKER_PORT = int(os.getenv('PUDDLEAI_WORKER_PORT', '5917'))
+WORKER_HEALTH_INTERVAL = 15.0  # Seconds between health checks
+WORKER_START_TIMEOUT = 600.0  # Seconds to wait for a fresh worker to load the model
+WORKER_MAX_FAILURES = 3  # Failed health checks in a row before the worker is restarted
+
+# Streaming configuration (set PUDDLEAI_STREAM=false to always wait for the full reply)
+STREAM_RESPONSES = os.getenv('PUDDLEAI_STREAM', 'true').lower() in ('true', '1', 'yes', 'on')
+STREAM_EDIT_INTERVAL = float(os.getenv('PUDDLEAI_STREAM_EDIT_INTERVAL', '1.5'))  # Seconds between message edits
+GENERATION_TIMEOUT = 60.0  # Seconds before a generation is abandoned
+MAX_MESSAGE_LENGTH = 1900
+
+# Sampling parameters shared by the blocking and streaming paths
+GENERATION_KWARGS = {
+    'max_tokens': 200,  # Reasonable for plain text
+    'temperature': 0.7,
+    'top_p': 0.9,
+    'top_k': 40,
+    'repeat_penalty': 1.1,
+    'stop': ["User:", "Puddles:", "\n\n", "[/INST]"]
+}
+
+# A sentence is complete once we see terminal punctuation followed by whitespace or the end
+SENTENCE_END_REGEX = re.compile(r'[.!?…](\s|$)')
+
+class ResponseCache:
+    """Bounded, per-guild cache of AI replies keyed by normalized message text.
     
-    logger.info("Setting up AI Chat system with Mistral 7B...")
+    Exact matches on the normalized text are checked first. If an embedding model is
+    configured (PUDDLEAI_EMBED_MODEL), a miss falls back to the most similar cached
+    message in the same guild whose cosine similarity reaches ``threshold``.
+    Entries expire after ``ttl`` seconds and each guild keeps at most ``max_entries``.
+    """
+    
+    # Stands in for the asker's display name so cached replies can be re-addressed
+    NAME_PLACEHOLDER = "\x00user\x00"
+    # Display names too short or too common to tell apart from the rest of a reply; those replies aren't cached
+    MIN_NAME_LENGTH = 3
+    COMMON_WORDS = {
+        "the", "and", "you", "your", "are", "for", "not", "but", "can", "all", "any", "one", "how", "what", "who",
+        "why", "yes", "hey", "hello", "help", "happy", "friend", "buddy", "there", "here", "good", "great", "nice",
+        "duck", "ducks", "quack", "pond", "puddle", "puddles", "water", "bread", "sorry", "thanks", "user", "bot",
+    }
+    
+    def __init__(self, max_entries: int, ttl: float, threshold: float, embed_model_path: str = "", enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._guilds: Dict[int, OrderedDict] = {}  # guild_id -> {normalized text: entry}
+        self._lock = threading.Lock()
+        self._embed_model_path = embed_model_path
+        self._embedder = None
+        self._embed_lock = threading.Lock()
+        self._embed_failed = not embed_model_path
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace so near-identical messages share a key"""
+        text = re.sub(r"['’]", '', text.lower())
+        return ' '.join(re.sub(r'[^\w\s]', ' ', text).split())
     
-    # Initialize the model in a separate thread to avoid blocking
-    def load_model():
-        global mistral_model, model_loaded, model_loading
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text with the optional local model (blocking - run in an executor)"""
+        if self._embed_failed:
+            return None
+        
+        with self._embed_lock:
+            try:
+                if self._embedder is None:
+                    from llama_cpp import Llama
+                    self._embedder = Llama(model_path=self._embed_model_path, embedding=True, n_ctx=512, n_threads=2, verbose=False)
+                    logger.info(f"🧭 Loaded embedding model for the response cache: {os.path.basename(self._embed_model_path)}")
+                
+                vector = self._embedder.embed(text)
+                # Some models return one vector per token - pool them into a single vector
+                if vector and isinstance(vector[0], list):
+                    vector = [sum(column) / len(vector) for column in zip(*vector)]
+                norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+                return [v / norm for v in vector]
+            except Exception as e:
+                logger.warning(f"Embedding lookups disabled for the response cache: {e}")
+                self._embed_failed = True
+                self._embedder = None
+                return None
+    
+    def _live_entries(self, guild_id: int) -> OrderedDict:
+        """Return the guild's entries with expired ones dropped (call with _lock held)"""
+        entries = self._guilds.setdefault(guild_id, OrderedDict())
+        now = time.monotonic()
+        for key in [key for key, entry in entries.items() if now - entry['created'] > self.ttl]:
+            del entries[key]
+        return entries
+    
+    @classmethod
+    def _name_pattern(cls, user_name: str) -> Optional["re.Pattern"]:
+        """Whole-word matcher for user_name, or None if the name can't be told apart from ordinary words"""
+        name = user_name.strip() if user_name else ""
+        if len(name) < cls.MIN_NAME_LENGTH or name.lower() in cls.COMMON_WORDS:
+            return None
+        return re.compile(rf"(?<!\w){re.escape(name)}(?!\w)")
+    
+    async def lookup(self, guild_id: int, message: str, user_name: str) -> Tuple[Optional[str], Optional[List[float]]]:
+        """Return a cached reply addressed to user_name (or None on a miss) and the message
+        embedding if one was computed, so store() doesn't embed the same text again"""
+        if not self.enabled:
+            return None, None
+        
+        key = self.normalize(message)
+        if not key:
+            return None, None
+        
+        with self._lock:
+            entries = self._live_entries(guild_id)
+            entry = entries.get(key)
+            has_embeddings = any(e['embedding'] for e in entries.values())
+        
+        similarity = 1.0
+        vector = None
+        if entry is None and has_embeddings and not self._embed_failed:
+            loop = asyncio.get_running_loop()
+            vector = await loop.run_in_executor(None, self._embed, key)
+            if vector:
+                with self._lock:
+                    candidates = [(k, e) for k, e in self._live_entries(guild_id).items() if e['embedding']]
+                best_key, best_score = None, 0.0
+                for candidate_key, candidate in candidates:
+                    score = sum(a * b for a, b in zip(vector, candidate['embedding']))
+                    if score > best_score:
+                        best_key, best_score = candidate_key, score
+                if best_key is not None and best_score >= self.threshold:
+                    key, similarity = best_key, best_score
+                    with self._lock:
+                        entry = self._guilds.get(guild_id, {}).get(key)
+        
+        if entry is None:
+            self.misses += 1
+            return None, vector
+        
+        with self._lock:
+            entries = self._guilds.get(guild_id)
+            if entries is not None and key in entries:
+                entries.move_to_end(key)
+        self.hits += 1
+        logger.info(f"💾 AI response cache hit for '{key[:50]}' (similarity {similarity:.2f}, hit rate {self.hit_rate:.0%})")
+        return entry['response'].replace(self.NAME_PLACEHOLDER, user_name), vector
+    
+    async def store(self, guild_id: int, message: str, user_name: str, response: str,
+                    embedding: Optional[List[float]] = None):
+        """Cache a model reply for this guild; pass the embedding lookup() returned to reuse it"""
+        if not self.enabled:
+            return
         
-        if model_loading:
+        key = self.normalize(message)
+        if not key or not response:
             return
         
-        model_loading = True
+        template = response
+        if user_name:
+            pattern = self._name_pattern(user_name)
+            if pattern is None:
+                if user_name.strip() and user_name.strip().lower() in response.lower():
+                    return  # Re-addressing this reply could rewrite ordinary words
+            else:
+                template = pattern.sub(self.NAME_PLACEHOLDER, response)
+        
+        if embedding is None and not self._embed_failed:
+            loop = asyncio.get_running_loop()
+            embedding = await loop.run_in_executor(None, self._embed, key)
         
+        with self._lock:
+            entries = self._live_entries(guild_id)
+            entries[key] = {'response': template, 'embedding': embedding, 'created': time.monotonic()}
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+    
+    def clear(self, guild_id: Optional[int] = None):
+        """Forget cached replies for one guild, or for every guild"""
+        with self._lock:
+            if guild_id is None:
+                self._guilds.clear()
+            else:
+                self._guilds.pop(guild_id, None)
+    
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._guilds.values())
+
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE_SIZE,
+    ttl=RESPONSE_CACHE_TTL,
+    threshold=RESPONSE_CACHE_THRESHOLD,
+    embed_model_path=EMBED_MODEL_PATH,
+    enabled=RESPONSE_CACHE_ENABLED
+)
+
+class InferenceWorkerClient:
+    """Client and supervisor for the out-of-process model in puddleai_worker.py.
+    
+    When no PUDDLEAI_WORKER_URL is given the bot starts the worker itself on first
+    demand, checks /health every WORKER_HEALTH_INTERVAL seconds, restarts it with
+    backoff if it crashes or stops answering, and stops it after PUDDLEAI_IDLE_UNLOAD
+    seconds without requests. While the worker isn't ready, ``ready`` is False and
+    callers fall back to the in-process model.
+    """
+    
+    def __init__(self, url: str = "", socket_path: str = "", port: int = 5917):
+        self.managed = not url
+        self.socket_path = socket_path if os.name != 'nt' else ""
+        self.base_url = url.rstrip('/') if url else ("http://localhost" if self.socket_path else f"http://127.0.0.1:{port}")
+        self.port = port
+        self.process = None
+        self.ready = False
+        self.failures = 0
+        self.restarts = 0
+        self.last_health = None
+        self.retry_at = 0.0  # time.monotonic() before which we won't try starting again
+        self._session = None
+        self._start_lock = None
+        self._supervisor = None
+        if self.managed:
+            atexit.register(self._terminate)  # Don't leave an orphaned worker behind
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.UnixConnector(path=self.socket_path) if self.socket_path else None
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def health(self) -> Optional[dict]:
+        """Return the worker's /health payload, or None if it isn't answering"""
         try:
-            # Step 1: Check system resources
-            logger.info("=== AI System Initialization Debug ===")
-            print("🔍 Initializing AI system with Mistral 7B...")
+            async with self.session.get(f"{self.base_url}/health", timeout=aiohttp.ClientTimeout(total=5)) as response:
+                if response.status != 200:
+                    return None
+                self.last_health = await response.json()
+                return self.last_health
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+            return None
+    
+    async def ensure_ready(self) -> bool:
+        """Start (or find) the worker and wait until its model is loaded"""
+        if self.ready:
+            return True
+        if time.monotonic() < self.retry_at:
+            return False
+        
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.ready:
+                return True
             
-            # Check memory
+            if self.managed and (self.process is None or self.process.poll() is not None):
+                if not await self._spawn():
+                    self.retry_at = time.monotonic() + 300
+                    return False
+            
+            self.ready = await self._wait_until_loaded()
+            if not self.ready:
+                logger.error("❌ AI worker did not become healthy - using the in-process model for now")
+                self.retry_at = time.monotonic() + 300
+                if self.managed:
+                    self._terminate()
+            else:
+                self.failures = 0
+                logger.info(f"✅ AI worker ready at {self.socket_path or self.base_url} (pid {self.last_health.get('pid')})")
+            
+            if self._supervisor is None or self._supervisor.done():
+                self._supervisor = asyncio.create_task(self._supervise())
+            return self.ready
+    
+    async def _spawn(self) -> bool:
+        """Start puddleai_worker.py against the same model file the bot would load"""
+        loop = asyncio.get_running_loop()
+        model_path = await loop.run_in_executor(None, download_mistral_model)
+        if not model_path:
+            logger.warning("No Mistral 7B model available for the AI worker")
+            return False
+        
+        command = [sys.executable, str(Path(__file__).resolve().parent / "puddleai_worker.py"), "--model", model_path]
+        command += ["--socket", self.socket_path] if self.socket_path else ["--port", str(self.port)]
+        if not USE_MMAP:
+            command.append("--no-mmap")
+        if USE_MLOCK:
+            command.append("--mlock")
+        
+        env = os.environ.copy()
+        env['PYTHONIOENCODING'] = 'utf-8'
+        try:
+            self.process = subprocess.Popen(command, env=env)
+        except Exception as e:
+            logger.error(f"❌ Could not start AI worker: {e}")
+            return False
+        
+        logger.info(f"🚀 Started AI worker (pid {self.process.pid}) for {os.path.basename(model_path)}")
+        print(f"🚀 Started AI worker process (pid {self.process.pid})")
+        return True
+    
+    async def _wait_until_loaded(self) -> bool:
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.managed and self.process is not None and self.process.poll() is not None:
+                logger.error(f"❌ AI worker exited during startup (code {self.process.returncode})")
+                return False
+            status = await self.health()
+            if status and status.get('status') == 'ok':
+                return True
+            await asyncio.sleep(1.0)
+        return False
+    
+    def _terminate(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+    
+    async def stop(self, reason: str = "manual"):
+        """Stop a worker we started ourselves; the next request starts it again"""
+        self.ready = False
+        if self.managed and self.process is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._terminate)
+            logger.info(f"💤 Stopped AI worker ({reason})")
+    
+    async def _supervise(self):
+        """Health-check the worker, restarting it if it dies or hangs"""
+        backoff = 5.0
+        while True:
+            await asyncio.sleep(WORKER_HEALTH_INTERVAL)
             try:
-                import psutil
-                memory = psutil.virtual_memory()
-                logger.info(f"💾 System Memory: {memory.total // (1024**3)}GB total, {memory.available // (1024**3)}GB available ({memory.percent}% used)")
-                print(f"💾 Memory: {memory.available // (1024**3)}GB available")
+                if self.managed and self.process is None:
+                    continue  # Stopped on purpose (idle), nothing to watch
                 
-                if memory.available < 4 * 1024**3:  # Less than 4GB
-                    logger.warning("⚠️ Low memory detected - Mistral 7B requires at least 4GB RAM")
-                    print("⚠️ Warning: Low available memory detected for Mistral 7B")
-            except Exception as mem_error:
-                logger.warning(f"Could not check memory: {mem_error}")
+                if self.managed and IDLE_UNLOAD_SECONDS > 0 and time.monotonic() - last_used_at >= IDLE_UNLOAD_SECONDS:
+                    await self.stop(f"idle for {(time.monotonic() - last_used_at) / 60:.0f} minutes")
+                    continue
+                
+                crashed = self.managed and self.process.poll() is not None
+                if not crashed and await self.health():
+                    self.failures = 0
+                    self.ready = True
+                    backoff = 5.0
+                    continue
+                
+                self.failures += 1
+                self.ready = False
+                if crashed:
+                    logger.error(f"💥 AI worker exited unexpectedly (code {self.process.returncode})")
+                else:
+                    logger.warning(f"⚠️ AI worker health check failed ({self.failures}/{WORKER_MAX_FAILURES})")
+                
+                if self.managed and (crashed or self.failures >= WORKER_MAX_FAILURES):
+                    await asyncio.get_running_loop().run_in_executor(None, self._terminate)
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 300.0)
+                    self.restarts += 1
+                    logger.info(f"🔄 Restarting AI worker (restart #{self.restarts})")
+                    self.retry_at = 0.0
+                    await self.ensure_ready()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error supervising AI worker: {e}")
+    
+    async def stream(self, prompt: str, params: dict, deadline: float):
+        """Yield generated text from the worker as it arrives"""
+        loop = asyncio.get_running_loop()
+        timeout = aiohttp.ClientTimeout(total=max(1.0, deadline - loop.time()))
+        payload = {'prompt': prompt, 'params': params, 'stream': True}
+        async with self.session.post(f"{self.base_url}/generate", json=payload, timeout=timeout) as response:
+            if response.status != 200:
+                raise RuntimeError(f"AI worker returned HTTP {response.status}")
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if 'error' in item:
+                    raise RuntimeError(f"AI worker error: {item['error']}")
+                if item.get('done'):
+                    return
+                yield item['text']
+    
+    async def generate(self, prompt: str, params: dict, timeout: float = GENERATION_TIMEOUT) -> str:
+        """Return the worker's full completion for prompt"""
+        payload = {'prompt': prompt, 'params': params, 'stream': False}
+        async with self.session.post(f"{self.base_url}/generate", json=payload, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            data = await response.json()
+            if response.status != 200:
+                raise RuntimeError(f"AI worker error: {data.get('error', response.status)}")
+            return data['text']
+
+inference_worker = InferenceWorkerClient(WORKER_URL, WORKER_SOCKET, WORKER_PORT)
+
+def use_worker() -> bool:
+    """True when generation should go to the out-of-process worker"""
+    return WORKER_ENABLED and inference_worker.ready
+
+def setup_ai_chat_system(bot: commands.Bot):
+    """Set up the AI Chat system using Mistral 7B"""
+    logger.info("Setting up AI Chat system with Mistral 7B...")
+    
+    if WORKER_ENABLED:
+        logger.info(f"AI Chat system ready - generation runs in the AI worker at {WORKER_SOCKET or WORKER_URL or f'127.0.0.1:{WORKER_PORT}'} (PUDDLEAI_WORKER)")
+    elif LAZY_LOAD:
+        logger.info("AI Chat system ready - Mistral 7B will load on the first mention (PUDDLEAI_LAZY_LOAD)")
+    else:
+        # Start model loading in background
+        loading_thread = threading.Thread(target=load_model, daemon=True)
+        loading_thread.start()
+        logger.info("AI Chat system setup initiated (Mistral 7B model loading in background)")
+    
+    start_idle_unloader()
+
+def load_model():
+    """Load Mistral 7B (or settle on the fallback system) if it isn't resident yet.
+    
+    Blocking - call from a worker thread. Concurrent callers wait for the load already
+    in progress instead of starting a second one.
+    """
+    with load_lock:
+        if model_loaded:
+            return
+        _load_model()
+
+def _load_model():
+    """Find, validate and load the Mistral 7B model (call with load_lock held)"""
+    global mistral_model, model_loaded, model_loading, loaded_model_path, load_count, last_used_at
+    
+    model_loading = True
+    
+    try:
+        # Step 1: Check system resources
+        logger.info("=== AI System Initialization Debug ===")
+        print("🔍 Initializing AI system with Mistral 7B...")
+        
+        # Check memory
+        try:
+            import psutil
+            memory = psutil.virtual_memory()
+            logger.info(f"💾 System Memory: {memory.total // (1024**3)}GB total, {memory.available // (1024**3)}GB available ({memory.percent}% used)")
+            print(f"💾 Memory: {memory.available // (1024**3)}GB available")
             
-            # Step 2: Try importing llama-cpp-python
-            logger.info("📦 Attempting to import llama-cpp-python...")
-            print("📦 Importing llama-cpp-python...")
+            if memory.available < 4 * 1024**3:  # Less than 4GB
+                logger.warning("⚠️ Low memory detected - Mistral 7B requires at least 4GB RAM")
+                print("⚠️ Warning: Low available memory detected for Mistral 7B")
+        except Exception as mem_error:
+            logger.warning(f"Could not check memory: {mem_error}")
+        
+        # Step 2: Try importing llama-cpp-python
+        logger.info("📦 Attempting to import llama-cpp-python...")
+        print("📦 Importing llama-cpp-python...")
+        
+        try:
+            from llama_cpp import Llama
+            logger.info("✅ llama-cpp-python imported successfully")
+            print("✅ llama-cpp-python imported successfully")
             
+            # Check llama-cpp-python version
             try:
-                from llama_cpp import Llama
-                logger.info("✅ llama-cpp-python imported successfully")
-                print("✅ llama-cpp-python imported successfully")
+                import llama_cpp
+                if hasattr(llama_cpp, '__version__'):
+                    logger.info(f"📋 llama-cpp-python version: {llama_cpp.__version__}")
+                    print(f"📋 Version: {llama_cpp.__version__}")
+            except:
+                logger.info("📋 Could not determine llama-cpp-python version")
                 
-                # Check llama-cpp-python version
-                try:
-                    import llama_cpp
-                    if hasattr(llama_cpp, '__version__'):
-                        logger.info(f"📋 llama-cpp-python version: {llama_cpp.__version__}")
-                        print(f"📋 Version: {llama_cpp.__version__}")
-                except:
-                    logger.info("📋 Could not determine llama-cpp-python version")
-                    
-            except ImportError as import_error:
-                logger.error(f"❌ Failed to import llama-cpp-python: {import_error}")
-                print(f"❌ Import failed: {import_error}")
-                logger.error("💡 Please run: pip install llama-cpp-python")
-                model_loaded = False
-                model_loading = False
-                return
-            
-            # Step 3: Find or download Mistral 7B model
-            logger.info("🔍 Looking for Mistral 7B model...")
-            print("🔍 Looking for Mistral 7B model...")
-            model_path = download_mistral_model()
+        except ImportError as import_error:
+            logger.error(f"❌ Failed to import llama-cpp-python: {import_error}")
+            print(f"❌ Import failed: {import_error}")
+            logger.error("💡 Please run: pip install llama-cpp-python")
+            model_loaded = False
+            model_loading = False
+            return
+        
+        # Step 3: Find or download Mistral 7B model
+        logger.info("🔍 Looking for Mistral 7B model...")
+        print("🔍 Looking for Mistral 7B model...")
+        model_path = download_mistral_model()
+        
+        if not model_path:
+            logger.warning("❌ No Mistral 7B model available and auto-download failed")
+            logger.info("🔄 Using smart fallback response system...")
+            print("🔄 No Mistral 7B available - using smart responses")
+            model_loaded = True
+            model_loading = False
+            return
+        
+        # Step 4: Validate model file
+        logger.info(f"📁 Model file path: {model_path}")
+        print(f"📁 Model file: {os.path.basename(model_path)}")
+        
+        try:
+            model_size = os.path.getsize(model_path) / (1024**3)  # Size in GB
+            logger.info(f"📏 Model file size: {model_size:.2f}GB")
+            print(f"📏 Model size: {model_size:.2f}GB")
             
-            if not model_path:
-                logger.warning("❌ No Mistral 7B model available and auto-download failed")
-                logger.info("🔄 Using smart fallback response system...")
-                print("🔄 No Mistral 7B available - using smart responses")
-                model_loaded = True
+            if model_size < 3.0:  # Less than 3GB (Mistral 7B should be ~4GB)
+                logger.error("❌ Model file appears to be corrupted (too small for Mistral 7B)")
+                print("❌ Model file corrupted - removing...")
+                os.remove(model_path)
+                model_loaded = True  # Use fallback
                 model_loading = False
                 return
-            
-            # Step 4: Validate model file
-            logger.info(f"📁 Model file path: {model_path}")
-            print(f"📁 Model file: {os.path.basename(model_path)}")
-            
+                
+        except Exception as size_error:
+            logger.error(f"❌ Could not check model file size: {size_error}")
+        
+        # Step 5: Begin model loading
+        logger.info(f"🔄 Beginning Mistral 7B model load: {os.path.basename(model_path)}")
+        print(f"🧠 Loading Mistral 7B model: {os.path.basename(model_path)}")
+        print("⏳ This may take several minutes...")
+        print("🔍 Verbose mode: You'll see detailed progress below")
+        
+        with model_lock:
             try:
-                model_size = os.path.getsize(model_path) / (1024**3)  # Size in GB
-                logger.info(f"📏 Model file size: {model_size:.2f}GB")
-                print(f"📏 Model size: {model_size:.2f}GB")
+                # Step 5a: Pre-load logging
+                logger.info("🔧 Creating Mistral model instance...")
+                print("🔧 Creating Mistral model instance...")
+                logger.info(f"🎛️ Model parameters: n_ctx=4096, n_threads=8, n_gpu_layers=0, use_mmap={USE_MMAP}, use_mlock={USE_MLOCK}")
+                print(f"🎛️ Using 8 CPU threads, 4096 context window{' (memory-mapped)' if USE_MMAP else ''}")
                 
-                if model_size < 3.0:  # Less than 3GB (Mistral 7B should be ~4GB)
-                    logger.error("❌ Model file appears to be corrupted (too small for Mistral 7B)")
-                    print("❌ Model file corrupted - removing...")
-                    os.remove(model_path)
-                    model_loaded = True  # Use fallback
-                    model_loading = False
-                    return
-                    
-            except Exception as size_error:
-                logger.error(f"❌ Could not check model file size: {size_error}")
-            
-            # Step 5: Begin model loading
-            logger.info(f"🔄 Beginning Mistral 7B model load: {os.path.basename(model_path)}")
-            print(f"🧠 Loading Mistral 7B model: {os.path.basename(model_path)}")
-            print("⏳ This may take several minutes...")
-            print("🔍 Verbose mode: You'll see detailed progress below")
-            
-            with model_lock:
-                try:
-                    # Step 5a: Pre-load logging
-                    logger.info("🔧 Creating Mistral model instance...")
-                    print("🔧 Creating Mistral model instance...")
-                    logger.info(f"🎛️ Model parameters: n_ctx=4096, n_threads=8, n_gpu_layers=0")
-                    print("🎛️ Using 8 CPU threads, 4096 context window")
-                    
-                    # Step 5b: Attempt to create model with verbose output
-                    logger.info("⚡ Initializing Mistral 7B model (this is where crashes typically occur)...")
-                    print("⚡ Initializing Mistral 7B model - please wait...")
-                    
-                    # Enable verbose output for debugging
-                    mistral_model = Llama(
-                        model_path=model_path,
-                        n_ctx=4096,  # Larger context window for Mistral
-                        n_threads=8,  # More threads for better performance
-                        n_gpu_layers=0,  # Set to > 0 if you have GPU support
-                        verbose=True  # Enable verbose output for debugging
-                    )
-                    
-                    # Step 5c: Post-load success
-                    model_loaded = True
-                    logger.info("✅ Mistral 7B model instance created successfully!")
-                    print("✅ Mistral 7B model instance created!")
-                    
-                    # Step 5d: Test the model with a simple prompt
+                # Step 5b: Attempt to create model with verbose output
+                logger.info("⚡ Initializing Mistral 7B model (this is where crashes typically occur)...")
+                print("⚡ Initializing Mistral 7B model - please wait...")
+                
+                # Enable verbose output for debugging
+                mistral_model = Llama(
+                    model_path=model_path,
+                    n_ctx=4096,  # Larger context window for Mistral
+                    n_threads=8,  # More threads for better performance
+                    n_gpu_layers=0,  # Set to > 0 if you have GPU support
+                    use_mmap=USE_MMAP,  # Page weights in from disk on demand instead of copying them into RAM
+                    use_mlock=USE_MLOCK,  # Pin the weights so the OS can't swap them out
+                    verbose=True  # Enable verbose output for debugging
+                )
+                
+                # Step 5c: Post-load success
+                model_loaded = True
+                loaded_model_path = model_path
+                load_count += 1
+                last_used_at = time.monotonic()
+                logger.info("✅ Mistral 7B model instance created successfully!")
+                print("✅ Mistral 7B model instance created!")
+                
+                # Step 5d: Evaluate the fixed system prompt once so requests only process user tokens.
+                # This also exercises the model, so the separate test prompt is only needed without it.
+                if not prime_prefix_cache(mistral_model):
                     logger.info("🧪 Testing Mistral 7B model with simple prompt...")
                     print("🧪 Testing Mistral 7B model...")
                     
                     test_response = mistral_model("Hello", max_tokens=10, temperature=0.1)
                     logger.info(f"🧪 Test response: {test_response}")
                     print("🧪 Mistral 7B model test successful!")
-                    
-                    logger.info("✅ Mistral 7B AI model fully loaded and tested!")
-                    print("✅ Mistral 7B AI model loaded and ready!")
-                    print("🤖 You can now mention the bot for intelligent responses!")
-                    
-                except Exception as model_load_error:
-                    import traceback
-                    error_details = traceback.format_exc()
-                    
-                    logger.error(f"❌ Mistral 7B model loading failed: {model_load_error}")
-                    logger.error(f"❌ Full error traceback:\n{error_details}")
-                    print(f"❌ Failed to load Mistral 7B model: {model_load_error}")
-                    print("🔄 Falling back to smart response system...")
-                    
-                    # Final fallback
-                    mistral_model = None
-                    model_loaded = True  # Enable fallback system
-                    logger.info("🔄 Using smart fallback response system")
-                    print("🔄 Using smart fallback response system")
-                    print("🤖 You can still mention the bot for responses!")
-            
-            logger.info("=== AI System Initialization Complete ===")
-            
-        except Exception as general_error:
-            import traceback
-            general_traceback = traceback.format_exc()
-            logger.error(f"❌ General AI system error: {general_error}")
-            logger.error(f"❌ General error traceback:\n{general_traceback}")
-            print(f"❌ AI system error: {general_error}")
-            print("🔄 Using smart fallback response system...")
-            model_loaded = True  # Use fallback system
-        finally:
-            model_loading = False
-            logger.info("🏁 AI system initialization thread completed")
+                
+                logger.info("✅ Mistral 7B AI model fully loaded and tested!")
+                print("✅ Mistral 7B AI model loaded and ready!")
+                print("🤖 You can now mention the bot for intelligent responses!")
+                
+            except Exception as model_load_error:
+                import traceback
+                error_details = traceback.format_exc()
+                
+                logger.error(f"❌ Mistral 7B model loading failed: {model_load_error}")
+                logger.error(f"❌ Full error traceback:\n{error_details}")
+                print(f"❌ Failed to load Mistral 7B model: {model_load_error}")
+                print("🔄 Falling back to smart response system...")
+                
+                # Final fallback
+                mistral_model = None
+                model_loaded = True  # Enable fallback system
+                logger.info("🔄 Using smart fallback response system")
+                print("🔄 Using smart fallback response system")
+                print("🤖 You can still mention the bot for responses!")
+        
+        logger.info("=== AI System Initialization Complete ===")
+        
+    except Exception as general_error:
+        import traceback
+        general_traceback = traceback.format_exc()
+        logger.error(f"❌ General AI system error: {general_error}")
+        logger.error(f"❌ General error traceback:\n{general_traceback}")
+        print(f"❌ AI system error: {general_error}")
+        print("🔄 Using smart fallback response system...")
+        model_loaded = True  # Use fallback system
+    finally:
+        model_loading = False
+        logger.info("🏁 AI model load completed")
+
+
+def mark_model_used():
+    """Push back the idle-unload timer"""
+    global last_used_at
+    last_used_at = time.monotonic()
+
+async def ensure_model_loaded(allow_worker: bool = True):
+    """Load the model on first demand without blocking the event loop.
     
-    # Start model loading in background
-    loading_thread = threading.Thread(target=load_model, daemon=True)
-    loading_thread.start()
+    With PUDDLEAI_WORKER enabled this starts the worker process instead, and only
+    loads the model in-process if the worker can't be brought up (or allow_worker is False).
+    """
+    mark_model_used()
+    if allow_worker and WORKER_ENABLED and await inference_worker.ensure_ready():
+        return
+    if model_loaded:
+        return
     
-    logger.info("AI Chat system setup initiated (Mistral 7B model loading in background)")
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, load_model)
 
-def create_mistral_prompt(message: str, user_name: str) -> str:
-    """Create a prompt optimized for Mistral 7B"""
+def unload_model(reason: str = "manual") -> bool:
+    """Drop the resident model so its memory can be reclaimed.
+    
+    Waits for any in-flight generation to finish. The next mention loads it again.
+    Returns False if no model was resident.
+    """
+    global mistral_model, model_loaded, prefix_state, unload_count
+    
+    with load_lock, model_lock:
+        if mistral_model is None:
+            return False
+        
+        model = mistral_model
+        mistral_model = None
+        prefix_state = None
+        model_loaded = False
+        unload_count += 1
+        
+        try:
+            # Newer llama-cpp-python builds free native memory eagerly on close()
+            if hasattr(model, 'close'):
+                model.close()
+        except Exception as e:
+            logger.warning(f"Error closing Mistral model: {e}")
+        del model
+    
+    gc.collect()
+    logger.info(f"💤 Unloaded Mistral 7B model ({reason})")
+    print(f"💤 Unloaded Mistral 7B model ({reason}) - it will load again on the next mention")
+    return True
+
+def start_idle_unloader():
+    """Start the background thread that unloads the model after PUDDLEAI_IDLE_UNLOAD seconds unused"""
+    global idle_thread
+    
+    if IDLE_UNLOAD_SECONDS <= 0 or (idle_thread is not None and idle_thread.is_alive()):
+        return
     
-    system_prompt = f"""<s>[INST] You are Puddles, a Duck.
+    def idle_loop():
+        check_interval = max(5.0, min(60.0, IDLE_UNLOAD_SECONDS / 4))
+        while True:
+            time.sleep(check_interval)
+            try:
+                if mistral_model is not None and not model_lock.locked():
+                    idle_for = time.monotonic() - last_used_at
+                    if idle_for >= IDLE_UNLOAD_SECONDS:
+                        unload_model(f"idle for {idle_for / 60:.0f} minutes")
+            except Exception as e:
+                logger.error(f"Error in AI idle unloader: {e}")
+    
+    idle_thread = threading.Thread(target=idle_loop, name="puddleai-idle-unload", daemon=True)
+    idle_thread.start()
+    logger.info(f"⏲️ Mistral 7B will be unloaded after {IDLE_UNLOAD_SECONDS:.0f}s without requests")
+
+# Fixed persona/system instructions shared by every request. Keeping this as a constant
+# lets us evaluate it once and restore the saved llama-cpp state before each generation.
+SYSTEM_PROMPT_PREFIX = """<s>[INST] You are Puddles, a Duck.
 
 CRITICAL RULES:
 1. ONLY give short fun responses to the queries you are given
@@ -203,23 +754,78 @@ CRITICAL RULES:
 6. YOU MUST give short responses without any quotes and only reply to what is being asked of you
 7. YOU MUST reply in the language that the user is speaking - detect their language and respond accordingly
 
-Current user to reply to: {user_name}
+"""
+
+def create_mistral_prompt(message: str, user_name: str) -> str:
+    """Create a prompt optimized for Mistral 7B"""
+    
+    system_prompt = f"""{SYSTEM_PROMPT_PREFIX}Current user to reply to: {user_name}
 
 User: {message} [/INST]"""
     
     return system_prompt
 
-async def generate_response(message_content: str, user_name: str, user_id: int) -> str:
-    """Generate a response using Mistral 7B or fallback system"""
+def prime_prefix_cache(model) -> bool:
+    """Evaluate SYSTEM_PROMPT_PREFIX once and keep the resulting model state.
+    
+    Must be called with model_lock held. Returns False if this llama-cpp build
+    can't save state, in which case every request evaluates the full prompt.
+    """
+    global prefix_state
+    
+    if not PREFIX_CACHE_ENABLED or model is None:
+        prefix_state = None
+        return False
+    
+    try:
+        started_at = time.perf_counter()
+        # Run a throwaway prompt through the normal completion path instead of tokenizing the
+        # prefix ourselves - tokenizer flags differ between llama-cpp versions, and generate()
+        # only reuses the longest token prefix it shares with the next prompt anyway.
+        model.reset()
+        model(create_mistral_prompt("", ""), max_tokens=1, temperature=0.0)
+        prefix_state = model.save_state()
+        logger.info(f"🧠 Cached system prompt prefix ({prefix_state.n_tokens} tokens) in {time.perf_counter() - started_at:.2f}s")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not cache system prompt prefix, evaluating full prompts instead: {e}")
+        prefix_state = None
+        return False
+
+def restore_prefix_cache(model) -> bool:
+    """Load the cached prefix state so only the per-user part of the prompt is evaluated.
+    
+    Must be called with model_lock held, right before generating.
+    """
+    global prefix_state
+    
+    if prefix_state is None or model is None:
+        return False
+    
+    try:
+        model.load_state(prefix_state)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not restore cached prompt prefix, disabling cache: {e}")
+        prefix_state = None
+        return False
+
+async def generate_response(message_content: str, user_name: str, user_id: int, guild_id: Optional[int] = None,
+                            embedding: Optional[List[float]] = None) -> str:
+    """Generate a response using Mistral 7B or fallback system.
+    
+    Replies produced by the model are stored in the response cache when a guild_id is given,
+    reusing the message embedding from the cache lookup if there was one.
+    """
     global mistral_model, model_loaded
     
     logger.info(f"=== AI Response Generation Debug ===")
     logger.info(f"User: {user_name} (ID: {user_id})")
     logger.info(f"Message: '{message_content}'")
-    logger.info(f"Model loaded: {model_loaded}")
+    logger.info(f"Model loaded: {model_loaded} (AI worker: {use_worker()})")
     logger.info(f"Mistral model available: {mistral_model is not None}")
     
-    if not model_loaded:
+    if not model_loaded and not use_worker():
         logger.info("Model not loaded - returning loading message")
         return "🤖 I'm still warming up my circuits... Please give me a moment!"
     
@@ -232,62 +838,66 @@ async def generate_response(message_content: str, user_name: str, user_id: int)
         logger.info(f"Created Mistral prompt (length: {len(prompt)})")
         
         # Generate response
-        def generate_in_thread():
+        def generate_in_thread(queued_at):
             with model_lock:
+                AI_QUEUE_SECONDS.observe(time.perf_counter() - queued_at)
                 try:
                     if mistral_model is None:
                         logger.info("No Mistral model available - using fallback system")
-                        return generate_fallback_response(cleaned_content, user_name)
+                        return generate_fallback_response(cleaned_content, user_name), False
                     
                     logger.info("Using Mistral 7B model for generation...")
+                    mark_model_used()
+                    restore_prefix_cache(mistral_model)
                     # Use Mistral model
-                    response = mistral_model(
-                        prompt,
-                        max_tokens=200,  # Reasonable for plain text
-                        temperature=0.7,
-                        top_p=0.9,
-                        top_k=40,
-                        repeat_penalty=1.1,
-                        stop=["User:", "Puddles:", "\n\n", "[/INST]"]
-                    )
+                    with AI_INFERENCE_SECONDS.labels(backend="local", mode="full").time():
+                        response = mistral_model(prompt, **GENERATION_KWARGS)
                     
                     generated_text = response['choices'][0]['text'].strip()
                     logger.info(f"Raw Mistral response: '{generated_text}'")
                     
-                    # Clean up the response
-                    if generated_text:
-                        # Remove any remaining prompt artifacts
-                        lines = generated_text.split('\n')
-                        clean_lines = []
-                        for line in lines:
-                            line = line.strip()
-                            if line and not line.startswith(('User:', 'Puddles:', 'System:', '[INST]', '[/INST]')):
-                                clean_lines.append(line)
-                        
-                        if clean_lines:
-                            cleaned_response = ' '.join(clean_lines)
-                            logger.info(f"Cleaned Mistral response: '{cleaned_response}'")
-                            return cleaned_response
+                    cleaned_response = clean_model_output(generated_text)
+                    if cleaned_response:
+                        logger.info(f"Cleaned Mistral response: '{cleaned_response}'")
+                        return cleaned_response, True
                     
                     # If we get here, use fallback
                     logger.info("Mistral response empty/invalid - using fallback")
-                    return generate_fallback_response(cleaned_content, user_name)
+                    return generate_fallback_response(cleaned_content, user_name), False
                     
                 except Exception as e:
                     logger.error(f"Error generating Mistral response: {e}")
                     logger.info("Mistral generation failed - using fallback")
-                    return generate_fallback_response(cleaned_content, user_name)
+                    return generate_fallback_response(cleaned_content, user_name), False
         
-        # Run in executor to avoid blocking the event loop
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, generate_in_thread)
+        started_at = time.perf_counter()
+        response, from_model = None, False
+        if use_worker():
+            try:
+                mark_model_used()
+                with AI_INFERENCE_SECONDS.labels(backend="worker", mode="full").time():
+                    response = clean_model_output((await inference_worker.generate(prompt, GENERATION_KWARGS)).strip())
+                from_model = bool(response)
+            except Exception as e:
+                logger.error(f"AI worker generation failed, using the in-process model: {e}")
+                inference_worker.ready = False
+                await ensure_model_loaded(allow_worker=False)
         
-        logger.info(f"Generated response length: {len(response)} chars")
+        if not from_model:
+            # Run in executor to avoid blocking the event loop
+            loop = asyncio.get_event_loop()
+            response, from_model = await loop.run_in_executor(None, generate_in_thread, time.perf_counter())
+        
+        logger.info(f"Generated response length: {len(response)} chars in {time.perf_counter() - started_at:.2f}s")
             
         # Final check - if response is still empty or too short, use fallback
         if not response or len(response.strip()) < 10:
             logger.warning(f"Final response too short ({len(response)} chars) - using fallback")
             response = generate_fallback_response(cleaned_content, user_name)
+            from_model = False
+        elif from_model and guild_id is not None:
+            await response_cache.store(guild_id, cleaned_content, user_name, response, embedding)
+        AI_REQUESTS.labels(source="model" if from_model else "fallback").inc()
         
         logger.info(f"Final response: '{response[:100]}{'...' if len(response) > 100 else ''}'")
         logger.info(f"=== End AI Response Debug ===")
@@ -298,6 +908,112 @@ async def generate_response(message_content: str, user_name: str, user_id: int)
         logger.info("Main generation failed - using fallback")
         return generate_fallback_response(message_content, user_name)
 
+def clean_model_output(generated_text: str) -> str:
+    """Strip prompt artifacts from raw model output and join it into a single reply"""
+    if not generated_text:
+        return ""
+    
+    # Remove any remaining prompt artifacts
+    clean_lines = []
+    for line in generated_text.split('\n'):
+        line = line.strip()
+        if line and not line.startswith(('User:', 'Puddles:', 'System:', '[INST]', '[/INST]')):
+            clean_lines.append(line)
+    
+    return ' '.join(clean_lines)
+
+async def stream_response(message_content: str, user_name: str, deadline: float):
+    """Yield text chunks from Mistral 7B as they are generated.
+    
+    The llama-cpp streaming iterator is consumed in a worker thread and each chunk is
+    handed back to the event loop through an asyncio.Queue. Raises asyncio.TimeoutError
+    if the loop-time ``deadline`` passes before generation finishes.
+    """
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+    stop_event = threading.Event()
+    finished = object()
+    prompt = create_mistral_prompt(message_content.strip(), user_name)
+    
+    if use_worker():
+        produced = False
+        try:
+            mark_model_used()
+            started_at = time.perf_counter()
+            async for text in inference_worker.stream(prompt, GENERATION_KWARGS, deadline):
+                produced = True
+                yield text
+            AI_INFERENCE_SECONDS.labels(backend="worker", mode="stream").observe(time.perf_counter() - started_at)
+            return
+        except (aiohttp.ClientError, RuntimeError, ValueError) as e:
+            if produced:
+                raise
+            # Nothing sent yet - fall back to the in-process model for this reply
+            logger.error(f"AI worker streaming failed, using the in-process model: {e}")
+            inference_worker.ready = False
+            await ensure_model_loaded(allow_worker=False)
+    
+    def stream_in_thread(queued_at):
+        try:
+            with model_lock:
+                AI_QUEUE_SECONDS.observe(time.perf_counter() - queued_at)
+                if mistral_model is None:
+                    return
+                mark_model_used()
+                restore_prefix_cache(mistral_model)
+                with AI_INFERENCE_SECONDS.labels(backend="local", mode="stream").time():
+                    for part in mistral_model(prompt, stream=True, **GENERATION_KWARGS):
+                        if stop_event.is_set():
+                            break
+                        text = part['choices'][0].get('text', '')
+                        if text:
+                            loop.call_soon_threadsafe(chunks.put_nowait, text)
+        except Exception as e:
+            loop.call_soon_threadsafe(chunks.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(chunks.put_nowait, finished)
+    
+    worker = loop.run_in_executor(None, stream_in_thread, time.perf_counter())
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            item = await asyncio.wait_for(chunks.get(), timeout=remaining)
+            if item is finished:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Tell the worker to stop if we bailed out early; it releases the model lock on exit
+        stop_event.set()
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list:
+    """Split a reply into Discord-sized parts at natural line breaks"""
+    if len(text) <= limit:
+        return [text]
+    
+    parts = []
+    current_part = ""
+    
+    for line in text.split('\n'):
+        if len(current_part) + len(line) + 1 > limit:
+            if current_part:
+                parts.append(current_part.strip())
+                current_part = line
+            else:
+                # Single line is too long, split it
+                parts.append(line[:limit] + "...")
+                current_part = ""
+        else:
+            current_part += line + '\n'
+    
+    if current_part:
+        parts.append(current_part.strip())
+    
+    return parts
+
 def generate_fallback_response(message: str, user_name: str) -> str:
     """Generate intelligent fallback responses based on message content"""
     
@@ -419,65 +1135,26 @@ async def handle_bot_mention(message: discord.Message, bot: commands.Bot) -> boo
         content = "hello"
     
     try:
-        # Show typing indicator while generating response
-        async with message.channel.typing():
-            logger.info(f"🤖 Generating response for {message.author.display_name}: '{content[:50]}...'")
-            
-            # Add timeout to prevent getting stuck during generation
-            try:
-                response = await asyncio.wait_for(
-                    generate_response(content, message.author.display_name, message.author.id),
-                    timeout=60.0  # 60 second timeout
-                )
-            except asyncio.TimeoutError:
-                logger.error("⏰ Response generation timed out after 60 seconds")
-                response = f"Sorry {message.author.display_name}, my response took too long to generate. Could you try asking again or rephrase your question? Quack 🦆"
-            
-            # Send plain text response with proper multiline handling
-            logger.info(f"📤 Sending plain text response ({len(response)} chars)")
-            logger.info(f"📝 Response preview: '{response[:100]}{'...' if len(response) > 100 else ''}'")
-            
-            # Ensure response is properly formatted for Discord
-            # Replace any problematic characters that might cause issues
-            cleaned_response = response.replace('\r\n', '\n').replace('\r', '\n')
-            logger.info(f"🧹 Cleaned response length: {len(cleaned_response)} chars")
+        cached, embedding = await response_cache.lookup(message.guild.id, content, message.author.display_name)
+        if cached:
+            # Repeated question - answer from memory and leave the model free
+            AI_REQUESTS.labels(source="cache").inc()
+            for i, part in enumerate(split_message(cached)):
+                if i == 0:
+                    await message.reply(part, mention_author=False)
+                else:
+                    await message.channel.send(part)
+        else:
+            if not (use_worker() or model_loaded):
+                # First mention since startup or since the idle unload - load on demand
+                async with message.channel.typing():
+                    await ensure_model_loaded()
             
-            # If response is very long, split it into multiple messages
-            if len(cleaned_response) > 1900:
-                logger.info("Response too long - splitting into multiple messages")
-                
-                # Split at natural break points
-                parts = []
-                current_part = ""
-                
-                for line in cleaned_response.split('\n'):
-                    if len(current_part) + len(line) + 1 > 1900:
-                        if current_part:
-                            parts.append(current_part.strip())
-                            current_part = line
-                        else:
-                            # Single line is too long, split it
-                            parts.append(line[:1900] + "...")
-                            current_part = ""
-                    else:
-                        current_part += line + '\n'
-                
-                if current_part:
-                    parts.append(current_part.strip())
-                
-                # Send first part as reply, rest as follow-up messages
-                logger.info(f"📨 Sending {len(parts)} message parts")
-                for i, part in enumerate(parts):
-                    logger.info(f"📨 Sending part {i+1}/{len(parts)} ({len(part)} chars)")
-                    if i == 0:
-                        await message.reply(part, mention_author=False)
-                    else:
-                        await message.channel.send(part)
-                        await asyncio.sleep(0.5)  # Brief pause between messages
+            if STREAM_RESPONSES and (use_worker() or (model_loaded and mistral_model is not None)):
+                AI_REQUESTS.labels(source="stream").inc()
+                await send_streamed_reply(message, content, embedding)
             else:
-                # Single message
-                logger.info(f"📨 Sending single message ({len(cleaned_response)} chars)")
-                await message.reply(cleaned_response, mention_author=False)
+                await send_full_reply(message, content, embedding)
         
         logger.info(f"✅ AI response sent successfully to {message.author.display_name} in #{message.channel.name}")
         return True
@@ -492,21 +1169,177 @@ async def handle_bot_mention(message: discord.Message, bot: commands.Bot) -> boo
         logger.error(f"Unexpected error in handle_bot_mention: {e}")
         return False
 
+async def send_full_reply(message: discord.Message, content: str, embedding: Optional[List[float]] = None):
+    """Generate the whole reply first, then send it (used for the fallback system or when streaming is off)"""
+    # Show typing indicator while generating response
+    async with message.channel.typing():
+        logger.info(f"🤖 Generating response for {message.author.display_name}: '{content[:50]}...'")
+        started_at = time.perf_counter()
+        
+        # Add timeout to prevent getting stuck during generation
+        try:
+            response = await asyncio.wait_for(
+                generate_response(content, message.author.display_name, message.author.id, message.guild.id, embedding),
+                timeout=GENERATION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"⏰ Response generation timed out after {GENERATION_TIMEOUT:.0f} seconds")
+            response = f"Sorry {message.author.display_name}, my response took too long to generate. Could you try asking again or rephrase your question? Quack 🦆"
+        
+        logger.info(f"⏱️ AI reply latency: total={time.perf_counter() - started_at:.2f}s (not streamed)")
+        
+        # Send plain text response with proper multiline handling
+        logger.info(f"📤 Sending plain text response ({len(response)} chars)")
+        logger.info(f"📝 Response preview: '{response[:100]}{'...' if len(response) > 100 else ''}'")
+        
+        # Ensure response is properly formatted for Discord
+        # Replace any problematic characters that might cause issues
+        cleaned_response = response.replace('\r\n', '\n').replace('\r', '\n')
+        logger.info(f"🧹 Cleaned response length: {len(cleaned_response)} chars")
+        
+        # If response is very long, split it into multiple messages
+        parts = split_message(cleaned_response)
+        
+        # Send first part as reply, rest as follow-up messages
+        logger.info(f"📨 Sending {len(parts)} message parts")
+        for i, part in enumerate(parts):
+            logger.info(f"📨 Sending part {i+1}/{len(parts)} ({len(part)} chars)")
+            if i == 0:
+                await message.reply(part, mention_author=False)
+            else:
+                await message.channel.send(part)
+                await asyncio.sleep(0.5)  # Brief pause between messages
+
+async def send_streamed_reply(message: discord.Message, content: str, embedding: Optional[List[float]] = None):
+    """Stream the reply into Discord as Mistral generates it.
+    
+    The first message is posted once the first sentence is complete and is then edited
+    in place at most once every STREAM_EDIT_INTERVAL seconds. Time-to-first-token and
+    total latency are logged separately.
+    """
+    user_name = message.author.display_name
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    deadline = started_at + GENERATION_TIMEOUT
+    first_token_at = None
+    raw_text = ""
+    reply = None
+    sent_text = ""
+    last_edit_at = 0.0
+    timed_out = False
+    completed = False  # Only a stream that ran to the end is worth caching
+    
+    logger.info(f"🤖 Streaming response for {user_name}: '{content[:50]}...'")
+    
+    chunks = stream_response(content, user_name, deadline)
+    async with message.channel.typing():
+        try:
+            async for chunk in chunks:
+                if first_token_at is None:
+                    first_token_at = loop.time()
+                    logger.info(f"⚡ First token after {first_token_at - started_at:.2f}s")
+                raw_text += chunk
+                
+                visible = clean_model_output(raw_text)[:MAX_MESSAGE_LENGTH]
+                now = loop.time()
+                if reply is None:
+                    # Hold the first message back until a whole sentence is available
+                    if SENTENCE_END_REGEX.search(visible):
+                        reply = await message.reply(visible, mention_author=False)
+                        sent_text, last_edit_at = visible, now
+                elif visible != sent_text and now - last_edit_at >= STREAM_EDIT_INTERVAL:
+                    await reply.edit(content=visible)
+                    sent_text, last_edit_at = visible, now
+            completed = True
+        except asyncio.TimeoutError:
+            logger.error(f"⏰ Streamed generation timed out after {GENERATION_TIMEOUT:.0f} seconds")
+            timed_out = True
+        except discord.HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error while streaming Mistral response: {e}")
+        finally:
+            # Stops the worker thread if we left the loop early
+            await chunks.aclose()
+    
+    final_text = clean_model_output(raw_text).replace('\r\n', '\n').replace('\r', '\n')
+    if len(final_text.strip()) >= 10 and completed:
+        await response_cache.store(message.guild.id, content, user_name, final_text, embedding)
+    elif len(final_text.strip()) < 10:
+        if timed_out:
+            final_text = f"Sorry {user_name}, my response took too long to generate. Could you try asking again or rephrase your question? Quack 🦆"
+        else:
+            logger.info("Streamed response empty/too short - using fallback")
+            final_text = generate_fallback_response(content, user_name)
+    
+    parts = split_message(final_text)
+    if reply is None:
+        await message.reply(parts[0], mention_author=False)
+    elif parts[0] != sent_text:
+        await reply.edit(content=parts[0])
+    for part in parts[1:]:
+        await message.channel.send(part)
+        await asyncio.sleep(0.5)  # Brief pause between messages
+    
+    total = loop.time() - started_at
+    ttft = f"{first_token_at - started_at:.2f}s" if first_token_at is not None else "n/a"
+    logger.info(f"⏱️ AI reply latency: ttft={ttft} total={total:.2f}s ({len(final_text)} chars, streamed)")
+
 def is_model_loaded() -> bool:
     """Check if the AI model is loaded and ready"""
     return model_loaded
 
 def get_model_status() -> str:
     """Get the current status of the AI model"""
-    if model_loaded and mistral_model is not None:
-        return "✅ Ready (Mistral 7B Model)"
-    elif model_loaded:
-        return "✅ Ready (Fallback System)"
+    if use_worker():
+        return f"✅ Ready (Mistral 7B Model in AI worker, pid {(inference_worker.last_health or {}).get('pid', '?')})"
     elif model_loading:
         return "⏳ Loading..."
+    elif model_loaded and mistral_model is not None:
+        residency = get_model_residency()
+        details = "memory-mapped" if USE_MMAP else "in RAM"
+        if IDLE_UNLOAD_SECONDS > 0:
+            details += f", idle {residency['idle_seconds'] / 60:.0f}m of {IDLE_UNLOAD_SECONDS / 60:.0f}m"
+        return f"✅ Ready (Mistral 7B Model, {details})"
+    elif model_loaded:
+        return "✅ Ready (Fallback System)"
+    elif LAZY_LOAD or unload_count:
+        return "💤 Not loaded (loads on first mention)"
     else:
         return "❌ Failed to load"
 
+def get_model_residency() -> dict:
+    """Report whether the model currently occupies memory, and how it got there"""
+    resident = mistral_model is not None
+    size_gb = None
+    if loaded_model_path:
+        try:
+            size_gb = os.path.getsize(loaded_model_path) / (1024**3)
+        except OSError:
+            pass
+    
+    return {
+        'resident': resident,
+        'loading': model_loading,
+        'fallback': model_loaded and not resident,
+        'model_path': loaded_model_path,
+        'size_gb': size_gb,
+        'use_mmap': USE_MMAP,
+        'use_mlock': USE_MLOCK,
+        'lazy_load': LAZY_LOAD,
+        'idle_seconds': time.monotonic() - last_used_at if resident else None,
+        'idle_unload_seconds': IDLE_UNLOAD_SECONDS,
+        'loads': load_count,
+        'unloads': unload_count,
+        'worker': {
+            'enabled': WORKER_ENABLED,
+            'ready': inference_worker.ready,
+            'managed': inference_worker.managed,
+            'restarts': inference_worker.restarts,
+            'health': inference_worker.last_health,
+        },
+    }
+
 def download_mistral_model():
     """Download Mistral 7B model if none exists"""
     models_dir = Path("models")
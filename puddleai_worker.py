@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+PuddlesBot AI Inference Worker
+Runs the Mistral 7B model in its own process so generation doesn't compete with the
+bot's event loop, and a native crash in llama-cpp only takes down this worker.
+
+The bot starts and supervises this worker itself when PUDDLEAI_WORKER=true, but it can
+also be run by hand against the same GGUF file:
+
+    python puddleai_worker.py --model models/mistral-7b-instruct-v0.2.Q4_K_M.gguf --port 5917
+    python puddleai_worker.py --model models/... --socket /tmp/puddleai.sock
+
+Endpoints:
+    GET  /health    - liveness, model info and queue statistics
+    POST /generate  - {"prompt": str, "params": {...}, "stream": bool}
+                      Streams NDJSON lines {"text": "..."} followed by {"done": true},
+                      or returns {"text": "..."} when stream is false.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+logger = logging.getLogger("puddleai_worker")
+
+# Requests that arrive within this window are collected into one batch
+BATCH_WINDOW = float(os.getenv('PUDDLEAI_WORKER_BATCH_WINDOW', '0.05'))
+MAX_BATCH_SIZE = int(os.getenv('PUDDLEAI_WORKER_MAX_BATCH', '8'))
+
+# Only these sampling parameters are forwarded to llama-cpp
+ALLOWED_PARAMS = {'max_tokens', 'temperature', 'top_p', 'top_k', 'repeat_penalty', 'stop'}
+
+class GenerationJob:
+    """One distinct prompt and everyone waiting on its output"""
+
+    def __init__(self, prompt: str, params: dict):
+        self.prompt = prompt
+        self.params = params
+        self.key = json.dumps([prompt, params], sort_keys=True)
+        self.subscribers = []  # asyncio.Queue per waiting request
+
+    def publish(self, item):
+        for queue in self.subscribers:
+            queue.put_nowait(item)
+
+class InferenceWorker:
+    """Owns the model and runs queued prompts in batches on a single model thread.
+
+    llama-cpp evaluates one sequence per context, so a batch is processed one prompt
+    at a time - but identical prompts in the same batch are generated once and fanned
+    out to every waiting request, and consecutive prompts share the evaluated system
+    prompt through llama-cpp's longest-prefix KV reuse.
+    """
+
+    def __init__(self, model_path: str, n_ctx: int = 4096, n_threads: int = 8, use_mmap: bool = True, use_mlock: bool = False):
+        self.model_path = model_path
+        self.n_ctx = n_ctx
+        self.n_threads = n_threads
+        self.use_mmap = use_mmap
+        self.use_mlock = use_mlock
+        self.model = None
+        self.started_at = time.time()
+        self.pending: asyncio.Queue = None
+        self.model_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="puddleai-model")
+        self.stats = {'requests': 0, 'batches': 0, 'generations': 0, 'coalesced': 0, 'errors': 0}
+        self.busy = False
+
+    def load(self):
+        """Load the model (blocking)"""
+        from llama_cpp import Llama
+
+        started_at = time.perf_counter()
+        print(f"🧠 Loading {os.path.basename(self.model_path)} ({self.n_threads} threads, mmap={self.use_mmap})...")
+        self.model = Llama(
+            model_path=self.model_path,
+            n_ctx=self.n_ctx,
+            n_threads=self.n_threads,
+            n_gpu_layers=0,
+            use_mmap=self.use_mmap,
+            use_mlock=self.use_mlock,
+            verbose=False
+        )
+        print(f"✅ Model loaded in {time.perf_counter() - started_at:.1f}s")
+
+    async def submit(self, prompt: str, params: dict) -> asyncio.Queue:
+        """Queue a prompt and return the queue its chunks will be published to"""
+        output: asyncio.Queue = asyncio.Queue()
+        self.stats['requests'] += 1
+        await self.pending.put((prompt, params, output))
+        return output
+
+    async def batch_loop(self):
+        """Collect requests into batches and run them on the model thread"""
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self.pending.get()
+            batch = [first]
+            batch_deadline = loop.time() + BATCH_WINDOW
+            while len(batch) < MAX_BATCH_SIZE:
+                remaining = batch_deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.pending.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            jobs = {}
+            for prompt, params, output in batch:
+                job = GenerationJob(prompt, params)
+                job = jobs.setdefault(job.key, job)
+                job.subscribers.append(output)
+
+            self.stats['batches'] += 1
+            self.stats['coalesced'] += len(batch) - len(jobs)
+            if len(batch) > 1:
+                logger.info(f"Batch of {len(batch)} requests ({len(jobs)} distinct prompts)")
+
+            self.busy = True
+            try:
+                for job in jobs.values():
+                    await loop.run_in_executor(self.model_thread, self.run_job, job, loop)
+            finally:
+                self.busy = False
+
+    def run_job(self, job: GenerationJob, loop: asyncio.AbstractEventLoop):
+        """Generate one prompt, publishing chunks back to the event loop (model thread)"""
+        self.stats['generations'] += 1
+        try:
+            for part in self.model(job.prompt, stream=True, **job.params):
+                text = part['choices'][0].get('text', '')
+                if text:
+                    loop.call_soon_threadsafe(job.publish, {'text': text})
+            loop.call_soon_threadsafe(job.publish, {'done': True})
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Generation failed: {e}")
+            loop.call_soon_threadsafe(job.publish, {'error': str(e)})
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'status': 'ok' if self.model is not None else 'loading',
+            'pid': os.getpid(),
+            'model': os.path.basename(self.model_path),
+            'uptime': time.time() - self.started_at,
+            'queued': self.pending.qsize(),
+            'busy': self.busy,
+            **self.stats
+        })
+
+    async def handle_generate(self, request: web.Request) -> web.StreamResponse:
+        try:
+            body = await request.json()
+            prompt = body['prompt']
+        except Exception:
+            return web.json_response({'error': 'expected JSON with a "prompt" field'}, status=400)
+
+        if self.model is None:
+            return web.json_response({'error': 'model not loaded'}, status=503)
+
+        params = {k: v for k, v in body.get('params', {}).items() if k in ALLOWED_PARAMS}
+        output = await self.submit(prompt, params)
+
+        if not body.get('stream', False):
+            text = ""
+            while True:
+                item = await output.get()
+                if 'error' in item:
+                    return web.json_response(item, status=500)
+                if item.get('done'):
+                    return web.json_response({'text': text})
+                text += item['text']
+
+        response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+        await response.prepare(request)
+        while True:
+            item = await output.get()
+            await response.write((json.dumps(item) + "\n").encode('utf-8'))
+            if 'error' in item or item.get('done'):
+                break
+        await response.write_eof()
+        return response
+
+    async def load_in_background(self):
+        """Load the model while /health already answers with status 'loading'"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(self.model_thread, self.load)
+        except Exception as e:
+            logger.error(f"Failed to load model: {e}")
+            print(f"❌ Failed to load model: {e}")
+            os._exit(1)  # Let the supervising bot decide whether to restart us
+
+    async def on_startup(self, app: web.Application):
+        self.pending = asyncio.Queue()
+        app['load_task'] = asyncio.create_task(self.load_in_background())
+        app['batch_task'] = asyncio.create_task(self.batch_loop())
+
+    async def on_cleanup(self, app: web.Application):
+        app['batch_task'].cancel()
+        self.model_thread.shutdown(wait=False)
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/health', self.handle_health)
+        app.router.add_post('/generate', self.handle_generate)
+        app.on_startup.append(self.on_startup)
+        app.on_cleanup.append(self.on_cleanup)
+        return app
+
+def main():
+    parser = argparse.ArgumentParser(description="PuddlesBot AI inference worker")
+    parser.add_argument("--model", required=True, help="GGUF model file")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=5917, help="Port to listen on")
+    parser.add_argument("--socket", default=None, help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--threads", type=int, default=8, help="CPU threads for generation")
+    parser.add_argument("--no-mmap", action="store_true", help="Read the whole model into RAM instead of memory-mapping it")
+    parser.add_argument("--mlock", action="store_true", help="Pin the model weights in RAM")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [worker] %(levelname)s: %(message)s")
+
+    if not os.path.exists(args.model):
+        print(f"❌ Model file not found: {args.model}")
+        return 1
+
+    worker = InferenceWorker(args.model, n_threads=args.threads, use_mmap=not args.no_mmap, use_mlock=args.mlock)
+    app = worker.create_app()
+
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)  # Stale socket from a previous run
+        print(f"🦆 AI worker listening on unix:{args.socket}")
+        web.run_app(app, path=args.socket, print=None, access_log=None)
+    else:
+        print(f"🦆 AI worker listening on http://{args.host}:{args.port}")
+        web.run_app(app, host=args.host, port=args.port, print=None, access_log=None)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
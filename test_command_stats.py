@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the command statistics rollups (command_stats.py).
+Checks the rollups the dashboard reads against GROUP BY scans of the raw command_logs.
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import command_stats
+
+NOW = datetime(2024, 5, 1, 12, 34, 56)
+COMMANDS = ["play", "rank", "roll", "8ball", "coinflip"]
+GUILDS = [("111", "Puddles"), ("222", "Ducks"), ("333", None)]
+
+def make_db(rows: int = 2_000, seed: int = 7):
+    """A temporary database with commands spread over the last 45 days"""
+    path = os.path.join(tempfile.mkdtemp(), "commands_global.db")
+    rng = random.Random(seed)
+    with command_stats.connect(path) as conn:
+        for _ in range(rows):
+            guild_id, guild_name = rng.choice(GUILDS)
+            moment = NOW - timedelta(seconds=rng.randint(0, 45 * 86400))
+            command_stats.record_command(conn, rng.choice(COMMANDS), "1", "2", guild_id, guild_name, moment=moment)
+    return path
+
+def raw_usage(conn: sqlite3.Connection, since: datetime) -> dict:
+    """The scan web_ui used to run on every refresh"""
+    return dict(conn.execute("""
+        SELECT command_name, COUNT(*) FROM command_logs
+        WHERE timestamp > ? GROUP BY command_name
+    """, (since.isoformat(),)).fetchall())
+
+def test_rollups_match_raw_scans():
+    """Hourly rollups plus the partial first hour give exactly the raw counts"""
+    path = make_db()
+    with command_stats.connect(path) as conn:
+        stats = command_stats.dashboard_stats(conn, now=NOW)
+        assert stats['command_usage_24h'] == raw_usage(conn, NOW - timedelta(days=1))
+        assert stats['command_usage_month'] == raw_usage(conn, NOW - timedelta(days=30))
+
+        totals = dict(conn.execute("SELECT guild_id, COUNT(*) FROM command_logs GROUP BY guild_id").fetchall())
+        assert stats['server_commands'] == {
+            "Puddles (111)": totals["111"], "Ducks (222)": totals["222"], "333": totals["333"]
+        }
+
+def test_backfill_existing_database():
+    """Databases logged before the rollups existed are backfilled by migrate(), not on open"""
+    path = make_db(rows=500)
+    with command_stats.connect(path) as conn:
+        expected = command_stats.dashboard_stats(conn, now=NOW)
+        conn.execute("DELETE FROM command_stats_hourly")
+        conn.execute("DELETE FROM command_stats_guilds")
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+
+    command_stats._schema_ready.discard(path)
+    with command_stats.connect(path) as conn:
+        assert command_stats.server_totals(conn) == {}
+    assert command_stats.migrate(path)
+    assert not command_stats.migrate(path)
+    with command_stats.connect(path) as conn:
+        assert command_stats.dashboard_stats(conn, now=NOW) == expected
+
+def test_prune_keeps_rollups():
+    """Pruning raw rows past retention leaves the dashboard totals untouched"""
+    path = make_db()
+    with command_stats.connect(path) as conn:
+        before = command_stats.dashboard_stats(conn, now=NOW)
+        raw, _ = command_stats.prune(conn, now=NOW + timedelta(days=command_stats.COMMAND_LOG_RETENTION_DAYS - 10))
+        assert raw > 0
+        oldest = conn.execute("SELECT MIN(timestamp) FROM command_logs").fetchone()[0]
+        assert oldest >= (NOW - timedelta(days=10)).isoformat()
+        assert command_stats.server_totals(conn) == before['server_commands']
+
+def test_prune_in_batches():
+    """Small batches delete the same rows as one pass"""
+    later = NOW + timedelta(days=command_stats.COMMAND_LOG_RETENTION_DAYS - 10)
+    whole, batched = make_db(rows=300), make_db(rows=300)
+    with command_stats.connect(whole) as conn:
+        expected = command_stats.prune(conn, now=later)
+        remaining = conn.execute("SELECT COUNT(*) FROM command_logs").fetchone()[0]
+    with command_stats.connect(batched) as conn:
+        assert command_stats.prune(conn, now=later, batch_size=7) == expected
+        assert conn.execute("SELECT COUNT(*) FROM command_logs").fetchone()[0] == remaining
+
+def test_first_prune_waits_an_interval():
+    """Starting the bot does not trigger a retention pass straight away"""
+    saved = command_stats._last_prune
+    try:
+        command_stats._last_prune = time.monotonic()
+        assert not command_stats.prune_due()
+        command_stats._last_prune = time.monotonic() - command_stats.PRUNE_INTERVAL
+        assert command_stats.prune_due()
+        assert not command_stats.prune_due()
+    finally:
+        command_stats._last_prune = saved
+
+def test_reset():
+    """Resetting clears the raw logs and every rollup"""
+    path = make_db(rows=50)
+    with command_stats.connect(path) as conn:
+        command_stats.reset(conn)
+        assert command_stats.dashboard_stats(conn, now=NOW) == {
+            'server_commands': {}, 'command_usage_24h': {}, 'command_usage_month': {}
+        }
+
+if __name__ == "__main__":
+    test_rollups_match_raw_scans()
+    test_backfill_existing_database()
+    test_prune_keeps_rollups()
+    test_prune_in_batches()
+    test_first_prune_waits_an_interval()
+    test_reset()
+    print("✅ Command statistics rollups match the raw command logs")
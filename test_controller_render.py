@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the music controller's skip-unchanged-edits check (MusicSystem/voicelink/player.py).
+Renders the same player state twice with views whose buttons get random custom ids.
+"""
+
+import sys
+import asyncio
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "MusicSystem"))
+
+import discord
+from voicelink import player as player_module
+
+class StubController(discord.ui.View):
+    """Like InteractiveController: buttons without a custom_id, so every view gets new random ids"""
+
+    def __init__(self, player):
+        super().__init__(timeout=None)
+        self.add_item(discord.ui.Button(label="Pause", emoji="⏸️", row=0))
+        self.add_item(discord.ui.Button(label="Skip", emoji="⏭️", row=0, disabled=player.paused))
+
+class FakeControllerMessage:
+    def __init__(self):
+        self.edits = 0
+
+    async def edit(self, **kwargs):
+        self.edits += 1
+
+class StubPlayer:
+    def __init__(self):
+        self.controller = FakeControllerMessage()
+        self._controller_hash = None
+        self._logger = logging.getLogger("test_controller_render")
+        self.guild = discord.Object(id=1)
+        self.guild.name = "Pond"
+        self.current = None
+        self.settings = {}
+        self.paused = False
+        self.title = "Never Gonna Give You Up"
+
+    def build_embed(self, track):
+        return discord.Embed(title=self.title, description="Now playing")
+
+    async def is_position_fresh(self):
+        return True
+
+    def _can_resend_controller(self):
+        return False
+
+async def render_twice(change_between: bool = False) -> int:
+    original = player_module.InteractiveController
+    player_module.InteractiveController = StubController
+    try:
+        player = StubPlayer()
+        await player_module.Player._render_controller(player)
+        if change_between:
+            player.paused = True
+        await player_module.Player._render_controller(player)
+        return player.controller.edits
+    finally:
+        player_module.InteractiveController = original
+
+def test_unchanged_controller_is_not_edited_again():
+    """The second render of the same state is skipped even though the views' custom ids differ"""
+    assert asyncio.run(render_twice()) == 1
+
+def test_changed_button_state_is_edited():
+    """A disabled button is a real change and still edits the message"""
+    assert asyncio.run(render_twice(change_between=True)) == 2
+
+if __name__ == "__main__":
+    test_unchanged_controller_is_not_edited_again()
+    test_changed_button_state_is_edited()
+    print("✅ Unchanged controller renders are skipped")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Property test for the music system's FairQueue.
+Runs random sequences of queue operations against FairQueue and against the
+original scan-based insertion algorithm and checks the track order always matches.
+"""
+
+import sys
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "MusicSystem"))
+
+from voicelink.queue import Queue, FairQueue
+
+class FakeRequester:
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FakeRequester) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"R{self.id}"
+
+class FakeTrack:
+    def __init__(self, number: int, requester: FakeRequester):
+        self.number = number
+        self.requester = requester
+        self.uri = f"https://example.com/{number}"
+
+    def __repr__(self) -> str:
+        return f"{self.requester!r}:{self.number}"
+
+def reference_put(queue: Queue, item) -> int:
+    """FairQueue.put as it was originally written: a backwards then forwards scan per insert"""
+    tracks = queue.tracks(incTrack=True)
+    lastIndex = len(tracks)
+    for track in reversed(tracks):
+        if track.requester == item.requester:
+            break
+        lastIndex -= 1
+    seen = set()
+    for track in tracks[lastIndex:]:
+        if track.requester in seen:
+            break
+        lastIndex += 1
+        seen.add(track.requester)
+
+    queue.put_at_index(lastIndex, item)
+    return lastIndex
+
+def make_queues():
+    """A FairQueue and a reference Queue that are both playing their first track"""
+    fair = FairQueue(100_000, True, lambda key: key)
+    reference = Queue(100_000, True, lambda key: key)
+    first = FakeTrack(0, FakeRequester(0))
+    for queue in (fair, reference):
+        queue.put_many([first])
+        queue.get()
+    return fair, reference
+
+def run_random_operations(seed: int, steps: int = 300):
+    rng = random.Random(seed)
+    requesters = [FakeRequester(i) for i in range(rng.randint(1, 6))]
+    fair, reference = make_queues()
+    number = 1
+
+    for step in range(steps):
+        operation = rng.random()
+        if operation < 0.45:
+            track = FakeTrack(number, rng.choice(requesters))
+            number += 1
+            assert fair.put(track) == reference_put(reference, track), f"seed {seed} step {step}: put position differs"
+        elif operation < 0.65:
+            requester = rng.choice(requesters)
+            batch = [FakeTrack(number + i, requester) for i in range(rng.randint(1, 25))]
+            number += len(batch)
+            fair.put_many(batch)
+            for track in batch:
+                reference_put(reference, track)
+        elif operation < 0.75:
+            fair.get()
+            reference.get()
+        elif operation < 0.85 and reference.count:
+            index = rng.randint(1, reference.count)
+            fair.remove(index)
+            reference.remove(index)
+        elif operation < 0.95 and reference.count:
+            target, to = rng.randint(1, reference.count), rng.randint(1, reference.count)
+            fair.move(target, to)
+            reference.move(target, to)
+        elif reference.count >= 2:
+            index1, index2 = rng.randint(1, reference.count), rng.randint(1, reference.count)
+            fair.swap(index1, index2)
+            reference.swap(index1, index2)
+
+        assert fair._queue == reference._queue, f"seed {seed} step {step}: order differs"
+
+def test_fair_queue_matches_reference():
+    """FairQueue ordering matches the original algorithm across random operations"""
+    for seed in range(200):
+        run_random_operations(seed)
+
+def test_bulk_playlist_interleaves():
+    """A playlist added in one call is interleaved with other requesters' tracks"""
+    fair, _ = make_queues()
+    alice, bob = FakeRequester(1), FakeRequester(2)
+    fair.put_many([FakeTrack(i, alice) for i in range(1, 4)])
+    fair.put_many([FakeTrack(i, bob) for i in range(4, 7)])
+    assert [track.number for track in fair.tracks()] == [1, 4, 2, 5, 3, 6]
+
+def test_put_many_respects_size():
+    """put_many only adds what fits in the queue"""
+    fair = FairQueue(5, True, lambda key: key)
+    alice = FakeRequester(1)
+    assert fair.put_many([FakeTrack(i, alice) for i in range(10)]) == 5
+    assert len(fair._queue) == 5
+
+if __name__ == "__main__":
+    test_fair_queue_matches_reference()
+    test_bulk_playlist_interleaves()
+    test_put_many_respects_size()
+    print("✅ FairQueue matches the reference ordering")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for fun.py's preloaded fortunes and coin images.
+Builds a scratch fortunes/ and Media/coinflip/ tree and checks what is reloaded when it changes.
+"""
+
+import os
+import asyncio
+import builtins
+import tempfile
+import threading
+import contextlib
+
+import fun
+import language
+
+@contextlib.contextmanager
+def asset_tree():
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        os.chdir(root)
+        try:
+            os.makedirs("fortunes")
+            for folder in fun.COINFLIP_DIRS.values():
+                os.makedirs(folder)
+            yield root
+        finally:
+            os.chdir(previous)
+
+@contextlib.contextmanager
+def no_disk_access():
+    """Fail on any open(), stat() or directory listing this thread makes inside the block; yields the paths
+    that were tried, since the code under test may swallow the error. Other threads are left alone."""
+    touched = []
+    thread = threading.get_ident()
+    patched = [(builtins, "open"), (os, "stat"), (os, "listdir"), (os.path, "exists"), (os.path, "isfile")]
+    originals = [getattr(module, name) for module, name in patched]
+
+    def guard(original):
+        def no_disk(*args, **kwargs):
+            if threading.get_ident() != thread:
+                return original(*args, **kwargs)
+            touched.append(args[0] if args else None)
+            raise AssertionError(f"hot path touched the disk: {args[:1]}")
+        return no_disk
+
+    for (module, name), original in zip(patched, originals):
+        setattr(module, name, guard(original))
+    try:
+        yield touched
+    finally:
+        for (module, name), original in zip(patched, originals):
+            setattr(module, name, original)
+
+class FakeResponse:
+    def __init__(self):
+        self.sent = []
+
+    def is_done(self) -> bool:
+        return bool(self.sent)
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+class FakeUser:
+    id = 4242
+    name = "mallard"
+    display_name = "Mallard"
+
+class FakeInteraction:
+    guild_id = 1
+    user = FakeUser()
+
+    def __init__(self):
+        self.response = FakeResponse()
+
+def write(path: str, content, mtime_offset: int = 0):
+    with open(path, "wb" if isinstance(content, bytes) else "w", encoding=None if isinstance(content, bytes) else "utf-8") as f:
+        f.write(content)
+    if mtime_offset:
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+def test_assets_load_once_and_fall_back_by_language():
+    """Fortunes come back per language with the English fallback, without reading the disk again"""
+    with asset_tree():
+        write("fortunes/fortunes-en.txt", "You will find a duck.\n\nA pond awaits.\n")
+        write("fortunes/fortunes-fr.txt", "Un canard vous attend.\n")
+        write("Media/coinflip/head/head1.png", b"\x89PNG heads")
+        write("Media/coinflip/tail/tail1.png", b"\x89PNG tails")
+        write("Media/coinflip/tail/notes.txt", "not an image")
+
+        cache = fun.AssetCache()
+        assert cache.load() == 4
+        assert cache.load() == 0  # Nothing changed, nothing re-read
+
+        with no_disk_access() as touched:
+            assert cache.fortunes_for("fr") == ["Un canard vous attend."]
+            assert cache.fortunes_for("ja") == ["You will find a duck.", "A pond awaits."]
+            assert cache.coin_images("Heads") == [b"\x89PNG heads"]
+            assert cache.coin_filenames["Tails"] == "coin_tails.png"
+        assert touched == []
+
+def test_commands_do_no_file_io():
+    """/coinflip and /fortunecookie answer from memory, translations included"""
+    language.load_language_file("en")  # Normally preloaded by setup_language_system
+    with asset_tree():
+        write("fortunes/fortunes-en.txt", "You will find a duck.\n")
+        write("Media/coinflip/head/head1.png", b"\x89PNG heads")
+        write("Media/coinflip/tail/tail1.png", b"\x89PNG tails")
+        previous, fun.assets = fun.assets, fun.AssetCache()
+        fun.assets.load()
+        fun.fortune_cooldowns.pop(FakeUser.id, None)
+        try:
+            with no_disk_access() as touched:
+                flip, fortune = FakeInteraction(), FakeInteraction()
+                asyncio.run(fun.coinflip.callback(flip))
+                asyncio.run(fun.fortunecookie.callback(fortune))
+        finally:
+            fun.assets = previous
+            fun.fortune_cooldowns.pop(FakeUser.id, None)
+
+    assert touched == []
+    (_, kwargs), = flip.response.sent
+    assert kwargs["file"].filename in ("coin_heads.png", "coin_tails.png")
+    (_, kwargs), = fortune.response.sent
+    assert kwargs["embed"].description == "**You will find a duck.**"
+
+def test_changed_and_removed_files_are_picked_up():
+    """Edits, new images and deleted files show up after the next load()"""
+    with asset_tree():
+        write("fortunes/fortunes-en.txt", "Old fortune\n")
+        write("Media/coinflip/head/head1.png", b"one")
+        cache = fun.AssetCache()
+        cache.load()
+
+        write("fortunes/fortunes-en.txt", "New fortune\n", mtime_offset=10**9)
+        write("Media/coinflip/head/head2.png", b"two")
+        assert cache.load() == 2
+        assert cache.fortunes_for("en") == ["New fortune"]
+        assert sorted(cache.coin_images("Heads")) == [b"one", b"two"]
+
+        os.remove("fortunes/fortunes-en.txt")
+        assert cache.load() == 1
+        assert cache.fortunes_for("en") is None
+
+if __name__ == "__main__":
+    test_assets_load_once_and_fall_back_by_language()
+    test_changed_and_removed_files_are_picked_up()
+    test_commands_do_no_file_io()
+    print("✅ Fortune and coinflip assets are cached and refreshed")
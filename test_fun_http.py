@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for fun.py's outbound HTTP: retries, the prefetch buffer and the circuit breaker.
+Runs a local aiohttp server that stands in for random-d.uk and meme-api.com.
+"""
+
+import asyncio
+import itertools
+
+from aiohttp import web
+
+import fun
+
+class FlakyAPI:
+    """Answers with the queued statuses first, then 200s; "hang" never answers and "nsfw" is a 200 to reject"""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.hits = 0
+        self.numbers = itertools.count()
+        self.runner = None
+        self.url = None
+
+    async def handle(self, request):
+        self.hits += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status == "hang":
+            await asyncio.sleep(1)  # Well past the test's LIVE_FETCH_WAIT
+        if status == "nsfw":
+            return web.json_response({"url": "https://example.com/nope.jpg", "nsfw": True})
+        if status != 200:
+            return web.json_response({"error": "nope"}, status=status)
+        return web.json_response({"url": f"https://example.com/duck{next(self.numbers)}.jpg"})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/random", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", 0).start()
+        self.url = f"http://127.0.0.1:{self.runner.addresses[0][1]}/random"
+        return self
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+async def with_api(statuses, work):
+    fun.HTTP_RETRY_BACKOFF = 0
+    api = await FlakyAPI(statuses).start()
+    try:
+        return await work(api)
+    finally:
+        await fun.close_http()
+        await api.stop()
+
+def test_prefetch_serves_from_memory_after_retrying():
+    """A 503 is retried, the buffer fills in the background and get() then doesn't touch the API"""
+    async def work(api):
+        buffer = fun.PrefetchBuffer("test", api.url, accept=lambda data: "url" in data, size=3)
+        buffer.refill()
+        await buffer._refill_task
+        assert len(buffer.ready) == 3
+        hits = api.hits
+        served = [await buffer.get() for _ in range(3)]
+        buffer.stop()
+        assert [data["url"][-9:] for data in served] == ["duck0.jpg", "duck1.jpg", "duck2.jpg"]
+        assert api.hits == hits
+        return hits
+    hits = asyncio.run(with_api([503], work))
+    assert hits == 4  # The 503 and three prefetches
+
+def test_open_circuit_serves_fallback_without_calling_the_api():
+    """After BREAKER_FAILURES failed fetches the API is left alone and recent results are reused"""
+    async def work(api):
+        buffer = fun.PrefetchBuffer("test", api.url, accept=lambda data: "url" in data, size=1)
+        good = await buffer.get()
+        buffer.stop()
+        buffer.ready.clear()
+        api.statuses = [500] * 100
+        for _ in range(fun.BREAKER_FAILURES):
+            assert await buffer.get() == good  # Each live fetch fails after its retries
+            buffer.stop()
+        assert buffer.breaker.is_open
+        hits = api.hits
+        assert await buffer.get() == good
+        buffer.stop()
+        assert api.hits == hits
+
+        # Once the reset timeout passes, one trial request closes the circuit again
+        buffer.breaker.opened_at -= fun.BREAKER_RESET
+        api.statuses = []
+        fresh = await buffer.get()
+        assert fresh != good and not buffer.breaker.is_open
+        buffer.stop()
+    asyncio.run(with_api([], work))
+
+def test_hanging_trial_request_does_not_leave_the_circuit_stuck():
+    """A half-open trial that times out or is cancelled re-opens the circuit, and the next reset allows another"""
+    async def work(api):
+        fun.LIVE_FETCH_WAIT = 0.2
+        buffer = fun.PrefetchBuffer("test", api.url, accept=lambda data: "url" in data, size=1)
+        buffer.breaker.failures = fun.BREAKER_FAILURES
+        buffer.breaker.opened_at = fun.time.monotonic() - fun.BREAKER_RESET
+        api.statuses = ["hang"]
+        try:
+            await buffer.get()  # The trial: one live request that times out on our side
+        except fun.APIUnavailable as e:
+            assert e.timed_out
+        else:
+            raise AssertionError("expected APIUnavailable")
+        buffer.stop()
+        assert buffer.breaker.is_open and not buffer.breaker.allow()
+
+        # Same again, but the trial is a refill that gets cancelled
+        buffer.breaker.opened_at -= fun.BREAKER_RESET
+        api.statuses = ["hang"]
+        buffer.refill()
+        await asyncio.sleep(0.1)
+        buffer.stop()
+        await asyncio.sleep(0)
+        assert buffer.breaker.is_open and not buffer.breaker.allow()
+
+        buffer.breaker.opened_at -= fun.BREAKER_RESET
+        data = await buffer.get()
+        buffer.stop()
+        assert data["url"].startswith("https://example.com/duck") and not buffer.breaker.is_open
+    try:
+        asyncio.run(with_api([], work))
+    finally:
+        fun.LIVE_FETCH_WAIT = 2.5
+
+def test_rejected_live_result_falls_back_or_says_why():
+    """An NSFW meme fetched live is swapped for a recent one, or reported as filtered when there is none"""
+    async def work(api):
+        buffer = fun.PrefetchBuffer("test", api.url, accept=lambda data: not data.get("nsfw"), size=1)
+        api.statuses = ["nsfw"]
+        try:
+            await buffer.get()
+        except fun.ContentRejected as e:
+            assert e.data["nsfw"] and not buffer.breaker.failures
+        else:
+            raise AssertionError("expected ContentRejected")
+        buffer.stop()
+        good = await buffer.get()
+        buffer.stop()
+        buffer.ready.clear()
+        api.statuses = ["nsfw"]
+        assert await buffer.get() == good
+        buffer.stop()
+    asyncio.run(with_api([], work))
+
+def test_client_errors_are_not_retried():
+    """A 404 fails straight away and is reported with its status"""
+    async def work(api):
+        breaker = fun.CircuitBreaker()
+        try:
+            await fun.fetch_json("test", api.url, breaker)
+        except fun.APIUnavailable as e:
+            assert e.status == 404
+        else:
+            raise AssertionError("expected APIUnavailable")
+        assert api.hits == 1 and breaker.failures == 1
+    asyncio.run(with_api([404], work))
+
+if __name__ == "__main__":
+    test_prefetch_serves_from_memory_after_retrying()
+    test_open_circuit_serves_fallback_without_calling_the_api()
+    test_hanging_trial_request_does_not_leave_the_circuit_stuck()
+    test_rejected_live_result_falls_back_or_says_why()
+    test_client_errors_are_not_retried()
+    print("✅ fun.py HTTP tests passed")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-loop lag watchdog (loop_monitor.py).
+Blocks the loop on purpose and checks the stall is caught with the blocking function's stack.
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+
+import loop_monitor
+
+def blocking_handler(seconds: float):
+    """Stands in for a sync call made from a coroutine, like requests.post"""
+    time.sleep(seconds)
+
+async def run_with_monitor(monitor: loop_monitor.LoopMonitor, work):
+    monitor.start()
+    try:
+        await asyncio.sleep(0.3)
+        await work()
+        await asyncio.sleep(0.3)
+    finally:
+        monitor.stop()
+
+def test_stall_is_attributed_to_the_blocking_call():
+    """A blocked loop is reported once, at the frame that blocked it, with its duration"""
+    report_path = os.path.join(tempfile.mkdtemp(), "loop_lag.log")
+    monitor = loop_monitor.LoopMonitor(threshold=0.1, interval=0.02, report_path=report_path)
+
+    async def work():
+        blocking_handler(0.4)
+    asyncio.run(run_with_monitor(monitor, work))
+
+    assert monitor.stalls == 1
+    offender = monitor.top_offenders()[0]
+    assert offender.hotspot.startswith("test_loop_monitor.py:") and offender.hotspot.endswith("in blocking_handler")
+    assert 0.35 <= offender.worst <= 0.6
+    assert monitor.lag_summary()["max"] >= 350
+
+    with open(report_path, encoding="utf-8") as f:
+        report = f.read()
+    assert "Event loop blocked for" in report
+    assert "time.sleep(seconds)" in report
+
+def test_short_awaits_are_not_stalls():
+    """Awaiting, even for long, never counts as blocking the loop"""
+    monitor = loop_monitor.LoopMonitor(threshold=0.1, interval=0.02, report_path=None)
+
+    async def work():
+        await asyncio.sleep(0.5)
+        blocking_handler(0.01)
+    asyncio.run(run_with_monitor(monitor, work))
+
+    assert monitor.stalls == 0
+    assert monitor.top_offenders() == []
+    assert monitor.lag_summary()["samples"] > 20
+
+if __name__ == "__main__":
+    test_stall_is_attributed_to_the_blocking_call()
+    test_short_awaits_are_not_stalls()
+    print("✅ Event loop stalls are caught and attributed")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process metrics registry (metrics.py) and its Prometheus text output.
+"""
+
+import math
+import os
+import threading
+
+import metrics
+
+def test_counter_and_gauge():
+    """Counters add up per label set, gauges can be set or read from a callback"""
+    registry = metrics.Registry()
+    requests = registry.register(metrics.Counter("test_requests_total", "Requests", ["route"]))
+    requests.labels(route="/a").inc()
+    requests.labels(route="/a").inc(2)
+    requests.labels(route='say "hi"\n').inc()
+
+    queue_size = registry.register(metrics.Gauge("test_queue_size", "Queued items"))
+    queue_size.set(5)
+    queue_size.dec()
+    callback = registry.register(metrics.Gauge("test_callback", "From a function"))
+    callback.set_function(lambda: 1.5)
+
+    text = registry.render()
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{route="/a"} 3' in text
+    assert 'test_requests_total{route="say \\"hi\\"\\n"} 1' in text
+    assert "test_queue_size 4" in text
+    assert "test_callback 1.5" in text
+
+def test_histogram_buckets():
+    """Buckets are cumulative and a value equal to a bound counts in that bucket"""
+    registry = metrics.Registry()
+    latency = registry.register(metrics.Histogram("test_latency_seconds", "Latency", ["stage"], buckets=[0.1, 1, 10]))
+    for value in (0.05, 0.1, 0.5, 5, 50):
+        latency.labels("db").observe(value)
+
+    text = registry.render()
+    assert 'test_latency_seconds_bucket{stage="db",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{stage="db",le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{stage="db",le="10"} 4' in text
+    assert 'test_latency_seconds_bucket{stage="db",le="+Inf"} 5' in text
+    assert 'test_latency_seconds_count{stage="db"} 5' in text
+    assert math.isclose(float(text.split('test_latency_seconds_sum{stage="db"} ')[1].split()[0]), 55.65)
+
+def test_thread_safety():
+    """Observations from executor threads are never lost"""
+    registry = metrics.Registry()
+    histogram = registry.register(metrics.Histogram("test_threads_seconds", "Threads"))
+
+    def work():
+        for _ in range(10_000):
+            histogram.observe(0.01)
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert "test_threads_seconds_count 80000" in registry.render()
+
+def test_registration_is_idempotent():
+    """Modules can declare the same metric on every import; conflicting declarations fail"""
+    registry = metrics.Registry()
+    first = registry.register(metrics.Counter("test_once_total", "Once"))
+    assert registry.register(metrics.Counter("test_once_total", "Once")) is first
+    try:
+        registry.register(metrics.Gauge("test_once_total", "Once"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("A gauge must not replace a counter")
+
+def test_server_address_reads_environment_late():
+    """Settings loaded from .env after metrics is imported still pick the exporter address"""
+    saved = {key: os.environ.get(key) for key in ("METRICS_HOST", "METRICS_PORT")}
+    try:
+        os.environ["METRICS_HOST"] = "0.0.0.0"
+        os.environ["METRICS_PORT"] = "0"
+        assert metrics.server_address() == ("0.0.0.0", 0)
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+if __name__ == "__main__":
+    test_counter_and_gauge()
+    test_histogram_buckets()
+    test_thread_safety()
+    test_registration_is_idempotent()
+    test_server_address_reads_environment_late()
+    print("✅ Metrics registry renders valid Prometheus output")
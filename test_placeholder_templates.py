@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Conformance tests for the music controller template engine (MusicSystem/voicelink/template.py).
+Covers @@variables@@, {{expression ?? true // false}} conditions and the expressions
+that must never be evaluated.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "MusicSystem"))
+
+from voicelink.template import compile_template, compile_expression, TemplateSyntaxError
+
+VARIABLES = {
+    "track_name": "Never Gonna Give You Up",
+    "track_duration": "3:33",
+    "queue_length": "5",
+    "volume": 100,
+    "loop_mode": "Off",
+    "dj": "<@&123>",
+    "channel_name": "music",
+}
+
+CASES = [
+    # Plain text and variables
+    ("plain text", VARIABLES, "plain text"),
+    ("Now Playing: @@track_name@@", VARIABLES, "Now Playing: Never Gonna Give You Up"),
+    ("Volume: @@volume@@%", VARIABLES, "Volume: 100%"),
+    ("@@dj@@@@channel_name@@", VARIABLES, "<@&123>music"),
+    ("@@not_a_variable@@!", VARIABLES, "!"),
+
+    # The default controller footer
+    (
+        "Queue Length: @@queue_length@@ | Volume: @@volume@@% {{loop_mode != 'Off' ?? | Repeat: @@loop_mode@@}}",
+        VARIABLES,
+        "Queue Length: 5 | Volume: 100% ",
+    ),
+    (
+        "Queue Length: @@queue_length@@ | Volume: @@volume@@% {{loop_mode != 'Off' ?? | Repeat: @@loop_mode@@}}",
+        {**VARIABLES, "loop_mode": "Queue"},
+        "Queue Length: 5 | Volume: 100% | Repeat: Queue",
+    ),
+
+    # Comparisons - strings of digits compare as numbers
+    ("{{@@queue_length@@ > 3 ?? many // few}}", VARIABLES, "many"),
+    ("{{@@queue_length@@ > 30 ?? many // few}}", VARIABLES, "few"),
+    ("{{queue_length >= 5 ?? yes // no}}", VARIABLES, "yes"),
+    ("{{@@volume@@ > 50 ?? loud // quiet}}", VARIABLES, "loud"),
+    ("{{queue_length == '5' ?? five}}", VARIABLES, "five"),
+    ("{{@@track_name@@ == 'Never Gonna Give You Up' ?? rickrolled}}", VARIABLES, "rickrolled"),
+    ("{{1 < 2 < 3 ?? chained}}", VARIABLES, "chained"),
+    ("{{3 < 2 < 4 ?? chained // broken}}", VARIABLES, "broken"),
+
+    # Boolean logic, membership and constants
+    ("{{true ?? yes // no}}{{false ?? yes // no}}", VARIABLES, "yesno"),
+    ("{{loop_mode == 'Off' and volume > 50 ?? both // not both}}", VARIABLES, "both"),
+    ("{{loop_mode == 'Track' or volume > 50 ?? either}}", VARIABLES, "either"),
+    ("{{not loop_mode == 'Off' ?? on // off}}", VARIABLES, "off"),
+    ("{{(loop_mode == 'Track' or loop_mode == 'Off') and volume ?? grouped}}", VARIABLES, "grouped"),
+    ("{{'Gonna' in track_name ?? found}}", VARIABLES, "found"),
+    ("{{'Gonna' not in track_name ?? missing // present}}", VARIABLES, "present"),
+
+    # Blocks that render nothing
+    ("a{{no question marks}}b", VARIABLES, "ab"),
+    ("a{{undefined_name ?? yes // no}}b", VARIABLES, "ab"),
+    ("a{{volume > 'loud' ?? yes // no}}b", VARIABLES, "ab"),
+    ("a{{volume > ?? yes // no}}b", VARIABLES, "ab"),
+    ("a{{(volume ?? yes // no}}b", VARIABLES, "ab"),
+]
+
+UNSAFE_EXPRESSIONS = [
+    "__import__('os').system('echo hi')",
+    "().__class__.__bases__[0].__subclasses__()",
+    "open('settings.json')",
+    "[x for x in range(10**9)]",
+    "loop_mode.upper()",
+    "volume ** 1000000",
+    "lambda: 1",
+]
+
+def test_conformance():
+    """Each template renders exactly as expected"""
+    for template, variables, expected in CASES:
+        rendered = compile_template(template).render(variables)
+        assert rendered == expected, f"{template!r} rendered {rendered!r}, expected {expected!r}"
+
+def test_unsafe_expressions_are_rejected():
+    """Calls, attribute access and other Python syntax never parse"""
+    for expression in UNSAFE_EXPRESSIONS:
+        try:
+            compile_expression(expression)
+        except TemplateSyntaxError:
+            pass
+        else:
+            raise AssertionError(f"{expression!r} should not compile")
+
+        assert compile_template("{{" + expression + " ?? bad // bad}}").render(VARIABLES) == ""
+
+def test_referenced_names():
+    """Templates know which variables they read, so only those are evaluated"""
+    template = compile_template("@@track_name@@ {{loop_mode != 'Off' ?? @@dj@@ // @@volume@@}} {{true ?? x}}")
+    assert template.names == {"track_name", "loop_mode", "dj", "volume"}
+
+def test_templates_are_cached():
+    """The same string compiles once"""
+    assert compile_template("cached @@track_name@@") is compile_template("cached @@track_name@@")
+
+if __name__ == "__main__":
+    test_conformance()
+    test_unsafe_expressions_are_rejected()
+    test_referenced_names()
+    test_templates_are_cached()
+    print(f"✅ {len(CASES)} template cases and {len(UNSAFE_EXPRESSIONS)} unsafe expressions behave as expected")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the sampling profiler (profiler.py).
+Profiles a busy thread next to an idle one and checks the collapsed-stack output.
+"""
+
+import threading
+
+import profiler
+
+def burn(stop: threading.Event):
+    """Stands in for a hot code path"""
+    total = 0
+    while not stop.is_set():
+        total += sum(range(1000))
+    return total
+
+def run_profile(**kwargs) -> profiler.ProfileResult:
+    stop = threading.Event()
+    idle = threading.Event()
+    threads = [
+        threading.Thread(target=burn, args=(stop,), name="burner"),
+        threading.Thread(target=idle.wait, name="sleeper"),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        return profiler.SamplingProfiler(interval=0.002, **kwargs).run(0.5)
+    finally:
+        stop.set()
+        idle.set()
+        for thread in threads:
+            thread.join()
+
+def test_busy_thread_is_hot():
+    """The busy function dominates self time and idle threads are left out"""
+    result = run_profile()
+    assert result.samples > 50
+    assert result.top_functions(1)[0][0] == "test_profiler.py:burn"
+    assert not any(stack.startswith("sleeper;") for stack in result.stacks)
+    assert 0 < result.overhead < 0.5
+
+def test_collapsed_format():
+    """Every line is 'thread;outer;...;inner count' - what flamegraph tools read"""
+    result = run_profile(include_idle=True)
+    lines = result.collapsed().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert " " not in stack
+    assert any(line.startswith("burner;") and "test_profiler.py:burn" in line for line in lines)
+    assert any(line.startswith("sleeper;") for line in lines)
+
+def test_one_profile_at_a_time():
+    """A second request while one is running is refused instead of doubling the overhead"""
+    with profiler._running:
+        assert profiler.profile(0.1) is None
+    assert profiler.profile(0.05) is not None
+
+if __name__ == "__main__":
+    test_busy_thread_is_hot()
+    test_collapsed_format()
+    test_one_profile_at_a_time()
+    print("✅ Sampling profiler finds the hot code")
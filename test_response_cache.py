@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for the AI response cache (puddleai.ResponseCache).
+Checks that cached replies are re-addressed to the new asker without rewriting other words.
+"""
+
+import asyncio
+
+from puddleai import ResponseCache
+
+def make_cache() -> ResponseCache:
+    return ResponseCache(max_entries=10, ttl=60, threshold=0.9)
+
+def test_reply_is_readdressed_by_whole_word():
+    """Only the asker's name is swapped, not words that happen to contain it"""
+    async def work():
+        cache = make_cache()
+        await cache.store(1, "how are you?", "Alan", "Always happy to help, Alan! Alana says hi too.")
+        reply, _ = await cache.lookup(1, "How are you", "Bob")
+        return reply
+    assert asyncio.run(work()) == "Always happy to help, Bob! Alana says hi too."
+
+def test_short_or_common_names_are_not_cached_when_they_appear():
+    """Names like 'Al' or 'Duck' can't be told apart from the reply's own words"""
+    async def work():
+        cache = make_cache()
+        await cache.store(1, "how are you", "Al", "Always happy to help, Al!")
+        await cache.store(1, "tell me a fact", "Duck", "Duck fact: ducks have waterproof feathers, Duck!")
+        await cache.store(1, "say hi", "Duck", "Hi there!")  # Name not in the reply, safe to cache
+        return [(await cache.lookup(1, message, "Bob"))[0] for message in ("how are you", "tell me a fact", "say hi")]
+    assert asyncio.run(work()) == [None, None, "Hi there!"]
+
+if __name__ == "__main__":
+    test_reply_is_readdressed_by_whole_word()
+    test_short_or_common_names_are_not_cached_when_they_appear()
+    print("✅ Cached AI replies are re-addressed safely")
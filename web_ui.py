@@ -4,18 +4,28 @@ Flask Web UI for PuddlesBot
 A simple web interface for monitoring and controlling the bot.
 """
 
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+from flask import Flask, render_template, jsonify, request, redirect, url_for, Response, stream_with_context
 import os
 import sys
 import json
 import sqlite3
 import threading
 import time
+import queue
 from datetime import datetime, timedelta
 import psutil
 import subprocess
 import signal
 from collections import defaultdict, Counter
+from dotenv import load_dotenv
+
+# Share the bot's .env settings (DASHBOARD_EVENT_PORT, COMMAND_LOG_RETENTION_DAYS)
+load_dotenv()
+import command_stats
+import dashboard_link
+
+# Backfill the command statistics rollups of an older database before serving them
+command_stats.migrate()
 
 app = Flask(__name__)
 
@@ -34,6 +44,32 @@ stats_cache = {
     'total_users': 0,
     'uptime': None
 }
+stats_lock = threading.Lock()
+
+# Live bot status from heartbeats
+bot_status_cache = {'running': False}
+last_heartbeat = 0.0
+
+# Browsers connected to /api/stream, one queue each
+STREAM_KEEPALIVE = 15  # Seconds between SSE keep-alive comments
+STATS_RESYNC_INTERVAL = 60  # Seconds between full reloads from the rollups, which also age out the 24h window
+subscribers = []
+subscribers_lock = threading.Lock()
+
+def to_json(data):
+    """JSON for the browser - datetimes as local ISO strings"""
+    return json.dumps(data, default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value))
+
+def publish(event_type, data):
+    """Push an event to every connected dashboard"""
+    message = f"event: {event_type}\ndata: {to_json(data)}\n\n"
+    with subscribers_lock:
+        for subscriber in list(subscribers):
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # A stalled browser - drop it, it reconnects and gets a fresh snapshot
+                subscribers.remove(subscriber)
 
 def get_database_stats():
     """Get command statistics from the global database"""
@@ -41,64 +77,15 @@ def get_database_stats():
     
     try:
         # Check if global command database exists
-        db_path = 'data/commands_global.db'
+        db_path = command_stats.DB_PATH
         if not os.path.exists(db_path):
             print("No global command database found")
             return
             
-        server_commands = defaultdict(int)
-        command_usage_24h = Counter()
-        command_usage_month = Counter()
-        
-        # Time boundaries
-        now = datetime.now()
-        day_ago = now - timedelta(days=1)
-        month_ago = now - timedelta(days=30)
-        
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Check if command_logs table exists
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='command_logs'
-            """)
-            
-            if cursor.fetchone():
-                # Get total commands per server
-                cursor.execute("""
-                    SELECT guild_id, guild_name, COUNT(*) 
-                    FROM command_logs 
-                    GROUP BY guild_id, guild_name
-                """)
-                
-                for guild_id, guild_name, count in cursor.fetchall():
-                    server_key = f"{guild_name} ({guild_id})" if guild_name else guild_id
-                    server_commands[server_key] = count
-                
-                # Get commands from last 24 hours
-                cursor.execute("""
-                    SELECT command_name, COUNT(*) FROM command_logs 
-                    WHERE timestamp > ? 
-                    GROUP BY command_name
-                """, (day_ago.isoformat(),))
-                
-                for cmd, count in cursor.fetchall():
-                    command_usage_24h[cmd] += count
-                
-                # Get commands from last month
-                cursor.execute("""
-                    SELECT command_name, COUNT(*) FROM command_logs 
-                    WHERE timestamp > ? 
-                    GROUP BY command_name
-                """, (month_ago.isoformat(),))
-                
-                for cmd, count in cursor.fetchall():
-                    command_usage_month[cmd] += count
-            
-            conn.close()
-            
+            # Only the hourly rollups are read, so a refresh stays cheap as command_logs grows
+            with command_stats.connect(db_path) as conn:
+                command_panels = command_stats.dashboard_stats(conn)
         except Exception as e:
             print(f"Error reading global command database: {e}")
             return
@@ -116,87 +103,107 @@ def get_database_stats():
             print(f"Error reading guild cache: {e}")
         
         # Update cache
-        stats_cache.update({
-            'last_updated': datetime.now(),
-            'server_commands': dict(server_commands),
-            'command_usage_24h': dict(command_usage_24h),
-            'command_usage_month': dict(command_usage_month),
-            'total_servers': total_servers,
-            'total_users': total_users
-        })
+        with stats_lock:
+            stats_cache.update({
+                'last_updated': datetime.now(),
+                **command_panels,
+                'total_servers': total_servers,
+                'total_users': total_users
+            })
+            publish('stats', stats_cache)
         
     except Exception as e:
         print(f"Error getting database stats: {e}")
 
 def get_bot_status():
-    """Get current bot status"""
+    """Get current bot status from its heartbeat, or its PID file if heartbeats stopped"""
     global bot_process, bot_running
     
-    # Check if main.py process is running
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-        try:
-            cmdline = proc.info['cmdline']
-            if cmdline:
-                # Check if this is a Python process running main.py
-                cmdline_str = ' '.join(cmdline).lower()
-                if ('python' in cmdline_str or 'python3' in cmdline_str) and 'main.py' in cmdline_str:
-                    bot_running = True
-                    bot_process = proc.info['pid']
-                    return {
-                        'running': True,
-                        'pid': proc.info['pid'],
-                        'memory_mb': round(proc.memory_info().rss / 1024 / 1024, 1),
-                        'cpu_percent': proc.cpu_percent(),
-                        'uptime': time.time() - proc.create_time()
-                    }
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
+    if time.time() - last_heartbeat < dashboard_link.HEARTBEAT_TIMEOUT:
+        status = dict(bot_status_cache)
+    else:
+        pid_info = dashboard_link.read_pid_file()
+        status = dashboard_link.process_status(pid_info['pid'], pid_info.get('started_at')) if pid_info.get('pid') else {'running': False}
     
-    bot_running = False
-    bot_process = None
-    return {'running': False}
+    bot_running = status['running']
+    bot_process = status.get('pid')
+    return status
+
+def apply_command(event):
+    """Count a command the bot just logged without re-reading the database"""
+    guild_id, guild_name, command = event.get('guild_id'), event.get('guild_name'), event.get('command')
+    server_key = f"{guild_name} ({guild_id})" if guild_name else guild_id
+    with stats_lock:
+        for panel, key in (('server_commands', server_key), ('command_usage_24h', command), ('command_usage_month', command)):
+            stats_cache[panel][key] = stats_cache[panel].get(key, 0) + 1
+        stats_cache['last_updated'] = datetime.now()
+        publish('command', {'server': server_key, 'command': command, 'last_updated': stats_cache['last_updated']})
 
+def apply_heartbeat(event):
+    """Remember the bot's latest status and pass it on"""
+    global bot_status_cache, last_heartbeat
+    status = event.get('status') or {'running': False}
+    bot_status_cache = {key: status[key] for key in ('running', 'pid', 'memory_mb', 'cpu_percent', 'uptime') if key in status}
+    last_heartbeat = time.time()
+    with stats_lock:
+        for key in ('total_servers', 'total_users'):
+            if key in status:
+                stats_cache[key] = status[key]
+        publish('status', {'status': bot_status_cache, 'total_servers': stats_cache['total_servers'], 'total_users': stats_cache['total_users']})
 
-# Background thread to update stats
+# Background thread receiving events from the bot
+def event_receiver():
+    """Apply the bot's events to the cache as they arrive"""
+    try:
+        receiver = dashboard_link.open_receiver()
+    except OSError as e:
+        print(f"⚠️ Live updates disabled, port {dashboard_link.DASHBOARD_EVENT_PORT} unavailable: {e}")
+        return
+    
+    handlers = {
+        'command': apply_command,
+        'heartbeat': apply_heartbeat,
+        'refresh': lambda event: get_database_stats(),
+    }
+    while True:
+        event = dashboard_link.receive_event(receiver)
+        try:
+            handler = handlers.get(event['type'])
+            if handler:
+                handler(event)
+        except Exception as e:
+            print(f"Error handling dashboard event {event.get('type')}: {e}")
+
+# Background thread to resync stats
 def stats_updater():
-    """Background thread to update statistics"""
-    last_ping_time = 0
+    """Background thread reloading statistics from the rollups"""
     while True:
-        # Check for ping file
-        ping_file = 'data/dashboard_ping.txt'
-        if os.path.exists(ping_file):
-            try:
-                with open(ping_file, 'r') as f:
-                    ping_time = float(f.read().strip())
-                if ping_time > last_ping_time:
-                    last_ping_time = ping_time
-                    print(f"📊 Command detected, updating dashboard...")
-                    get_database_stats()
-            except Exception as e:
-                print(f"Error reading ping file: {e}")
-        
         get_database_stats()
-        time.sleep(5)  # Check every 5 seconds for faster updates
+        time.sleep(STATS_RESYNC_INTERVAL)
 
-# Start stats updater thread
+# Start background threads
 stats_thread = threading.Thread(target=stats_updater, daemon=True)
 stats_thread.start()
+receiver_thread = threading.Thread(target=event_receiver, daemon=True)
+receiver_thread.start()
 
-@app.route('/')
-def index():
-    """Main dashboard"""
-    bot_status = get_bot_status()
-    
-    # Get server names from guilds if possible
-    server_names = {}
+def get_server_names():
+    """Server names from the bot's guild cache"""
     try:
         # Try to read guild info from a cache file if it exists
         if os.path.exists('guild_cache.json'):
             with open('guild_cache.json', 'r') as f:
                 guild_data = json.load(f)
-                server_names = {str(g['id']): g['name'] for g in guild_data.get('guilds', [])}
+                return {str(g['id']): g['name'] for g in guild_data.get('guilds', [])}
     except:
         pass
+    return {}
+
+@app.route('/')
+def index():
+    """Main dashboard"""
+    bot_status = get_bot_status()
+    server_names = get_server_names()
     
     return render_template('dashboard.html', 
                          bot_status=bot_status,
@@ -213,6 +220,32 @@ def api_stats():
     """API endpoint for statistics"""
     return jsonify(stats_cache)
 
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events: a snapshot on connect, then deltas as the bot reports them"""
+    subscriber = queue.Queue(maxsize=100)
+    status, server_names = get_bot_status(), get_server_names()
+    with stats_lock:
+        snapshot = to_json({'stats': stats_cache, 'status': status, 'server_names': server_names})
+    
+    def stream():
+        with subscribers_lock:
+            subscribers.append(subscriber)
+        try:
+            yield f"retry: 3000\nevent: snapshot\ndata: {snapshot}\n\n"
+            while True:
+                try:
+                    yield subscriber.get(timeout=STREAM_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            with subscribers_lock:
+                if subscriber in subscribers:
+                    subscribers.remove(subscriber)
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/refresh', methods=['POST'])
 def api_refresh():
     """API endpoint to refresh statistics"""
@@ -224,26 +257,23 @@ def api_reset_data():
     """Reset all command logging data"""
     try:
         # Clear the global command database
-        db_path = 'data/commands_global.db'
+        db_path = command_stats.DB_PATH
         if os.path.exists(db_path):
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM command_logs")
-            conn.commit()
-            conn.close()
+            with command_stats.connect(db_path) as conn:
+                command_stats.reset(conn)
             print("🗑️ Command logging data reset")
         
         # Clear the stats cache
-        global stats_cache
-        stats_cache = {
-            'last_updated': None,
-            'server_commands': {},
-            'command_usage_24h': {},
-            'command_usage_month': {},
-            'total_servers': 0,
-            'total_users': 0,
-            'uptime': None
-        }
+        with stats_lock:
+            stats_cache.update({
+                'last_updated': None,
+                'server_commands': {},
+                'command_usage_24h': {},
+                'command_usage_month': {},
+                'total_servers': 0,
+                'total_users': 0,
+                'uptime': None
+            })
         
         # Refresh stats
         get_database_stats()
@@ -255,7 +285,7 @@ def api_reset_data():
 if __name__ == '__main__':
     print("🌐 Starting PuddlesBot Web UI...")
     print("📊 Dashboard will be available at: http://localhost:42069")
-    print("🔄 Statistics will update automatically every 30 seconds")
+    print("🔄 Statistics update live while the bot is running")
     print("⚡ Use Ctrl+C to stop the web server")
     
     app.run(host='0.0.0.0', port=42069, debug=True, use_reloader=False)